@@ -0,0 +1,74 @@
+# Models shared by the benchmarks and the tests: a grid mesh of a unit cube and a shown
+# ZincWidget displaying it.  Zinc and Qt are imported when a model is made, so the
+# stand-in in zincstandin.py can be installed after this module is imported.
+
+import numpy
+
+
+def gridMesh(divisions):
+    '''
+    Return the node coordinates and hexahedral connectivity of a unit cube
+    divided into divisions**3 elements.
+    '''
+    count = divisions + 1
+    axis = numpy.linspace(0.0, 1.0, count)
+    z, y, x = numpy.meshgrid(axis, axis, axis, indexing='ij')
+    coordinates = numpy.column_stack([x.ravel(), y.ravel(), z.ravel()])
+    index = numpy.arange(count ** 3).reshape(count, count, count)
+    corners = [index[k:k + divisions, j:j + divisions, i:i + divisions]
+               for k in (0, 1) for j in (0, 1) for i in (0, 1)]
+    connectivity = numpy.column_stack([corner.ravel() for corner in corners])
+    return coordinates, connectivity
+
+
+def createCoordinateField(fieldmodule):
+    field = fieldmodule.createFieldFiniteElement(3)
+    field.setName('coordinates')
+    field.setManaged(True)
+    field.setTypeCoordinate(True)
+    return field
+
+
+def processEvents():
+    try:
+        from PySide import QtCore
+    except ImportError:
+        from PyQt4 import QtCore
+    QtCore.QCoreApplication.processEvents()
+
+
+def createWidget(divisions, **kwargs):
+    '''
+    Create a shown ZincWidget on a new context holding a grid mesh with
+    surface and node point graphics, and return the widget, the node
+    coordinates and the number of elements.  kwargs are passed to the
+    ZincWidget.  A QApplication must exist.
+    '''
+    from opencmiss.zinc.context import Context
+    from opencmiss.zinc.field import Field
+    from opencmiss.zinc.glyph import Glyph
+    from zincwidget import ZincWidget
+
+    context = Context('model')
+    region = context.getDefaultRegion()
+    fieldmodule = region.getFieldmodule()
+    field = createCoordinateField(fieldmodule)
+    coordinates, connectivity = gridMesh(divisions)
+    widget = ZincWidget(**kwargs)
+    widget.setContext(context)
+    widget.createFiniteElements(fieldmodule, field, coordinates, connectivity)
+    scene = region.getScene()
+    scene.beginChange()
+    surfaces = scene.createGraphicsSurfaces()
+    surfaces.setCoordinateField(field)
+    points = scene.createGraphicsPoints()
+    points.setFieldDomainType(Field.DOMAIN_TYPE_NODES)
+    points.setCoordinateField(field)
+    points.getGraphicspointattributes().setGlyphShapeType(Glyph.SHAPE_TYPE_POINT)
+    scene.endChange()
+    widget.resize(640, 480)
+    widget.show()
+    processEvents()
+    widget.viewAll()
+    processEvents()
+    return widget, coordinates, len(connectivity)
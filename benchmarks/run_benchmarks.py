@@ -0,0 +1,319 @@
+# Benchmarks for the ZincWidget hot paths: mesh building, projection, click and box
+# selection latency, paint frame time and streamed coordinate writes at increasing
+# model sizes.  They run against PyZinc and Qt when installed and otherwise against the
+# stand-in in zincstandin.py.
+#
+#     python benchmarks/run_benchmarks.py --output results.json
+#     python benchmarks/run_benchmarks.py --baseline results.json
+#     python benchmarks/run_benchmarks.py --trace rotate.trace.gz --only paint
+#
+# Results are written as JSON.  With --baseline each result is compared with the same
+# benchmark, metric and size of an earlier run, and the exit status is 1 if any of them
+# got worse by more than the tolerance.
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+try:
+    from time import perf_counter as _clock
+except ImportError:
+    from time import time as _clock
+
+_benchmark_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_benchmark_dir))
+sys.path.insert(0, _benchmark_dir)
+
+import zincstandin
+
+import numpy
+
+from models import createCoordinateField, createWidget, gridMesh, processEvents
+
+
+def _statistics(samples):
+    samples = numpy.array(samples, dtype=numpy.float64) * 1000.0
+    return {'median': float(numpy.median(samples)), 'p95': float(numpy.percentile(samples, 95))}
+
+
+class _Results(object):
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, benchmark, size, metric, value, unit, better):
+        self.results.append({'benchmark': benchmark, 'size': size, 'metric': metric,
+                             'value': value, 'unit': unit, 'better': better})
+        print('%-16s %8d %-22s %14.3f %s' % (benchmark, size, metric, value, unit))
+
+    def addLatency(self, benchmark, size, samples):
+        for name, value in sorted(_statistics(samples).items()):
+            self.add(benchmark, size, name, value, 'ms', 'lower')
+
+
+def benchmarkMeshBuild(zinc, results, divisions, repeats):
+    coordinates, connectivity = gridMesh(divisions)
+    element_count = len(connectivity)
+    from zincwidget import ZincWidget
+    widget = ZincWidget()
+
+    # One element at a time, capped so large sizes stay quick.
+    single_count = min(element_count, 2000)
+    context = zinc.Context('benchmark')
+    fieldmodule = context.getDefaultRegion().getFieldmodule()
+    field = createCoordinateField(fieldmodule)
+    start = _clock()
+    for element_nodes in connectivity[:single_count]:
+        widget.create3DFiniteElement(fieldmodule, field, coordinates[element_nodes].tolist())
+    elapsed = _clock() - start
+    results.add('meshBuild', element_count, 'single_elements_per_s', single_count / elapsed, '1/s', 'higher')
+
+    rates = []
+    for repeat in range(repeats):
+        context = zinc.Context('benchmark')
+        fieldmodule = context.getDefaultRegion().getFieldmodule()
+        field = createCoordinateField(fieldmodule)
+        statistics = widget.createFiniteElements(fieldmodule, field, coordinates, connectivity)
+        rates.append(statistics.getElementsPerSecond())
+    results.add('meshBuild', element_count, 'bulk_elements_per_s', float(numpy.median(rates)), '1/s', 'higher')
+
+
+def benchmarkProject(zinc, results, divisions, repeats):
+    widget, coordinates, element_count = createWidget(divisions)
+    points = coordinates[:2000]
+    start = _clock()
+    for point in points.tolist():
+        widget.project(*point)
+    results.add('project', element_count, 'single_points_per_s', len(points) / (_clock() - start),
+                '1/s', 'higher')
+
+    samples = []
+    for repeat in range(repeats):
+        start = _clock()
+        window_coordinates = widget.projectPoints(coordinates)
+        samples.append(_clock() - start)
+    results.add('project', element_count, 'batch_points_per_s', len(coordinates) / numpy.median(samples),
+                '1/s', 'higher')
+
+    start = _clock()
+    for point in window_coordinates[:2000].tolist():
+        widget.unproject(*point)
+    results.add('unproject', element_count, 'single_points_per_s',
+                len(window_coordinates[:2000]) / (_clock() - start), '1/s', 'higher')
+    start = _clock()
+    widget.unprojectPoints(window_coordinates)
+    results.add('unproject', element_count, 'batch_points_per_s', len(coordinates) / (_clock() - start),
+                '1/s', 'higher')
+
+
+def _mouseEvent(event_type, x, y, modifiers):
+    QtCore = zinc.QtCore
+    button = QtCore.Qt.LeftButton
+    buttons = QtCore.Qt.NoButton if event_type == zinc.QtCore.QEvent.MouseButtonRelease else button
+    return zinc.QtGui.QMouseEvent(event_type, QtCore.QPoint(x, y), button, buttons, modifiers)
+
+
+def _select(widget, start, end):
+    QtCore = zinc.QtCore
+    modifiers = QtCore.Qt.CTRL
+    begin = _clock()
+    widget.mousePressEvent(_mouseEvent(QtCore.QEvent.MouseButtonPress, start[0], start[1], modifiers))
+    if start != end:
+        widget.mouseMoveEvent(_mouseEvent(QtCore.QEvent.MouseMove, end[0], end[1], modifiers))
+    widget.mouseReleaseEvent(_mouseEvent(QtCore.QEvent.MouseButtonRelease, end[0], end[1], modifiers))
+    # The selectionChanged delta is emitted on the next event loop pass.
+    processEvents()
+    return _clock() - begin
+
+
+def benchmarkSelection(zinc, results, divisions, repeats):
+    widget, coordinates, element_count = createWidget(divisions)
+    widget.setSelectModeNode()
+    # Include the cost of building selection deltas for a listener.
+    widget.setSelectionChangedMaximumRate(None)
+    widget.selectionChanged.connect(lambda delta: None)
+    window_coordinates = widget.projectPoints(coordinates)
+    targets = window_coordinates[numpy.linspace(0, len(coordinates) - 1, repeats).astype(int)]
+    width = widget.width()
+    height = widget.height()
+    box = ((width // 4, height // 4), (3 * width // 4, 3 * height // 4))
+    for name, index_enabled in [('picker', False), ('index', True)]:
+        widget.setSelectionIndexEnabled(index_enabled)
+        click_samples = [_select(widget, (int(x), int(y)), (int(x), int(y))) for x, y, z in targets]
+        results.addLatency('click_' + name, element_count, click_samples)
+        box_samples = [_select(widget, box[0], box[1]) for repeat in range(repeats)]
+        results.addLatency('boxSelect_' + name, element_count, box_samples)
+    widget.setSelectionIndexEnabled(False)
+
+
+def benchmarkPaint(zinc, results, divisions, repeats):
+    widget, coordinates, element_count = createWidget(divisions)
+    samples = []
+    for repeat in range(repeats):
+        start = _clock()
+        widget.updateGL()
+        samples.append(_clock() - start)
+    results.addLatency('paint', element_count, samples)
+
+
+def benchmarkStream(zinc, results, divisions, repeats):
+    '''
+    Time handing a new step of node coordinates to a CoordinateStream and
+    writing it to the field, as the viewer does once per frame.
+    '''
+    from coordinatestream import CoordinateStream
+    widget, coordinates, element_count = createWidget(divisions)
+    fieldmodule = widget.getContext().getDefaultRegion().getFieldmodule()
+    stream = CoordinateStream(fieldmodule.findNodesetByName('nodes'),
+                              fieldmodule.findFieldByName('coordinates'))
+    push_samples = []
+    apply_samples = []
+    for repeat in range(repeats):
+        values = coordinates * (1.0 + 0.01 * repeat)
+        start = _clock()
+        stream.push(values)
+        push_samples.append(_clock() - start)
+        start = _clock()
+        stream.apply()
+        apply_samples.append(_clock() - start)
+    results.addLatency('streamPush', element_count, push_samples)
+    results.addLatency('streamApply', element_count, apply_samples)
+    results.add('streamApply', element_count, 'nodes_per_s', len(coordinates) / numpy.median(apply_samples),
+                '1/s', 'higher')
+
+
+def benchmarkReplay(zinc, results, divisions, repeats, trace_filenames):
+    '''
+    Replay recorded input traces as fast as possible and report the
+    handling time of each event kind and the frame time.
+    '''
+    from inputtrace import replayTrace
+    widget, coordinates, element_count = createWidget(divisions)
+    for filename in trace_filenames:
+        name = os.path.splitext(os.path.basename(filename))[0].split('.')[0]
+        report = replayTrace(widget, filename)
+        for kind, statistics in sorted(report['events'].items()):
+            for metric in ['p50', 'p95']:
+                results.add('replay_' + name, element_count, '%s_%s' % (kind, metric), statistics[metric],
+                            'ms', 'lower')
+        paint = report['widget'].get('paintGL')
+        if paint and paint['count']:
+            for metric in ['p50', 'p95']:
+                results.add('replay_' + name, element_count, 'frame_' + metric, paint[metric], 'ms', 'lower')
+
+
+_benchmarks = [
+    ('meshBuild', benchmarkMeshBuild),
+    ('project', benchmarkProject),
+    ('selection', benchmarkSelection),
+    ('paint', benchmarkPaint),
+    ('stream', benchmarkStream),
+]
+
+
+class _Zinc(object):
+    '''
+    The modules used by the benchmarks, imported after the stand-in is
+    installed.
+    '''
+
+    def __init__(self):
+        from opencmiss.zinc.context import Context
+        try:
+            from PySide import QtCore, QtGui
+        except ImportError:
+            from PyQt4 import QtCore, QtGui
+        self.Context = Context
+        self.QtCore = QtCore
+        self.QtGui = QtGui
+        self.application = QtGui.QApplication.instance() or QtGui.QApplication(sys.argv)
+
+
+zinc = None
+
+
+def compareResults(results, baseline, tolerance):
+    '''
+    Print the change of each result against the matching baseline result and
+    return the number of regressions beyond tolerance.
+    '''
+    previous = dict(((result['benchmark'], result['size'], result['metric']), result)
+                    for result in baseline['results'])
+    regressions = 0
+    for result in results:
+        key = (result['benchmark'], result['size'], result['metric'])
+        if key not in previous or not previous[key]['value']:
+            continue
+        ratio = result['value'] / previous[key]['value']
+        if result['better'] == 'lower':
+            regressed = ratio > 1.0 + tolerance
+        else:
+            regressed = ratio < 1.0 / (1.0 + tolerance)
+        if regressed:
+            regressions += 1
+        print('%-16s %8d %-22s %7.2fx %s' % (key + (ratio, 'REGRESSION' if regressed else '')))
+
+    return regressions
+
+
+def main(argv=None):
+    global zinc
+    parser = argparse.ArgumentParser(description='Benchmark the ZincWidget hot paths.')
+    parser.add_argument('--divisions', type=int, nargs='+', default=[5, 10, 20],
+                        help='grid divisions per side, the model has divisions**3 elements')
+    parser.add_argument('--repeats', type=int, default=20, help='timed repeats per measurement')
+    parser.add_argument('--only', nargs='+', choices=[name for name, benchmark in _benchmarks],
+                        help='run only these benchmarks')
+    parser.add_argument('--trace', nargs='+', default=[],
+                        help='also replay these input traces recorded with inputtrace.InputTraceRecorder')
+    parser.add_argument('--standin', action='store_true',
+                        help='use the Zinc and Qt stand-in even if the real packages are installed')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with the results in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='relative change allowed before a result counts as a regression')
+    args = parser.parse_args(argv)
+
+    standin = zincstandin.install(force=args.standin)
+    zinc = _Zinc()
+    results = _Results()
+    for name, benchmark in _benchmarks:
+        if args.only and name not in args.only:
+            continue
+        for divisions in args.divisions:
+            benchmark(zinc, results, divisions, args.repeats)
+    if args.trace:
+        for divisions in args.divisions:
+            benchmarkReplay(zinc, results, divisions, args.repeats, args.trace)
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': numpy.__version__,
+            'zinc': 'standin' if standin['zinc'] else 'pyzinc',
+            'qt': 'standin' if standin['qt'] else zinc.QtCore.__name__.split('.')[0],
+        },
+        'arguments': {'divisions': args.divisions, 'repeats': args.repeats},
+        'results': results.results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('environment', {}).get('zinc') != report['environment']['zinc']:
+            print('Warning: comparing %s results with a %s baseline' %
+                  (report['environment']['zinc'], baseline.get('environment', {}).get('zinc')))
+        if compareResults(results.results, baseline, args.tolerance):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
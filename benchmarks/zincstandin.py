@@ -0,0 +1,1733 @@
+# A lightweight pure Python stand-in for the parts of the opencmiss.zinc modules and of
+# the Qt binding used by ZincWidget, so the benchmarks can run on a headless machine
+# without PyZinc, Qt or a display.  Call install() before importing zincwidget; it only
+# registers stand-in modules for packages that cannot be imported.
+#
+# The stand-in keeps nodes, elements, field values and selection groups in Python
+# containers and renders by projecting every node of every visible graphics with NumPy,
+# so its costs grow with model size like the real library does.  Absolute numbers are not
+# comparable with real PyZinc runs; compare runs of the same kind only.
+
+import heapq
+import collections
+import itertools
+import os
+import sys
+import threading
+import time
+import types
+
+import numpy
+
+OK = 1
+ERROR_GENERAL = -1
+
+SCENECOORDINATESYSTEM_LOCAL = 1
+SCENECOORDINATESYSTEM_WORLD = 2
+SCENECOORDINATESYSTEM_WINDOW_PIXEL_TOP_LEFT = 3
+
+
+# Qt stand-in start
+class _Qt(object):
+    NoButton = 0
+    LeftButton = 1
+    RightButton = 2
+    MidButton = 4
+    SHIFT = 0x02000000
+    CTRL = 0x04000000
+    ALT = 0x08000000
+    NoModifier = 0
+    SolidLine = 1
+    DashLine = 2
+    # Flag types convert from the integers stored in input traces.
+    MouseButton = int
+    MouseButtons = int
+    KeyboardModifiers = int
+
+
+class _EventLoop(object):
+    '''
+    Timers due at a time, run by processEvents().
+    '''
+
+    def __init__(self):
+        self._queue = []
+        self._sequence = itertools.count()
+        # Signals emitted on other threads, delivered by processEvents().
+        self._posted = collections.deque()
+        self._thread = threading.current_thread()
+
+    def post(self, call):
+        self._posted.append(call)
+
+    def isEventThread(self):
+        return threading.current_thread() is self._thread
+
+    def add(self, due, timer):
+        token = next(self._sequence)
+        heapq.heappush(self._queue, (due, token, timer))
+        return token
+
+    def processEvents(self, wait=0.0):
+        '''
+        Run the timers that are due, waiting up to wait seconds for timers
+        that become due.  Returns the number of timers run.
+        '''
+        end = time.time() + wait
+        count = 0
+        while self._posted:
+            self._posted.popleft()()
+            count += 1
+        while self._queue:
+            due, token, timer = self._queue[0]
+            now = time.time()
+            if due > now:
+                if due > end:
+                    break
+                time.sleep(due - now)
+                continue
+            heapq.heappop(self._queue)
+            if timer._token == token:
+                timer._fire()
+                count += 1
+
+        return count
+
+
+_event_loop = _EventLoop()
+
+
+def processEvents(wait=0.0):
+    return _event_loop.processEvents(wait)
+
+
+class _BoundSignal(object):
+
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self._slots = []
+        else:
+            self._slots.remove(slot)
+
+    def emit(self, *args):
+        if not _event_loop.isEventThread():
+            # Like a queued connection, deliver on the event loop thread.
+            _event_loop.post(lambda: self.emit(*args))
+            return
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class Signal(object):
+
+    def __init__(self, *types):
+        self._name = '_signal_%d' % id(self)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        bound = instance.__dict__.get(self._name)
+        if bound is None:
+            bound = instance.__dict__[self._name] = _BoundSignal()
+        return bound
+
+
+def SIGNAL(signature):
+    return signature
+
+
+class QObject(object):
+
+    destroyed = Signal(object)
+
+    def __init__(self, parent=None):
+        self._parent = parent
+        self._event_filters = []
+
+    def receivers(self, signature):
+        bound = self.__dict__.get(getattr(type(self), signature.split('(')[0])._name)
+        return len(bound._slots) if bound is not None else 0
+
+    def installEventFilter(self, event_filter):
+        self._event_filters.append(event_filter)
+
+    def removeEventFilter(self, event_filter):
+        if event_filter in self._event_filters:
+            self._event_filters.remove(event_filter)
+
+    def eventFilter(self, watched, event):
+        return False
+
+    def _filterEvent(self, event):
+        for event_filter in list(self._event_filters):
+            if event_filter.eventFilter(self, event):
+                return True
+        return False
+
+
+class QTimer(QObject):
+
+    timeout = Signal()
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self._single_shot = False
+        self._interval = 0
+        self._token = None
+
+    def setSingleShot(self, single_shot):
+        self._single_shot = single_shot
+
+    def setInterval(self, interval):
+        self._interval = interval
+
+    def interval(self):
+        return self._interval
+
+    def isActive(self):
+        return self._token is not None
+
+    def start(self, interval=None):
+        if interval is not None:
+            self._interval = interval
+        self._token = _event_loop.add(time.time() + self._interval / 1000.0, self)
+
+    def stop(self):
+        self._token = None
+
+    def _fire(self):
+        self._token = None
+        if not self._single_shot:
+            self.start()
+        self.timeout.emit()
+
+    @staticmethod
+    def singleShot(interval, slot):
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(slot)
+        timer.start(interval)
+        # Keep the timer alive until it fires.
+        _single_shot_timers.add(timer)
+        timer.timeout.connect(lambda: _single_shot_timers.discard(timer))
+
+
+_single_shot_timers = set()
+
+
+class QEvent(object):
+    MouseButtonPress = 2
+    MouseButtonRelease = 3
+    MouseMove = 5
+    Leave = 11
+    Resize = 14
+
+    def __init__(self, event_type):
+        self._type = event_type
+
+    def type(self):
+        return self._type
+
+
+class QPoint(object):
+
+    def __init__(self, x=0, y=0):
+        self._x = x
+        self._y = y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+
+class QRect(object):
+
+    def __init__(self, x=0, y=0, width=0, height=0):
+        self.rectangle = (x, y, width, height)
+
+
+class QThread(QObject):
+    pass
+
+
+class QCoreApplication(QObject):
+
+    def __init__(self, arguments=None):
+        QObject.__init__(self)
+
+    @staticmethod
+    def processEvents(*args):
+        processEvents()
+
+    @staticmethod
+    def instance():
+        return None
+
+
+class QColor(object):
+
+    def __init__(self, *rgb):
+        self.rgb = rgb
+
+
+class QPen(object):
+
+    def __init__(self, *args):
+        self.args = args
+
+
+class QPolygon(object):
+
+    def __init__(self, points=()):
+        self.points = list(points)
+
+
+class QPainter(object):
+    '''
+    Accepts and ignores all drawing calls.
+    '''
+
+    def __init__(self, device=None):
+        self._device = device
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+class QMouseEvent(QEvent):
+
+    def __init__(self, event_type, position, button, buttons, modifiers):
+        QEvent.__init__(self, event_type)
+        self._position = position
+        self._button = button
+        self._buttons = buttons
+        self._modifiers = modifiers
+
+    def x(self):
+        return self._position.x()
+
+    def y(self):
+        return self._position.y()
+
+    def pos(self):
+        return self._position
+
+    def button(self):
+        return self._button
+
+    def buttons(self):
+        return self._buttons
+
+    def modifiers(self):
+        return self._modifiers
+
+
+class QSize(object):
+
+    def __init__(self, width=0, height=0):
+        self._width = width
+        self._height = height
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+
+class QResizeEvent(QEvent):
+
+    def __init__(self, size, old_size):
+        QEvent.__init__(self, QEvent.Resize)
+        self._size = size
+        self._old_size = old_size
+
+    def size(self):
+        return self._size
+
+    def oldSize(self):
+        return self._old_size
+
+
+class QApplication(QCoreApplication):
+    pass
+
+
+class QGLFormat(object):
+
+    def setDepth(self, depth):
+        pass
+
+    def setDoubleBuffer(self, double_buffer):
+        pass
+
+
+class QGLWidget(QObject):
+    '''
+    Calls initializeGL, resizeGL and paintGL like QGLWidget without any
+    OpenGL context.
+    '''
+
+    def __init__(self, parent=None, shareWidget=None):
+        QObject.__init__(self, parent)
+        self._width = 640
+        self._height = 480
+        self._mouse_tracking = False
+        self._share_widget = shareWidget
+        self._gl_initialized = False
+        self._deleted = False
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def resize(self, width, height):
+        old_size = QSize(self._width, self._height)
+        self._width = width
+        self._height = height
+        if self._filterEvent(QResizeEvent(QSize(width, height), old_size)):
+            return
+        if self._gl_initialized:
+            self.resizeGL(width, height)
+
+    def event(self, event):
+        '''
+        Deliver a mouse event through the event filters to its handler,
+        as Qt does for events from the window system.
+        '''
+        if self._filterEvent(event):
+            return True
+        handlers = {QEvent.MouseButtonPress: self.mousePressEvent,
+                    QEvent.MouseMove: self.mouseMoveEvent,
+                    QEvent.MouseButtonRelease: self.mouseReleaseEvent}
+        if event.type() in handlers:
+            handlers[event.type()](event)
+            return True
+        return False
+
+    def show(self):
+        self.glInit()
+
+    def setMouseTracking(self, enable):
+        self._mouse_tracking = enable
+
+    def hasMouseTracking(self):
+        return self._mouse_tracking
+
+    def makeCurrent(self):
+        pass
+
+    def doneCurrent(self):
+        pass
+
+    def isSharing(self):
+        return self._share_widget is not None
+
+    def glInit(self):
+        if not self._gl_initialized:
+            self._gl_initialized = True
+            self.initializeGL()
+            self.resizeGL(self._width, self._height)
+
+    def updateGL(self):
+        if self._deleted:
+            raise RuntimeError('Internal C++ object already deleted.')
+        self.glInit()
+        self.paintGL()
+
+    def update(self):
+        self.updateGL()
+
+    def repaint(self):
+        self.updateGL()
+
+    def deleteLater(self):
+        '''
+        Delete the Qt object at once, leaving the Python wrapper behind.
+        '''
+        self._deleted = True
+        self.destroyed.emit(self)
+# Qt stand-in end
+
+
+# Zinc stand-in start
+class _Invalid(object):
+    '''
+    An invalid Zinc handle, every method returns another invalid handle.
+    '''
+
+    def isValid(self):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: _Invalid()
+
+
+class _Handle(object):
+
+    def isValid(self):
+        return True
+
+
+class Field(_Handle):
+    DOMAIN_TYPE_POINT = 1
+    DOMAIN_TYPE_NODES = 2
+    DOMAIN_TYPE_DATAPOINTS = 4
+    DOMAIN_TYPE_MESH1D = 8
+    DOMAIN_TYPE_MESH2D = 16
+    DOMAIN_TYPE_MESH3D = 32
+    DOMAIN_TYPE_MESH_HIGHEST_DIMENSION = 64
+    CHANGE_FLAG_NONE = 0
+    CHANGE_FLAG_ADD = 1
+    CHANGE_FLAG_REMOVE = 2
+    CHANGE_FLAG_DEFINITION = 8
+    CHANGE_FLAG_FULL_RESULT = 16
+    CHANGE_FLAG_PARTIAL_RESULT = 32
+    CHANGE_FLAG_RESULT = 48
+    COORDINATE_SYSTEM_TYPE_RECTANGULAR_CARTESIAN = 1
+
+    def __init__(self, fieldmodule, component_count):
+        self._fieldmodule = fieldmodule
+        self._component_count = component_count
+        self._name = None
+
+    def getFieldmodule(self):
+        return self._fieldmodule
+
+    def castGroup(self):
+        return self if isinstance(self, _FieldGroup) else _Invalid()
+
+    def getNumberOfComponents(self):
+        return self._component_count
+
+    def getName(self):
+        return self._name
+
+    def setName(self, name):
+        self._name = name
+        self._fieldmodule._fields[name] = self
+        return OK
+
+    def setManaged(self, managed):
+        return OK
+
+    def setTypeCoordinate(self, type_coordinate):
+        self._type_coordinate = type_coordinate
+        return OK
+
+    def isTypeCoordinate(self):
+        return getattr(self, '_type_coordinate', False)
+
+    def setCoordinateSystemType(self, coordinate_system_type):
+        return OK
+
+    def castFiniteElement(self):
+        return self
+
+    def evaluateReal(self, fieldcache, component_count):
+        return ERROR_GENERAL, [0.0] * component_count
+
+    def assignReal(self, fieldcache, values):
+        return ERROR_GENERAL
+
+
+class _FieldConstant(Field):
+
+    def __init__(self, fieldmodule, values):
+        Field.__init__(self, fieldmodule, len(values))
+        self._values = list(values)
+
+    def assignReal(self, fieldcache, values):
+        fieldcache._assigned[id(self)] = list(values)
+        return OK
+
+    def evaluateReal(self, fieldcache, component_count):
+        return OK, list(fieldcache._assigned.get(id(self), self._values))
+
+
+class _FieldFiniteElement(Field):
+    '''
+    Stores one value per node, elements evaluate to the mean of their nodes.
+    '''
+
+    def __init__(self, fieldmodule, component_count):
+        Field.__init__(self, fieldmodule, component_count)
+        self._node_values = {}
+
+    def assignReal(self, fieldcache, values):
+        location = fieldcache._location
+        if location is None or location[0] != 'node':
+            return ERROR_GENERAL
+        node = location[1]
+        self._node_values[(node._nodeset._name, node._identifier)] = list(values)
+        self._fieldmodule._changed(self)
+        return OK
+
+    def evaluateReal(self, fieldcache, component_count):
+        location = fieldcache._location
+        if location is not None and location[0] == 'node':
+            node = location[1]
+            values = self._node_values.get((node._nodeset._name, node._identifier))
+            if values is not None:
+                return OK, list(values)
+        elif location is not None and location[0] == 'element':
+            element = location[1]
+            node_identifiers = element._mesh._elements.get(element._identifier, [])
+            values = [self._node_values[('nodes', identifier)] for identifier in node_identifiers
+                      if ('nodes', identifier) in self._node_values]
+            if values:
+                return OK, list(numpy.mean(values, axis=0))
+        return ERROR_GENERAL, [0.0] * component_count
+
+    def _getArrays(self):
+        '''
+        Return the nodeset names and values of all nodes with values.
+        '''
+        keys = list(self._node_values.keys())
+        values = numpy.array([self._node_values[key] for key in keys], dtype=numpy.float64)
+        return keys, values.reshape(-1, self._component_count)
+
+
+class _FieldSceneviewerProjection(Field):
+
+    def __init__(self, fieldmodule, scene_viewer, from_system, to_system):
+        Field.__init__(self, fieldmodule, 16)
+        self._scene_viewer = scene_viewer
+        self._from_world = from_system != SCENECOORDINATESYSTEM_WINDOW_PIXEL_TOP_LEFT
+
+    def evaluateReal(self, fieldcache, component_count):
+        matrix = self._scene_viewer._getWorldToWindowMatrix()
+        if not self._from_world:
+            matrix = numpy.linalg.inv(matrix)
+        return OK, list(matrix.ravel())
+
+
+class _FieldProjection(Field):
+
+    def __init__(self, fieldmodule, source_field, matrix_field):
+        Field.__init__(self, fieldmodule, 3)
+        self._source_field = source_field
+        self._matrix_field = matrix_field
+
+    def evaluateReal(self, fieldcache, component_count):
+        result, values = self._source_field.evaluateReal(fieldcache, 3)
+        result, matrix = self._matrix_field.evaluateReal(fieldcache, 16)
+        transformed = numpy.array(matrix).reshape(4, 4).dot(list(values) + [1.0])
+        return OK, list(transformed[:3] / transformed[3])
+
+
+class _Iterator(object):
+
+    def __init__(self, items):
+        self._items = iter(items)
+
+    def next(self):
+        for item in self._items:
+            return item
+        return _Invalid()
+
+
+class Node(_Handle):
+
+    def __init__(self, nodeset, identifier):
+        self._nodeset = nodeset
+        self._identifier = identifier
+
+    def getIdentifier(self):
+        return self._identifier
+
+    def getNodeset(self):
+        return self._nodeset
+
+
+class _Nodetemplate(_Handle):
+
+    def defineField(self, field):
+        return OK
+
+
+class Nodeset(_Handle):
+
+    def __init__(self, fieldmodule, name):
+        self._fieldmodule = fieldmodule
+        self._name = name
+        self._identifiers = set()
+        self._next_identifier = 1
+
+    def getName(self):
+        return self._name
+
+    def getSize(self):
+        return len(self._identifiers)
+
+    def createNodetemplate(self):
+        return _Nodetemplate()
+
+    def createNode(self, identifier, node_template):
+        if identifier == -1:
+            identifier = self._next_identifier
+        self._identifiers.add(identifier)
+        self._next_identifier = max(self._next_identifier, identifier + 1)
+        self._fieldmodule._changed(None)
+        return Node(self, identifier)
+
+    def findNodeByIdentifier(self, identifier):
+        if identifier in self._identifiers:
+            return Node(self, identifier)
+        return _Invalid()
+
+    def createNodeiterator(self):
+        return _Iterator(Node(self, identifier) for identifier in sorted(self._identifiers))
+
+    def getMasterNodeset(self):
+        return self
+
+
+class Element(_Handle):
+    SHAPE_TYPE_LINE = 1
+    SHAPE_TYPE_SQUARE = 2
+    SHAPE_TYPE_TRIANGLE = 3
+    SHAPE_TYPE_CUBE = 4
+    SHAPE_TYPE_TETRAHEDRON = 5
+    SHAPE_TYPE_WEDGE12 = 6
+
+    def __init__(self, mesh, identifier):
+        self._mesh = mesh
+        self._identifier = identifier
+
+    def getIdentifier(self):
+        return self._identifier
+
+    def getMesh(self):
+        return self._mesh
+
+    def getDimension(self):
+        return self._mesh._dimension
+
+    def getShapeType(self):
+        return self._mesh._shapes.get(self._identifier, Element.SHAPE_TYPE_CUBE)
+
+
+class Elementbasis(_Handle):
+    FUNCTION_TYPE_LINEAR_LAGRANGE = 2
+    FUNCTION_TYPE_LINEAR_SIMPLEX = 5
+
+    def __init__(self, dimension, function_type):
+        self._function_types = [function_type] * dimension
+
+    def setFunctionType(self, chart_component, function_type):
+        self._function_types[chart_component - 1] = function_type
+        return OK
+
+
+class _Elementtemplate(_Handle):
+
+    def __init__(self):
+        self._shape_type = Element.SHAPE_TYPE_CUBE
+        self._nodes = {}
+        self._node_count = 0
+
+    def setElementShapeType(self, shape_type):
+        self._shape_type = shape_type
+        return OK
+
+    def setNumberOfNodes(self, node_count):
+        self._node_count = node_count
+        return OK
+
+    def defineFieldSimpleNodal(self, field, component, basis, node_indexes):
+        return OK
+
+    def setNode(self, local_index, node):
+        self._nodes[local_index] = node._identifier
+        return OK
+
+
+class Mesh(_Handle):
+
+    def __init__(self, fieldmodule, dimension):
+        self._fieldmodule = fieldmodule
+        self._dimension = dimension
+        self._elements = {}
+        self._shapes = {}
+        self._next_identifier = 1
+
+    def getDimension(self):
+        return self._dimension
+
+    def getName(self):
+        return 'mesh%dd' % self._dimension
+
+    def getSize(self):
+        return len(self._elements)
+
+    def createElementtemplate(self):
+        return _Elementtemplate()
+
+    def defineElement(self, identifier, element_template):
+        if identifier == -1:
+            identifier = self._next_identifier
+        self._elements[identifier] = [element_template._nodes[i]
+                                      for i in range(1, element_template._node_count + 1)]
+        self._shapes[identifier] = element_template._shape_type
+        self._next_identifier = max(self._next_identifier, identifier + 1)
+        self._fieldmodule._changed(None)
+        return OK
+
+    def findElementByIdentifier(self, identifier):
+        if identifier in self._elements:
+            return Element(self, identifier)
+        return _Invalid()
+
+    def createElementiterator(self):
+        return _Iterator(Element(self, identifier) for identifier in sorted(self._elements))
+
+    def getMasterMesh(self):
+        return self
+
+
+class _NodesetGroup(_Handle):
+
+    def __init__(self, nodeset):
+        self._nodeset = nodeset
+        self._identifiers = set()
+
+    def _changed(self):
+        self._nodeset._fieldmodule._region._scene._selectionChanged()
+
+    def getSize(self):
+        return len(self._identifiers)
+
+    def containsNode(self, node):
+        return node._identifier in self._identifiers
+
+    def addNode(self, node):
+        self._identifiers.add(node._identifier)
+        self._changed()
+        return OK
+
+    def removeNode(self, node):
+        self._identifiers.discard(node._identifier)
+        self._changed()
+        return OK
+
+    def createNodeiterator(self):
+        return _Iterator(Node(self._nodeset, identifier) for identifier in sorted(self._identifiers))
+
+    def getMasterNodeset(self):
+        return self._nodeset
+
+
+class _MeshGroup(_Handle):
+
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._identifiers = set()
+
+    def _changed(self):
+        self._mesh._fieldmodule._region._scene._selectionChanged()
+
+    def getSize(self):
+        return len(self._identifiers)
+
+    def containsElement(self, element):
+        return element._identifier in self._identifiers
+
+    def addElement(self, element):
+        self._identifiers.add(element._identifier)
+        self._changed()
+        return OK
+
+    def removeElement(self, element):
+        self._identifiers.discard(element._identifier)
+        self._changed()
+        return OK
+
+    def createElementiterator(self):
+        return _Iterator(Element(self._mesh, identifier) for identifier in sorted(self._identifiers))
+
+    def getMasterMesh(self):
+        return self._mesh
+
+
+class _FieldNodeGroup(Field):
+
+    def __init__(self, fieldmodule, nodeset):
+        Field.__init__(self, fieldmodule, 1)
+        self._group = _NodesetGroup(nodeset)
+
+    def getNodesetGroup(self):
+        return self._group
+
+
+class _FieldElementGroup(Field):
+
+    def __init__(self, fieldmodule, mesh):
+        Field.__init__(self, fieldmodule, 1)
+        self._group = _MeshGroup(mesh)
+
+    def getMeshGroup(self):
+        return self._group
+
+
+class _FieldGroup(Field):
+
+    def __init__(self, fieldmodule):
+        Field.__init__(self, fieldmodule, 1)
+        self._node_groups = {}
+        self._element_groups = {}
+
+    def getFieldNodeGroup(self, nodeset):
+        return self._node_groups.get(nodeset._name, _Invalid())
+
+    def createFieldNodeGroup(self, nodeset):
+        group = self._node_groups[nodeset._name] = _FieldNodeGroup(self._fieldmodule, nodeset)
+        return group
+
+    def getFieldElementGroup(self, mesh):
+        return self._element_groups.get(mesh._dimension, _Invalid())
+
+    def createFieldElementGroup(self, mesh):
+        group = self._element_groups[mesh._dimension] = _FieldElementGroup(self._fieldmodule, mesh)
+        return group
+
+    def clear(self):
+        for group in list(self._node_groups.values()) + list(self._element_groups.values()):
+            group._group._identifiers.clear()
+        self._fieldmodule._region._scene._selectionChanged()
+        return OK
+
+    def isEmpty(self):
+        return all(group._group.getSize() == 0
+                   for group in list(self._node_groups.values()) + list(self._element_groups.values()))
+
+
+class Fieldcache(_Handle):
+
+    def __init__(self, fieldmodule):
+        self._fieldmodule = fieldmodule
+        self._assigned = {}
+        self._location = None
+        self._time = 0.0
+
+    def setNode(self, node):
+        self._location = ('node', node)
+        return OK
+
+    def setMeshLocation(self, element, xi):
+        self._location = ('element', element, xi)
+        return OK
+
+    def setTime(self, time):
+        self._time = time
+        return OK
+
+    def clearLocation(self):
+        self._location = None
+        return OK
+
+
+class _Nodesetchanges(_Handle):
+
+    def __init__(self, flags):
+        self._flags = flags
+
+    def getSummaryNodeChangeFlags(self):
+        return self._flags
+
+    def getNumberOfChanges(self):
+        return -1
+
+
+class Fieldmoduleevent(_Handle):
+
+    def __init__(self, changed_fields, nodes_changed):
+        self._changed_fields = changed_fields
+        self._nodes_changed = nodes_changed
+
+    def getSummaryFieldChangeFlags(self):
+        return Field.CHANGE_FLAG_RESULT if self._changed_fields else Field.CHANGE_FLAG_NONE
+
+    def getFieldChangeFlags(self, field):
+        return Field.CHANGE_FLAG_RESULT if id(field) in self._changed_fields else Field.CHANGE_FLAG_NONE
+
+    def getNodesetChanges(self, nodeset):
+        return _Nodesetchanges(1 if self._nodes_changed else 0)
+
+
+class _Notifier(_Handle):
+
+    def __init__(self):
+        self._callback = None
+
+    def setCallback(self, callback):
+        self._callback = callback
+        return OK
+
+    def clearCallback(self):
+        self._callback = None
+        return OK
+
+    def _notify(self, event):
+        if self._callback is not None:
+            self._callback(event)
+
+
+class Fieldmodule(_Handle):
+
+    def __init__(self, region):
+        self._region = region
+        self._fields = {}
+        self._change_level = 0
+        self._changed_fields = set()
+        self._nodes_changed = False
+        self._notifiers = []
+        self._nodesets = {'nodes': Nodeset(self, 'nodes'),
+                          'datapoints': Nodeset(self, 'datapoints')}
+        self._meshes = dict((dimension, Mesh(self, dimension)) for dimension in (1, 2, 3))
+
+    def getRegion(self):
+        return self._region
+
+    def beginChange(self):
+        self._change_level += 1
+        return OK
+
+    def endChange(self):
+        self._change_level -= 1
+        if self._change_level == 0:
+            self._notify()
+        return OK
+
+    def _changed(self, field):
+        if field is None:
+            self._nodes_changed = True
+        else:
+            self._changed_fields.add(id(field))
+        if self._change_level == 0:
+            self._notify()
+
+    def _notify(self):
+        if not self._changed_fields and not self._nodes_changed:
+            return
+        event = Fieldmoduleevent(self._changed_fields, self._nodes_changed)
+        self._changed_fields = set()
+        self._nodes_changed = False
+        for notifier in list(self._notifiers):
+            notifier._notify(event)
+        self._region._scene._changed()
+
+    def createFieldcache(self):
+        return Fieldcache(self)
+
+    def createFieldConstant(self, values):
+        return _FieldConstant(self, values)
+
+    def createFieldFiniteElement(self, component_count):
+        return _FieldFiniteElement(self, component_count)
+
+    def createFieldSceneviewerProjection(self, scene_viewer, from_system, to_system):
+        return _FieldSceneviewerProjection(self, scene_viewer, from_system, to_system)
+
+    def createFieldProjection(self, source_field, matrix_field):
+        return _FieldProjection(self, source_field, matrix_field)
+
+    def createFieldGroup(self):
+        return _FieldGroup(self)
+
+    def findFieldByName(self, name):
+        return self._fields.get(name, _Invalid())
+
+    def createFielditerator(self):
+        return _Iterator([self._fields[name] for name in sorted(self._fields)])
+
+    def findNodesetByName(self, name):
+        return self._nodesets.get(name, _Invalid())
+
+    def findMeshByDimension(self, dimension):
+        return self._meshes.get(dimension, _Invalid())
+
+    def createElementbasis(self, dimension, function_type):
+        return Elementbasis(dimension, function_type)
+
+    def createFieldmodulenotifier(self):
+        notifier = _Notifier()
+        self._notifiers.append(notifier)
+        return notifier
+
+
+class Graphics(_Handle):
+    TYPE_POINTS = 1
+    TYPE_LINES = 2
+    TYPE_SURFACES = 3
+    TYPE_CONTOURS = 4
+    TYPE_STREAMLINES = 5
+
+    def __init__(self, scene, graphics_type, domain_type):
+        self._scene = scene
+        self._type = graphics_type
+        self._domain_type = domain_type
+        self._visible = True
+        self._coordinate_field = None
+
+    def getGraphicspointattributes(self):
+        return _Graphicspointattributes()
+
+    def getScene(self):
+        return self._scene
+
+    def getType(self):
+        return self._type
+
+    def getFieldDomainType(self):
+        return self._domain_type
+
+    def getTessellation(self):
+        return self._scene._region._context.getTessellationmodule().getDefaultTessellation()
+
+    def setFieldDomainType(self, domain_type):
+        self._domain_type = domain_type
+        self._scene._changed()
+        return OK
+
+    def setCoordinateField(self, field):
+        self._coordinate_field = field
+        self._scene._changed()
+        return OK
+
+    def getVisibilityFlag(self):
+        return self._visible
+
+    def setVisibilityFlag(self, visible):
+        self._visible = visible
+        self._scene._changed()
+        return OK
+
+
+class Glyph(_Handle):
+    SHAPE_TYPE_POINT = 2
+    SHAPE_TYPE_SPHERE = 10
+    SHAPE_TYPE_CUBE_WIREFRAME = 6
+
+
+class _Graphicspointattributes(_Handle):
+
+    def setGlyphShapeType(self, shape_type):
+        return OK
+
+    def setBaseSize(self, base_size):
+        return OK
+
+
+class Scenepicker(_Handle):
+    '''
+    Picks the nodes of visible node and datapoint graphics whose window
+    coordinates lie in the rectangle, nearest first.
+    '''
+
+    def __init__(self, scene):
+        self._scene = scene
+        self._scene_viewer = None
+        self._rectangle = None
+        self._picked = None
+
+    def setScenefilter(self, scene_filter):
+        return OK
+
+    def setSceneviewerRectangle(self, scene_viewer, coordinate_system, x1, y1, x2, y2):
+        self._scene_viewer = scene_viewer
+        self._rectangle = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        self._picked = None
+        return OK
+
+    def _pick(self):
+        if self._picked is None:
+            self._picked = []
+            matrix = self._scene_viewer._getWorldToWindowMatrix()
+            left, top, right, bottom = self._rectangle
+            for graphics, keys, values in self._scene._getPointArrays():
+                if len(values) == 0:
+                    continue
+                transformed = values.dot(matrix[:, :3].T) + matrix[:, 3]
+                window = transformed[:, :3] / transformed[:, 3:4]
+                inside = numpy.nonzero((window[:, 0] >= left) & (window[:, 0] <= right) &
+                                       (window[:, 1] >= top) & (window[:, 1] <= bottom))[0]
+                for index in inside:
+                    self._picked.append((window[index, 2], graphics, keys[index]))
+            self._picked.sort(key=lambda picked: picked[0])
+        return self._picked
+
+    def getNearestGraphics(self):
+        picked = self._pick()
+        return picked[0][1] if picked else _Invalid()
+
+    def getNearestNode(self):
+        picked = self._pick()
+        if not picked:
+            return _Invalid()
+        nodeset_name, identifier = picked[0][2]
+        return Node(self._scene._region._fieldmodule._nodesets[nodeset_name], identifier)
+
+    def getNearestElement(self):
+        return _Invalid()
+
+    def addPickedNodesToFieldGroup(self, group):
+        fieldmodule = self._scene._region._fieldmodule
+        for depth, graphics, (nodeset_name, identifier) in self._pick():
+            nodeset = fieldmodule._nodesets[nodeset_name]
+            nodegroup = group.getFieldNodeGroup(nodeset)
+            if not nodegroup.isValid():
+                nodegroup = group.createFieldNodeGroup(nodeset)
+            nodegroup.getNodesetGroup()._identifiers.add(identifier)
+        self._scene._selectionChanged()
+        return OK
+
+    def addPickedElementsToFieldGroup(self, group):
+        return OK
+
+
+class Selectionevent(_Handle):
+    CHANGE_FLAG_NONE = 0
+    CHANGE_FLAG_ADD = 1
+    CHANGE_FLAG_REMOVE = 2
+
+    def getChangeFlags(self):
+        return Selectionevent.CHANGE_FLAG_ADD | Selectionevent.CHANGE_FLAG_REMOVE
+
+
+class Scene(_Handle):
+
+    def __init__(self, region):
+        self._region = region
+        self._graphics = []
+        self._scene_viewers = []
+        self._selection_notifiers = []
+        self._selection_field = _Invalid()
+        self._change_level = 0
+        self._selection_changed = False
+
+    def getRegion(self):
+        return self._region
+
+    def beginChange(self):
+        self._change_level += 1
+        return OK
+
+    def endChange(self):
+        self._change_level -= 1
+        if self._change_level == 0:
+            self._changed()
+        return OK
+
+    def _changed(self):
+        if self._change_level == 0:
+            for scene_viewer in list(self._scene_viewers):
+                scene_viewer._notifyRepaint()
+
+    def _selectionChanged(self):
+        if self._region._hierarchical_change_level:
+            self._selection_changed = True
+            return
+        for notifier in list(self._selection_notifiers):
+            notifier._notify(Selectionevent())
+        self._changed()
+
+    def _getPointArrays(self):
+        '''
+        Yield (graphics, keys, coordinates) for every visible node and
+        datapoint graphics.
+        '''
+        field = self._region._fieldmodule._fields.get('coordinates')
+        if field is None:
+            return
+        keys, values = field._getArrays()
+        for graphics in self._graphics:
+            if graphics._visible and graphics._domain_type in (Field.DOMAIN_TYPE_NODES,
+                                                               Field.DOMAIN_TYPE_DATAPOINTS):
+                yield graphics, keys, values
+
+    def setSelectionField(self, field):
+        self._selection_field = field
+        return OK
+
+    def getSelectionField(self):
+        return self._selection_field
+
+    def createScenepicker(self):
+        return Scenepicker(self)
+
+    def createSelectionnotifier(self):
+        notifier = _Notifier()
+        self._selection_notifiers.append(notifier)
+        return notifier
+
+    def _createGraphics(self, graphics_type, domain_type):
+        graphics = Graphics(self, graphics_type, domain_type)
+        self._graphics.append(graphics)
+        self._changed()
+        return graphics
+
+    def createGraphicsPoints(self):
+        return self._createGraphics(Graphics.TYPE_POINTS, Field.DOMAIN_TYPE_POINT)
+
+    def createGraphicsLines(self):
+        return self._createGraphics(Graphics.TYPE_LINES, Field.DOMAIN_TYPE_MESH1D)
+
+    def createGraphicsSurfaces(self):
+        return self._createGraphics(Graphics.TYPE_SURFACES, Field.DOMAIN_TYPE_MESH2D)
+
+    def createGraphicsStreamlines(self):
+        return self._createGraphics(Graphics.TYPE_STREAMLINES, Field.DOMAIN_TYPE_MESH_HIGHEST_DIMENSION)
+
+    def getFirstGraphics(self):
+        return self._graphics[0] if self._graphics else _Invalid()
+
+    def getNextGraphics(self, graphics):
+        index = self._graphics.index(graphics) + 1
+        return self._graphics[index] if index < len(self._graphics) else _Invalid()
+
+    def removeAllGraphics(self):
+        self._graphics = []
+        self._changed()
+        return OK
+
+
+class Sceneviewerevent(_Handle):
+    CHANGE_FLAG_NONE = 0
+    CHANGE_FLAG_REPAINT_REQUIRED = 1
+    CHANGE_FLAG_TRANSFORM = 2
+    CHANGE_FLAG_FINAL = 32768
+
+    def __init__(self, change_flags):
+        self._change_flags = change_flags
+
+    def getChangeFlags(self):
+        return self._change_flags
+
+
+class Sceneviewerinput(_Handle):
+    BUTTON_TYPE_LEFT = 1
+    BUTTON_TYPE_MIDDLE = 2
+    BUTTON_TYPE_RIGHT = 3
+    MODIFIER_FLAG_NONE = 0
+    MODIFIER_FLAG_SHIFT = 1
+    EVENT_TYPE_MOTION_NOTIFY = 1
+    EVENT_TYPE_BUTTON_PRESS = 2
+    EVENT_TYPE_BUTTON_RELEASE = 3
+
+    def __init__(self):
+        self._position = (0, 0)
+        self._event_type = None
+        self._button_type = None
+        self._modifier_flags = 0
+
+    def setPosition(self, x, y):
+        self._position = (x, y)
+        return OK
+
+    def setEventType(self, event_type):
+        self._event_type = event_type
+        return OK
+
+    def setButtonType(self, button_type):
+        self._button_type = button_type
+        return OK
+
+    def setModifierFlags(self, modifier_flags):
+        self._modifier_flags = modifier_flags
+        return OK
+
+
+class Sceneviewer(_Handle):
+    '''
+    An orthographic viewer: dragging pans, viewAll fits the node coordinates.
+    '''
+    BUFFERING_MODE_SINGLE = 1
+    BUFFERING_MODE_DOUBLE = 2
+    STEREO_MODE_DEFAULT = 0
+    PROJECTION_MODE_PARALLEL = 1
+    PROJECTION_MODE_PERSPECTIVE = 2
+
+    def __init__(self):
+        self._width = 640
+        self._height = 480
+        self._scene = None
+        self._notifiers = []
+        self._scale = 100.0
+        self._lookat = [0.0, 0.0, 0.0]
+        self._eye = [0.0, 0.0, 5.0]
+        self._up = [0.0, 1.0, 0.0]
+        self._drag_position = None
+
+    def _getWorldToWindowMatrix(self):
+        scale = self._scale
+        x, y, z = self._lookat
+        return numpy.array([[scale, 0.0, 0.0, 0.5 * self._width - scale * x],
+                            [0.0, -scale, 0.0, 0.5 * self._height + scale * y],
+                            [0.0, 0.0, 0.01, 0.5 - 0.01 * z],
+                            [0.0, 0.0, 0.0, 1.0]])
+
+    def _notifyRepaint(self):
+        event = Sceneviewerevent(Sceneviewerevent.CHANGE_FLAG_REPAINT_REQUIRED)
+        for notifier in list(self._notifiers):
+            notifier._notify(event)
+
+    def setScenefilter(self, scene_filter):
+        return OK
+
+    def setScene(self, scene):
+        if self._scene is not None:
+            self._scene._scene_viewers.remove(self)
+        self._scene = scene
+        scene._scene_viewers.append(self)
+        self._notifyRepaint()
+        return OK
+
+    def getScene(self):
+        return self._scene
+
+    def createSceneviewernotifier(self):
+        notifier = _Notifier()
+        self._notifiers.append(notifier)
+        return notifier
+
+    def createSceneviewerinput(self):
+        return Sceneviewerinput()
+
+    def processSceneviewerinput(self, scene_input):
+        event_type = scene_input._event_type
+        if event_type == Sceneviewerinput.EVENT_TYPE_BUTTON_PRESS:
+            self._drag_position = scene_input._position
+        elif event_type == Sceneviewerinput.EVENT_TYPE_BUTTON_RELEASE:
+            self._drag_position = None
+        elif event_type == Sceneviewerinput.EVENT_TYPE_MOTION_NOTIFY and self._drag_position is not None:
+            x, y = scene_input._position
+            self._lookat[0] -= (x - self._drag_position[0]) / self._scale
+            self._lookat[1] += (y - self._drag_position[1]) / self._scale
+            self._drag_position = scene_input._position
+            self._notifyRepaint()
+        return OK
+
+    def renderScene(self):
+        '''
+        Project the nodes of every visible graphics to window coordinates,
+        standing in for the per frame work of the real renderer.
+        '''
+        if self._scene is not None:
+            matrix = self._getWorldToWindowMatrix()
+            field = self._scene._region._fieldmodule._fields.get('coordinates')
+            if field is not None:
+                keys, values = field._getArrays()
+                for graphics in self._scene._graphics:
+                    if graphics._visible and len(values):
+                        values.dot(matrix[:, :3].T)
+        return OK
+
+    def viewAll(self):
+        field = self._scene._region._fieldmodule._fields.get('coordinates') if self._scene else None
+        if field is not None:
+            keys, values = field._getArrays()
+            if len(values):
+                low = values.min(axis=0)
+                high = values.max(axis=0)
+                self._lookat = list(0.5 * (low + high))
+                size = max(float((high - low)[:2].max()), 1.0e-6)
+                self._scale = 0.8 * min(self._width, self._height) / size
+        self._notifyRepaint()
+        return OK
+
+    def setViewportSize(self, width, height):
+        self._width = width
+        self._height = height
+        self._notifyRepaint()
+        return OK
+
+    def getLookatParameters(self):
+        return OK, list(self._lookat), list(self._eye), list(self._up)
+
+    def setLookatParametersNonSkew(self, eye, lookat, up):
+        self._eye = list(eye)
+        self._lookat = list(lookat)
+        self._up = list(up)
+        self._notifyRepaint()
+        return OK
+
+    def setProjectionMode(self, projection_mode):
+        return OK
+
+
+class _Sceneviewermodule(_Handle):
+
+    def createSceneviewer(self, buffering_mode, stereo_mode):
+        return Sceneviewer()
+
+
+class _Scenefiltermodule(_Handle):
+
+    def createScenefilterVisibilityFlags(self):
+        return _Handle()
+
+
+class _Glyphmodule(_Handle):
+
+    def __init__(self):
+        self._defined = False
+
+    def defineStandardGlyphs(self):
+        self._defined = True
+        return OK
+
+    def findGlyphByName(self, name):
+        return _Handle() if self._defined else _Invalid()
+
+
+class Tessellation(_Handle):
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+        self._minimum_divisions = [1, 1, 1]
+        self._refinement_factors = [4, 4, 4]
+        self._circle_divisions = 12
+
+    def getName(self):
+        return self._name
+
+    def getMinimumDivisions(self, values_count):
+        return OK, self._minimum_divisions[:values_count]
+
+    def setMinimumDivisions(self, divisions):
+        self._minimum_divisions = list(divisions)
+        return OK
+
+    def getRefinementFactors(self, values_count):
+        return OK, self._refinement_factors[:values_count]
+
+    def setRefinementFactors(self, factors):
+        self._refinement_factors = list(factors)
+        return OK
+
+    def getCircleDivisions(self):
+        return self._circle_divisions
+
+    def setCircleDivisions(self, circle_divisions):
+        self._circle_divisions = circle_divisions
+        return OK
+
+
+class _Tessellationmodule(_Handle):
+
+    def __init__(self):
+        self._tessellations = [Tessellation(self, 'default'), Tessellation(self, 'default_points')]
+
+    def beginChange(self):
+        return OK
+
+    def endChange(self):
+        return OK
+
+    def createTessellationiterator(self):
+        return _Iterator(self._tessellations)
+
+    def getDefaultTessellation(self):
+        return self._tessellations[0]
+
+    def getDefaultPointsTessellation(self):
+        return self._tessellations[1]
+
+
+class _Materialmodule(_Handle):
+
+    def defineStandardMaterials(self):
+        return OK
+
+
+class Region(_Handle):
+
+    def __init__(self, context, name=None):
+        self._context = context
+        self._name = name
+        self._parent = None
+        self._children = []
+        self._hierarchical_change_level = 0
+        self._files_read = []
+        self._fieldmodule = Fieldmodule(self)
+        self._scene = Scene(self)
+
+    def getName(self):
+        return self._name
+
+    def getPath(self):
+        names = []
+        region = self
+        while region._parent is not None:
+            names.insert(0, region._name)
+            region = region._parent
+        return '/' + ''.join(name + '/' for name in names)
+
+    def getContext(self):
+        return self._context
+
+    def readFile(self, filename):
+        '''
+        Record the file, standing in for parsing it.  Fails if it does not
+        exist.
+        '''
+        if not os.path.exists(filename):
+            return ERROR_GENERAL
+        self._files_read.append(filename)
+        return OK
+
+    def createChild(self, name):
+        child = Region(self._context, name)
+        child._parent = self
+        self._children.append(child)
+        return child
+
+    def getFirstChild(self):
+        return self._children[0] if self._children else _Invalid()
+
+    def getNextSibling(self):
+        if self._parent is not None:
+            siblings = self._parent._children
+            index = siblings.index(self) + 1
+            if index < len(siblings):
+                return siblings[index]
+        return _Invalid()
+
+    def getFieldmodule(self):
+        return self._fieldmodule
+
+    def getScene(self):
+        return self._scene
+
+    def beginHierarchicalChange(self):
+        self._hierarchical_change_level += 1
+        self._fieldmodule.beginChange()
+        return OK
+
+    def endHierarchicalChange(self):
+        self._hierarchical_change_level -= 1
+        self._fieldmodule.endChange()
+        if self._hierarchical_change_level == 0 and self._scene._selection_changed:
+            self._scene._selection_changed = False
+            self._scene._selectionChanged()
+        return OK
+
+
+class Context(_Handle):
+
+    def __init__(self, name):
+        self._name = name
+        self._default_region = Region(self, 'root')
+        self._scene_viewer_module = _Sceneviewermodule()
+        self._glyph_module = _Glyphmodule()
+        self._tessellation_module = _Tessellationmodule()
+
+    def getName(self):
+        return self._name
+
+    def getDefaultRegion(self):
+        return self._default_region
+
+    def createRegion(self):
+        return Region(self)
+
+    def getSceneviewermodule(self):
+        return self._scene_viewer_module
+
+    def getScenefiltermodule(self):
+        return _Scenefiltermodule()
+
+    def getGlyphmodule(self):
+        return self._glyph_module
+
+    def getMaterialmodule(self):
+        return _Materialmodule()
+
+    def getTessellationmodule(self):
+        return self._tessellation_module
+# Zinc stand-in end
+
+
+_zinc_modules = {
+    'opencmiss.zinc.context': ['Context'],
+    'opencmiss.zinc.element': ['Element', 'Elementbasis'],
+    'opencmiss.zinc.field': ['Field', 'Fieldcache'],
+    'opencmiss.zinc.fieldmodule': ['Fieldmodule', 'Fieldmoduleevent'],
+    'opencmiss.zinc.glyph': ['Glyph'],
+    'opencmiss.zinc.graphics': ['Graphics'],
+    'opencmiss.zinc.node': ['Node', 'Nodeset'],
+    'opencmiss.zinc.region': ['Region'],
+    'opencmiss.zinc.scene': ['Scene'],
+    'opencmiss.zinc.scenecoordinatesystem': ['SCENECOORDINATESYSTEM_LOCAL',
+                                             'SCENECOORDINATESYSTEM_WORLD',
+                                             'SCENECOORDINATESYSTEM_WINDOW_PIXEL_TOP_LEFT'],
+    'opencmiss.zinc.scenepicker': ['Scenepicker'],
+    'opencmiss.zinc.sceneviewer': ['Sceneviewer', 'Sceneviewerevent'],
+    'opencmiss.zinc.sceneviewerinput': ['Sceneviewerinput'],
+    'opencmiss.zinc.selection': ['Selectionevent'],
+    'opencmiss.zinc.status': ['OK', 'ERROR_GENERAL'],
+    'opencmiss.zinc.tessellation': ['Tessellation'],
+}
+
+_qt_modules = {
+    'PySide.QtCore': ['Qt', 'Signal', 'QObject', 'QTimer', 'QEvent', 'QPoint', 'QRect', 'QSize', 'QThread',
+                      'QCoreApplication', 'SIGNAL'],
+    'PySide.QtGui': ['QColor', 'QPen', 'QPolygon', 'QPainter', 'QMouseEvent', 'QResizeEvent', 'QApplication'],
+    'PySide.QtOpenGL': ['QGLFormat', 'QGLWidget'],
+}
+
+Qt = _Qt()
+
+
+def _importable(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+
+    return True
+
+
+def _register(modules):
+    namespace = globals()
+    for name in sorted(modules):
+        parts = name.split('.')
+        for i in range(1, len(parts) + 1):
+            package_name = '.'.join(parts[:i])
+            if package_name not in sys.modules:
+                module = types.ModuleType(package_name)
+                module.__path__ = []
+                sys.modules[package_name] = module
+                if i > 1:
+                    setattr(sys.modules['.'.join(parts[:i - 1])], parts[i - 1], module)
+        module = sys.modules[name]
+        for attribute in modules[name]:
+            setattr(module, attribute, namespace[attribute])
+
+
+def install(force=False):
+    '''
+    Register the stand-in modules for Zinc and Qt where the real packages
+    cannot be imported, or always if force is True.  Returns a dict saying
+    whether the stand-in is used for 'zinc' and for 'qt'.
+    '''
+    use_zinc = force or not _importable('opencmiss.zinc.context')
+    use_qt = force or not (_importable('PySide.QtOpenGL') or _importable('PyQt4.QtOpenGL'))
+    if use_zinc:
+        _register(_zinc_modules)
+    if use_qt:
+        _register(_qt_modules)
+
+    return {'zinc': use_zinc, 'qt': use_qt}
@@ -0,0 +1,122 @@
+# This python module streams node coordinates from a running simulation into an
+# OpenCMISS-Zinc field.  The solver hands over a NumPy array per timestep from its own
+# thread and the viewer writes the latest one in bulk just before it renders.
+
+import threading
+
+try:
+    from PySide import QtCore
+except ImportError:
+    from PyQt4 import QtCore
+
+import numpy
+
+from meshbuilder import NodeValueWriter
+
+
+class CoordinateStream(QtCore.QObject):
+    '''
+    A double buffered hand over of field values from a solver thread to the
+    GUI thread.  push() copies a step into the back buffer and returns
+    without waiting for rendering.  apply(), called by the viewer once per
+    frame, swaps the buffers and writes the newest step to the field in
+    one change block.  Steps pushed before the previous one was applied
+    are dropped and counted.
+
+    dataArrived is emitted once for the first step pushed after each
+    apply(), and Qt queues it to the GUI thread.
+    '''
+
+    try:
+        # PySide
+        dataArrived = QtCore.Signal()
+    except AttributeError:
+        # PyQt
+        dataArrived = QtCore.pyqtSignal()
+
+    def __init__(self, nodeset, field, identifiers=None, parent=None):
+        QtCore.QObject.__init__(self, parent)
+        self._writer = NodeValueWriter(nodeset, field, identifiers)
+        shape = self._writer.getShape()
+        self._front = numpy.zeros(shape)
+        self._back = numpy.zeros(shape)
+        self._back_time = None
+        self._lock = threading.Lock()
+        self._pending = False
+        self._time = None
+        self.pushed_count = 0
+        self.applied_count = 0
+        self.dropped_count = 0
+
+    def getIdentifiers(self):
+        '''
+        Get the node identifiers in the order of the rows pushed.
+        '''
+        return self._writer.getIdentifiers()
+
+    def getShape(self):
+        return self._writer.getShape()
+
+    def getNodeset(self):
+        return self._writer.getNodeset()
+
+    def getField(self):
+        return self._writer.getField()
+
+    def push(self, values, time=None):
+        '''
+        Hand over the (N, components) values of one step, with an optional
+        solver time.  Safe to call from any thread.  The values are copied
+        so the caller may reuse its array.
+        '''
+        values = numpy.asarray(values, dtype=numpy.float64)
+        if values.shape != self._back.shape:
+            raise ValueError('Values must have shape (%d, %d)' % self._back.shape)
+
+        with self._lock:
+            self._back[...] = values
+            self._back_time = time
+            self.pushed_count += 1
+            notify = not self._pending
+            if self._pending:
+                self.dropped_count += 1
+            self._pending = True
+        if notify:
+            self.dataArrived.emit()
+
+    def hasPendingData(self):
+        return self._pending
+
+    def apply(self):
+        '''
+        Write the newest pushed step to the field, returns True if there was
+        one.  Call from the thread that owns the Zinc context.
+        '''
+        with self._lock:
+            if not self._pending:
+                return False
+            self._front, self._back = self._back, self._front
+            self._time = self._back_time
+            self._pending = False
+        self._writer.write(self._front)
+        self.applied_count += 1
+        return True
+
+    def getTime(self):
+        '''
+        Get the solver time of the last applied step, None if not given.
+        '''
+        return self._time
+
+    def getValues(self):
+        '''
+        Get the values of the last applied step.  Call from the thread that
+        calls apply(), the array is reused for a later step.
+        '''
+        return self._front
+
+    def getStatistics(self):
+        '''
+        Get a dict with the number of steps pushed, applied and dropped.
+        '''
+        return {'pushed': self.pushed_count, 'applied': self.applied_count, 'dropped': self.dropped_count}
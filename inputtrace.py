@@ -0,0 +1,186 @@
+# This python module records the mouse and resize input of a ZincWidget to a compact
+# file and replays it, so interaction performance can be measured on exactly the same
+# event sequence from run to run.
+
+import gzip
+import json
+import time
+
+try:
+    from time import perf_counter as _clock
+except ImportError:
+    from time import time as _clock
+
+try:
+    from PySide import QtCore, QtGui
+except ImportError:
+    from PyQt4 import QtCore, QtGui
+
+from instrumentation import Instrumentation
+
+_trace_version = 1
+
+# Event kinds as stored in a trace, each event is a list of
+# [milliseconds since the start, kind, x, y, button, buttons, modifiers]
+# and for resize events [milliseconds since the start, kind, width, height].
+EVENT_PRESS = 'press'
+EVENT_MOVE = 'move'
+EVENT_RELEASE = 'release'
+EVENT_RESIZE = 'resize'
+
+_mouse_kinds = {
+    QtCore.QEvent.MouseButtonPress: EVENT_PRESS,
+    QtCore.QEvent.MouseMove: EVENT_MOVE,
+    QtCore.QEvent.MouseButtonRelease: EVENT_RELEASE,
+}
+
+_mouse_event_types = dict((kind, event_type) for event_type, kind in _mouse_kinds.items())
+
+_event_handlers = {
+    EVENT_PRESS: 'mousePressEvent',
+    EVENT_MOVE: 'mouseMoveEvent',
+    EVENT_RELEASE: 'mouseReleaseEvent',
+}
+
+
+class InputTraceRecorder(QtCore.QObject):
+    '''
+    Record the mouse press, move and release events and the resizes of a
+    widget with their times.  Recording is done with an event filter so the
+    widget's handlers are not changed.
+    '''
+
+    def __init__(self, widget):
+        QtCore.QObject.__init__(self)
+        self._widget = widget
+        self._events = []
+        self._start = None
+        self._size = None
+
+    def start(self):
+        '''
+        Start a new recording, the current widget size is stored so replay
+        starts from the same viewport.
+        '''
+        self._events = []
+        self._start = _clock()
+        self._size = [self._widget.width(), self._widget.height()]
+        self._widget.installEventFilter(self)
+
+    def stop(self):
+        self._widget.removeEventFilter(self)
+
+    def getEventCount(self):
+        return len(self._events)
+
+    def eventFilter(self, watched, event):
+        event_type = event.type()
+        milliseconds = round((_clock() - self._start) * 1000.0, 3)
+        if event_type in _mouse_kinds:
+            self._events.append([milliseconds, _mouse_kinds[event_type], event.x(), event.y(),
+                                 int(event.button()), int(event.buttons()), int(event.modifiers())])
+        elif event_type == QtCore.QEvent.Resize:
+            size = event.size()
+            self._events.append([milliseconds, EVENT_RESIZE, size.width(), size.height()])
+
+        return False
+
+    def getTrace(self):
+        return {'version': _trace_version, 'size': self._size, 'events': list(self._events)}
+
+    def save(self, filename):
+        '''
+        Write the recording as gzip compressed JSON.
+        '''
+        saveTrace(self.getTrace(), filename)
+
+
+def saveTrace(trace, filename):
+    with gzip.open(filename, 'wb') as trace_file:
+        trace_file.write(json.dumps(trace, separators=(',', ':')).encode('utf-8'))
+
+
+def loadTrace(filename):
+    with gzip.open(filename, 'rb') as trace_file:
+        trace = json.loads(trace_file.read().decode('utf-8'))
+    if trace.get('version') != _trace_version:
+        raise ValueError('Unsupported input trace version: %s' % trace.get('version'))
+
+    return trace
+
+
+class InputTraceReplayer(object):
+    '''
+    Feed a recorded trace back into a widget's handlers, either at the
+    recorded times or as fast as possible.  Each handler call is timed and
+    the widget's instrumentation is enabled for the replay, so the report
+    also has its paint, pick and input latency statistics.
+    '''
+
+    def __init__(self, widget, trace):
+        self._widget = widget
+        self._trace = trace
+
+    def replay(self, original_speed=False):
+        '''
+        Replay the trace and return a report dict with the replay duration,
+        the event count, 'events' mapping each event kind to handling time
+        statistics and 'widget' holding the widget's timing statistics, all
+        in milliseconds.  At original speed repaints happen as the widget
+        schedules them, otherwise a frame is rendered after every event.
+        '''
+        widget = self._widget
+        processEvents = QtCore.QCoreApplication.processEvents
+        was_enabled = widget.isInstrumentationEnabled()
+        widget.setInstrumentationEnabled(True)
+        widget.resetTimingStatistics()
+        timings = Instrumentation(max(1, len(self._trace['events'])))
+        size = self._trace.get('size')
+        if size:
+            widget.resize(size[0], size[1])
+            processEvents()
+
+        start = _clock()
+        for event in self._trace['events']:
+            if original_speed:
+                due = start + event[0] / 1000.0
+                while _clock() < due:
+                    processEvents()
+                    time.sleep(min(0.001, max(0.0, due - _clock())))
+            kind = event[1]
+            event_start = _clock()
+            if kind == EVENT_RESIZE:
+                widget.resize(event[2], event[3])
+            else:
+                getattr(widget, _event_handlers[kind])(_mouseEvent(event))
+            timings.record(kind, _clock() - event_start)
+            if not original_speed:
+                # One frame per event keeps fast replays deterministic.
+                widget.updateGL()
+            processEvents()
+        duration = _clock() - start
+
+        report = {
+            'duration': duration * 1000.0,
+            'eventCount': len(self._trace['events']),
+            'originalSpeed': original_speed,
+            'events': timings.getStatistics(),
+            'widget': widget.getTimingStatistics(),
+        }
+        if not was_enabled:
+            widget.setInstrumentationEnabled(False)
+
+        return report
+
+
+def _mouseEvent(event):
+    milliseconds, kind, x, y, button, buttons, modifiers = event
+    return QtGui.QMouseEvent(_mouse_event_types[kind], QtCore.QPoint(x, y), QtCore.Qt.MouseButton(button),
+                             QtCore.Qt.MouseButtons(buttons), QtCore.Qt.KeyboardModifiers(modifiers))
+
+
+def replayTrace(widget, filename, original_speed=False):
+    '''
+    Load a trace file and replay it into widget, returns the report.
+    '''
+    return InputTraceReplayer(widget, loadTrace(filename)).replay(original_speed)
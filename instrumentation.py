@@ -0,0 +1,91 @@
+# This python module keeps rolling timing histograms for instrumenting the hot paths of
+# an interactive OpenCMISS-Zinc viewer.
+
+import collections
+
+import numpy
+
+_percentiles = [50, 95, 99]
+
+
+class RollingHistogram(object):
+    '''
+    Keep the most recent samples of a measurement and report percentiles
+    over them.  The total count includes samples that have rolled out.
+    '''
+
+    def __init__(self, sample_count=1000):
+        self._samples = collections.deque(maxlen=sample_count)
+        self.count = 0
+
+    def add(self, value):
+        self._samples.append(value)
+        self.count += 1
+
+    def getSamples(self):
+        return numpy.array(self._samples, dtype=numpy.float64)
+
+    def getPercentile(self, percentile):
+        if not self._samples:
+            return None
+
+        return float(numpy.percentile(self.getSamples(), percentile))
+
+    def getStatistics(self):
+        '''
+        Get a dict with the count, mean, max and the p50, p95 and p99
+        percentiles of the recent samples.
+        '''
+        samples = self.getSamples()
+        statistics = {'count': self.count}
+        if len(samples):
+            statistics['mean'] = float(samples.mean())
+            statistics['max'] = float(samples.max())
+            for percentile, value in zip(_percentiles, numpy.percentile(samples, _percentiles)):
+                statistics['p%d' % percentile] = float(value)
+
+        return statistics
+
+
+class Instrumentation(object):
+    '''
+    A set of named rolling histograms of durations.  Durations are recorded
+    in seconds and reported in milliseconds.
+    '''
+
+    def __init__(self, sample_count=1000):
+        self._sample_count = sample_count
+        self._histograms = collections.OrderedDict()
+
+    def record(self, name, seconds):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = RollingHistogram(self._sample_count)
+        histogram.add(seconds * 1000.0)
+
+    def getHistogram(self, name):
+        return self._histograms.get(name)
+
+    def getStatistics(self):
+        '''
+        Get a dict mapping each measurement name to the statistics of its
+        histogram, in milliseconds.
+        '''
+        return dict((name, histogram.getStatistics()) for name, histogram in self._histograms.items())
+
+    def reset(self):
+        self._histograms.clear()
+
+    def formatLines(self):
+        '''
+        Return one summary line per measurement for display.
+        '''
+        lines = []
+        for name, histogram in self._histograms.items():
+            statistics = histogram.getStatistics()
+            if statistics['count']:
+                lines.append('%s: p50 %.1f p95 %.1f p99 %.1f ms (%d)' %
+                             (name, statistics['p50'], statistics['p95'], statistics['p99'],
+                              statistics['count']))
+
+        return lines
@@ -0,0 +1,71 @@
+# This python module defers importing modules until they are first used so that
+# importing the utilities stays cheap for applications that may never open a viewer.
+
+import collections
+import importlib
+
+try:
+    from time import perf_counter as _clock
+except ImportError:
+    from time import time as _clock
+
+# Seconds taken by each deferred import, in the order they were loaded.
+_import_timings = collections.OrderedDict()
+
+
+class _LazyImport(object):
+    '''
+    Stand in for a module, or a name in a module, that is imported the
+    first time one of its attributes is used or it is called.
+    '''
+
+    def __init__(self, module_name, name=None):
+        self.__dict__['_module_name'] = module_name
+        self.__dict__['_name'] = name
+        self.__dict__['_object'] = None
+
+    def _load(self):
+        loaded = self.__dict__['_object']
+        if loaded is None:
+            module_name = self.__dict__['_module_name']
+            start = _clock()
+            loaded = importlib.import_module(module_name)
+            if module_name not in _import_timings:
+                _import_timings[module_name] = _clock() - start
+            name = self.__dict__['_name']
+            if name is not None:
+                loaded = getattr(loaded, name)
+            self.__dict__['_object'] = loaded
+
+        return loaded
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        target = self.__dict__['_module_name']
+        if self.__dict__['_name'] is not None:
+            target += '.' + self.__dict__['_name']
+        return '<lazy import of %s>' % target
+
+
+def lazyImport(module_name, name=None):
+    '''
+    Return a stand in for the module, or for name in the module, that
+    imports it on first use.  Module level constants must be read through
+    a module stand in at the time they are needed, for example
+    status.OK, as a stand in cannot take the place of a plain value.
+    '''
+    return _LazyImport(module_name, name)
+
+
+def getImportTimings():
+    '''
+    Get an ordered dict mapping the names of the modules loaded through a
+    lazy import to the seconds their first import took.  Modules that were
+    already imported elsewhere take almost no time.
+    '''
+    return collections.OrderedDict(_import_timings)
@@ -0,0 +1,239 @@
+# This python module lowers the rendering quality of OpenCMISS-Zinc scenes while the
+# view is being manipulated and restores it afterwards.  The level is chosen from
+# measured frame times so large models stay interactive and small ones are untouched.
+
+from opencmiss.zinc.field import Field
+from opencmiss.zinc.graphics import Graphics
+
+# levels start
+# Level 0 is full quality.  Each further level divides the tessellation divisions
+# and circle divisions by its factor, and from the hide level on, point graphics
+# drawn over a domain and streamlines are hidden.
+LEVEL_FULL = 0
+_division_factors = [1, 2, 4, 8]
+_hide_level = 2
+# levels end
+
+_frame_time_weight = 0.3
+
+
+def _regionTree(region):
+    '''
+    Yield region and all of its descendants.
+    '''
+    yield region
+    child = region.getFirstChild()
+    while child.isValid():
+        for descendant in _regionTree(child):
+            yield descendant
+        child = child.getNextSibling()
+
+
+def _isExpensiveGraphics(graphics):
+    '''
+    True for graphics that are hidden at the reduced levels: streamlines,
+    and point graphics with a glyph at every node, datapoint or element.
+    '''
+    graphics_type = graphics.getType()
+    if graphics_type == Graphics.TYPE_STREAMLINES:
+        return True
+
+    return graphics_type == Graphics.TYPE_POINTS and graphics.getFieldDomainType() != Field.DOMAIN_TYPE_POINT
+
+
+class InteractionLevelOfDetail(object):
+    '''
+    Choose and apply a reduced level of detail for the scenes of a region
+    tree while the user interacts with the view.
+
+    Frame times are reported with recordFrameTime() and kept as a moving
+    average for each level.  beginInteraction() applies the lowest level
+    whose frame time is within the target, or not yet measured, and while
+    interacting the level is raised again if frames stay too slow.
+    endInteraction() puts back the saved tessellations and visibility.
+    Interactions may overlap, for example in several views of one scene,
+    and full quality comes back when the last one ends.
+
+    Tessellations belong to the context, so the reduced divisions apply to
+    every region and view of the context that uses them, not only to the
+    region tree given.  Graphics are only hidden in that region tree.
+    Divisions or visibility changed by the application while a level is
+    applied are kept when full quality is restored.
+    '''
+
+    def __init__(self, region, target_frame_time=1.0 / 30.0):
+        self._region = region
+        self._tessellation_module = region.getContext().getTessellationmodule()
+        self._target_frame_time = target_frame_time
+        self._frame_times = [None] * len(_division_factors)
+        self._level = LEVEL_FULL
+        self._interaction_count = 0
+        self._skip_frame = False
+        self._saved_tessellations = None
+        self._hidden_graphics = []
+
+    def getLevelCount(self):
+        return len(_division_factors)
+
+    def getLevel(self):
+        return self._level
+
+    def isInteracting(self):
+        return self._interaction_count > 0
+
+    def setTargetFrameTime(self, target_frame_time):
+        self._target_frame_time = target_frame_time
+
+    def getTargetFrameTime(self):
+        return self._target_frame_time
+
+    def getFrameTimes(self):
+        '''
+        Get the moving average frame time in seconds for each level, None
+        for levels that have not been rendered.
+        '''
+        return list(self._frame_times)
+
+    def hasGraphics(self):
+        '''
+        True if any scene of the region tree has graphics.
+        '''
+        for region in _regionTree(self._region):
+            if region.getScene().getFirstGraphics().isValid():
+                return True
+
+        return False
+
+    def chooseLevel(self):
+        '''
+        Return the lowest level expected to render within the target frame
+        time.  Levels not measured yet are assumed to be fast enough.
+        '''
+        for level, frame_time in enumerate(self._frame_times):
+            if frame_time is None or frame_time <= self._target_frame_time:
+                return level
+
+        return len(self._frame_times) - 1
+
+    def beginInteraction(self):
+        '''
+        Start an interaction and apply the chosen level.  Returns True if
+        the scene was changed.
+        '''
+        self._interaction_count += 1
+        if self._interaction_count > 1:
+            return False
+
+        return self.setLevel(self.chooseLevel())
+
+    def endInteraction(self):
+        '''
+        End an interaction, full quality is restored when no others are
+        in progress.  Returns True if the scene was changed.
+        '''
+        if self._interaction_count > 0:
+            self._interaction_count -= 1
+        if self._interaction_count > 0:
+            return False
+
+        return self.setLevel(LEVEL_FULL)
+
+    def recordFrameTime(self, seconds):
+        '''
+        Record how long a frame took to render at the current level.  The
+        first frame after a level change also rebuilds graphics so it is
+        not counted.  While interacting the level is raised if the average
+        frame time is over the target, returns True if it was.
+        '''
+        if self._skip_frame:
+            self._skip_frame = False
+            return False
+
+        previous = self._frame_times[self._level]
+        if previous is None:
+            self._frame_times[self._level] = seconds
+        else:
+            self._frame_times[self._level] = previous + _frame_time_weight * (seconds - previous)
+        if self._interaction_count > 0 and self._frame_times[self._level] > self._target_frame_time and \
+                self._level + 1 < len(_division_factors):
+            return self.setLevel(self._level + 1)
+
+        return False
+
+    def setLevel(self, level):
+        '''
+        Apply a level of detail, restoring anything a previous level
+        changed first.  Returns True if the scene was changed.
+        '''
+        if level == self._level:
+            return False
+
+        self._region.beginHierarchicalChange()
+        self._tessellation_module.beginChange()
+        self._restore()
+        if level != LEVEL_FULL:
+            self._reduceTessellations(_division_factors[level])
+            if level >= _hide_level:
+                self._hideExpensiveGraphics()
+        self._tessellation_module.endChange()
+        self._region.endHierarchicalChange()
+        self._level = level
+        self._skip_frame = True
+        return True
+
+    def _reduceTessellations(self, factor):
+        saved = []
+        iterator = self._tessellation_module.createTessellationiterator()
+        tessellation = iterator.next()
+        while tessellation.isValid():
+            result, minimum_divisions = tessellation.getMinimumDivisions(3)
+            result, refinement_factors = tessellation.getRefinementFactors(3)
+            circle_divisions = tessellation.getCircleDivisions()
+            reduced_divisions = [max(1, divisions // factor) for divisions in minimum_divisions]
+            reduced_refinement = [max(1, refinement // factor) for refinement in refinement_factors]
+            # Fewer than 3 circle divisions cannot make a tube or sphere.
+            reduced_circle = max(3, circle_divisions // factor)
+            saved.append((tessellation, (minimum_divisions, reduced_divisions),
+                          (refinement_factors, reduced_refinement), (circle_divisions, reduced_circle)))
+            tessellation.setMinimumDivisions(reduced_divisions)
+            tessellation.setRefinementFactors(reduced_refinement)
+            tessellation.setCircleDivisions(reduced_circle)
+            tessellation = iterator.next()
+        self._saved_tessellations = saved
+
+    def _hideExpensiveGraphics(self):
+        for region in _regionTree(self._region):
+            scene = region.getScene()
+            graphics = scene.getFirstGraphics()
+            while graphics.isValid():
+                if graphics.getVisibilityFlag() and _isExpensiveGraphics(graphics):
+                    graphics.setVisibilityFlag(False)
+                    self._hidden_graphics.append(graphics)
+                graphics = scene.getNextGraphics(graphics)
+
+    def _restore(self):
+        '''
+        Put back the saved values that still hold the reduced ones, anything
+        set since the level was applied is left as it is.
+        '''
+        if self._saved_tessellations is not None:
+            for tessellation, divisions, refinement, circle in self._saved_tessellations:
+                if list(tessellation.getMinimumDivisions(3)[1]) == divisions[1]:
+                    tessellation.setMinimumDivisions(divisions[0])
+                if list(tessellation.getRefinementFactors(3)[1]) == refinement[1]:
+                    tessellation.setRefinementFactors(refinement[0])
+                if tessellation.getCircleDivisions() == circle[1]:
+                    tessellation.setCircleDivisions(circle[0])
+            self._saved_tessellations = None
+        for graphics in self._hidden_graphics:
+            if not graphics.getVisibilityFlag():
+                graphics.setVisibilityFlag(True)
+        self._hidden_graphics = []
+
+    def release(self):
+        '''
+        Restore full quality and drop the saved state.
+        '''
+        self._interaction_count = 0
+        self.setLevel(LEVEL_FULL)
+        self._region = None
@@ -0,0 +1,246 @@
+# This python module builds OpenCMISS-Zinc meshes in bulk from NumPy node coordinate
+# and element connectivity arrays.
+
+try:
+    from time import perf_counter as _clock
+except ImportError:
+    from time import time as _clock
+
+import numpy
+
+from opencmiss.zinc.element import Element, Elementbasis
+
+# element shapes start
+# Map of supported element shape names to the Zinc shape type, the number of
+# nodes per element and the basis function type for each xi direction.
+ELEMENT_SHAPE_HEXAHEDRON = 'hexahedron'
+ELEMENT_SHAPE_TETRAHEDRON = 'tetrahedron'
+ELEMENT_SHAPE_WEDGE = 'wedge'
+
+_element_shapes = {
+    ELEMENT_SHAPE_HEXAHEDRON: (Element.SHAPE_TYPE_CUBE, 8,
+                               [Elementbasis.FUNCTION_TYPE_LINEAR_LAGRANGE] * 3),
+    ELEMENT_SHAPE_TETRAHEDRON: (Element.SHAPE_TYPE_TETRAHEDRON, 4,
+                                [Elementbasis.FUNCTION_TYPE_LINEAR_SIMPLEX] * 3),
+    # Triangle in xi1-xi2 extruded linearly along xi3.
+    ELEMENT_SHAPE_WEDGE: (Element.SHAPE_TYPE_WEDGE12, 6,
+                          [Elementbasis.FUNCTION_TYPE_LINEAR_SIMPLEX,
+                           Elementbasis.FUNCTION_TYPE_LINEAR_SIMPLEX,
+                           Elementbasis.FUNCTION_TYPE_LINEAR_LAGRANGE]),
+}
+# element shapes end
+
+
+class MeshBuildStatistics(object):
+    '''
+    Counts and timing of a bulk mesh build.
+    '''
+
+    def __init__(self, node_count, element_count, elapsed):
+        self.node_count = node_count
+        self.element_count = element_count
+        self.elapsed = elapsed
+
+    def getElementsPerSecond(self):
+        if self.elapsed > 0.0:
+            return self.element_count / self.elapsed
+
+        return float('inf')
+
+    def getNodesPerSecond(self):
+        if self.elapsed > 0.0:
+            return self.node_count / self.elapsed
+
+        return float('inf')
+
+    def __repr__(self):
+        return 'MeshBuildStatistics(nodes=%d, elements=%d, elapsed=%.3fs, %.0f elements/s)' % \
+            (self.node_count, self.element_count, self.elapsed, self.getElementsPerSecond())
+
+
+def _untracked(handle):
+    return handle
+
+
+class MeshBuilder(object):
+    '''
+    Build nodes and 3D elements of a single shape in bulk.  One node template,
+    one field cache, one element template and one basis are created when the
+    builder is constructed and reused for every node and element.  They are
+    counted by tracker, a ResourceTracker, if one is given.
+    '''
+
+    def __init__(self, field_module, finite_element_field, element_shape=ELEMENT_SHAPE_HEXAHEDRON, tracker=None):
+        if element_shape not in _element_shapes:
+            raise ValueError('Unsupported element shape: %s' % element_shape)
+
+        track = tracker.track if tracker is not None else _untracked
+
+        shape_type, element_node_count, function_types = _element_shapes[element_shape]
+        self._field_module = field_module
+        self._field = finite_element_field
+        self._component_count = finite_element_field.getNumberOfComponents()
+
+        self._nodeset = field_module.findNodesetByName('nodes')
+        self._node_template = track(self._nodeset.createNodetemplate())
+        self._node_template.defineField(finite_element_field)
+        self._field_cache = track(field_module.createFieldcache())
+
+        self._mesh = field_module.findMeshByDimension(3)
+        self._element_node_count = element_node_count
+        self._element_template = track(self._mesh.createElementtemplate())
+        self._element_template.setElementShapeType(shape_type)
+        self._element_template.setNumberOfNodes(element_node_count)
+        basis = track(field_module.createElementbasis(3, function_types[0]))
+        for chart_component, function_type in enumerate(function_types):
+            if function_type != function_types[0]:
+                basis.setFunctionType(chart_component + 1, function_type)
+        node_indexes = list(range(1, element_node_count + 1))
+        self._element_template.defineFieldSimpleNodal(finite_element_field, -1, basis, node_indexes)
+
+    def getElementNodeCount(self):
+        return self._element_node_count
+
+    def createNodes(self, node_coordinates, first_identifier=-1):
+        '''
+        Create a node for every row of the (N, components) node_coordinates
+        array and return the list of created nodes in the same order.  If
+        first_identifier is -1 Zinc chooses the identifiers, otherwise
+        identifiers are consecutive from first_identifier.
+        '''
+        node_coordinates = numpy.asarray(node_coordinates, dtype=numpy.float64)
+        if node_coordinates.ndim != 2 or node_coordinates.shape[1] != self._component_count:
+            raise ValueError('Node coordinates must have shape (N, %d)' % self._component_count)
+
+        nodeset = self._nodeset
+        node_template = self._node_template
+        field_cache = self._field_cache
+        assign = self._field.assignReal
+        nodes = []
+        for i, coordinates in enumerate(node_coordinates.tolist()):
+            identifier = -1 if first_identifier == -1 else first_identifier + i
+            node = nodeset.createNode(identifier, node_template)
+            field_cache.setNode(node)
+            assign(field_cache, coordinates)
+            nodes.append(node)
+
+        return nodes
+
+    def createElements(self, nodes, connectivity, first_identifier=-1):
+        '''
+        Create an element for every row of the (M, nodes per element)
+        connectivity array.  Entries are zero based indexes into nodes and
+        follow the Zinc local node ordering for the element shape.
+        '''
+        connectivity = numpy.asarray(connectivity, dtype=numpy.int64)
+        if connectivity.ndim != 2 or connectivity.shape[1] != self._element_node_count:
+            raise ValueError('Connectivity must have shape (M, %d)' % self._element_node_count)
+
+        mesh = self._mesh
+        element_template = self._element_template
+        set_node = element_template.setNode
+        local_indexes = list(range(1, self._element_node_count + 1))
+        for i, element_nodes in enumerate(connectivity.tolist()):
+            for local_index, node_index in zip(local_indexes, element_nodes):
+                set_node(local_index, nodes[node_index])
+            identifier = -1 if first_identifier == -1 else first_identifier + i
+            mesh.defineElement(identifier, element_template)
+
+    def build(self, node_coordinates, connectivity, first_node_identifier=-1, first_element_identifier=-1):
+        '''
+        Create all nodes and elements inside a single field module change
+        block and return the MeshBuildStatistics for the build.
+        '''
+        start = _clock()
+        self._field_module.beginChange()
+        try:
+            nodes = self.createNodes(node_coordinates, first_node_identifier)
+            self.createElements(nodes, connectivity, first_element_identifier)
+        finally:
+            self._field_module.endChange()
+
+        return MeshBuildStatistics(len(nodes), len(connectivity), _clock() - start)
+
+
+class NodeValueWriter(object):
+    '''
+    Assign the values of a field at a fixed set of nodes from NumPy arrays.
+    The node handles and a field cache are looked up once so repeated
+    writes, such as a new solution every timestep, only assign values.
+
+    Zinc has no call assigning a field at many nodes, so each write still
+    makes a Fieldcache.setNode() and Field.assignReal() call per node from
+    Python.  Its cost grows linearly with the number of nodes, the
+    'stream' benchmark in benchmarks/run_benchmarks.py reports it.
+    '''
+
+    def __init__(self, nodeset, field, identifiers=None):
+        self._nodeset = nodeset
+        self._field = field
+        self._field_module = field.getFieldmodule()
+        self._field_cache = self._field_module.createFieldcache()
+        self._component_count = field.getNumberOfComponents()
+        self._nodes = []
+        if identifiers is None:
+            iterator = nodeset.createNodeiterator()
+            node = iterator.next()
+            while node.isValid():
+                self._nodes.append(node)
+                node = iterator.next()
+        else:
+            for identifier in numpy.asarray(identifiers, dtype=numpy.int64).tolist():
+                node = nodeset.findNodeByIdentifier(identifier)
+                if not node.isValid():
+                    raise ValueError('No node with identifier %d' % identifier)
+                self._nodes.append(node)
+        self._identifiers = numpy.array([node.getIdentifier() for node in self._nodes], dtype=numpy.int64)
+
+    def getIdentifiers(self):
+        '''
+        Get the node identifiers in the order rows of values are written.
+        '''
+        return self._identifiers
+
+    def getNodes(self):
+        return list(self._nodes)
+
+    def getNodeset(self):
+        return self._nodeset
+
+    def getField(self):
+        return self._field
+
+    def getShape(self):
+        return (len(self._nodes), self._component_count)
+
+    def write(self, values):
+        '''
+        Assign row i of the (N, components) values array to the field at
+        node i inside a single field module change block, one node at a
+        time.
+        '''
+        values = numpy.asarray(values, dtype=numpy.float64)
+        if values.shape != self.getShape():
+            raise ValueError('Values must have shape (%d, %d)' % self.getShape())
+
+        field_cache = self._field_cache
+        set_node = field_cache.setNode
+        assign = self._field.assignReal
+        self._field_module.beginChange()
+        try:
+            for node, node_values in zip(self._nodes, values.tolist()):
+                set_node(node)
+                assign(field_cache, node_values)
+        finally:
+            self._field_module.endChange()
+
+
+def createFiniteElements(field_module, finite_element_field, node_coordinates, connectivity,
+                         element_shape=ELEMENT_SHAPE_HEXAHEDRON, tracker=None):
+    '''
+    Convenience function to build a mesh of a single element shape from
+    node coordinate and connectivity arrays.  Returns the MeshBuildStatistics.
+    '''
+    builder = MeshBuilder(field_module, finite_element_field, element_shape, tracker)
+    return builder.build(node_coordinates, connectivity)
+
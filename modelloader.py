@@ -0,0 +1,90 @@
+# This python module reads OpenCMISS-Zinc model files one at a time into a detached staging
+# region, processing pending GUI events between files, so a viewer keeps showing the current
+# model until the new one is read.
+
+import os
+
+try:
+    from PySide import QtCore
+except ImportError:
+    from PyQt4 import QtCore
+
+from opencmiss.zinc.status import OK
+
+
+class StagedModelReader(QtCore.QObject):
+    '''
+    Read model files into a new region of context created by
+    context.createRegion(), which is not part of the region tree so nothing
+    draws or listens to it while it is filled.
+
+    read() runs on the calling thread and returns once every file is read.
+    Each file is parsed in one readFile() call during which the GUI is
+    blocked; pending events are processed after each file, so the viewer
+    repaints and input such as a cancel button is handled between files.
+    Splitting a model into several files shortens the pauses, it does not
+    remove them.
+
+    progress(bytes_read, total_bytes) is emitted after each file, so a
+    single file goes from nothing to all of it in one step.
+    '''
+
+    try:
+        # PySide
+        progress = QtCore.Signal(int, int)
+    except AttributeError:
+        # PyQt
+        progress = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, context, filenames, parent=None):
+        QtCore.QObject.__init__(self, parent)
+        self._context = context
+        self._filenames = list(filenames)
+        self._reading = False
+        self._cancelled = False
+
+    def read(self):
+        '''
+        Read the files in order and return the staging region.  Raises
+        RuntimeError if a file could not be read or the read was cancelled,
+        the staging region is dropped then.
+        '''
+        self._cancelled = False
+        self._reading = True
+        region = self._context.createRegion()
+        sizes = [os.path.getsize(filename) if os.path.exists(filename) else 0 for filename in self._filenames]
+        total = sum(sizes)
+        bytes_read = 0
+        # Nothing listens to the staging region, the change block just
+        # saves the field module from building change messages per file.
+        region.beginHierarchicalChange()
+        try:
+            for filename, size in zip(self._filenames, sizes):
+                if self._cancelled:
+                    break
+                if region.readFile(filename) != OK:
+                    raise RuntimeError('Failed to read %s' % filename)
+                bytes_read += size
+                self.progress.emit(bytes_read, total)
+                QtCore.QCoreApplication.processEvents()
+        finally:
+            region.endHierarchicalChange()
+            self._reading = False
+
+        if self._cancelled:
+            raise RuntimeError('Loading was cancelled')
+
+        return region
+
+    def cancel(self):
+        '''
+        Stop read() after the file being read, for example from an event
+        handled between files.
+        '''
+        self._cancelled = True
+
+    def isReading(self):
+        return self._reading
+
+    def getFilenames(self):
+        return list(self._filenames)
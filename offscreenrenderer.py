@@ -0,0 +1,248 @@
+# This python module renders OpenCMISS-Zinc scenes without a window so thumbnails and
+# regression images can be produced on machines without a display.  It needs PyOpenGL,
+# with OSMesa (for example Mesa llvmpipe) for truly headless rendering or a Qt pixel
+# buffer where an X display is available.
+
+import os
+import sys
+
+import numpy
+
+from opencmiss.zinc.sceneviewer import Sceneviewer
+from opencmiss.zinc.status import OK
+
+from sceneviewersetup import createSceneviewer
+
+BACKEND_OSMESA = 'osmesa'
+BACKEND_QT = 'qt'
+
+
+class _OSMesaSurface(object):
+    '''
+    An OSMesa context rendering into a buffer in main memory.  PyOpenGL
+    chooses its platform when it is first imported, so the platform is
+    only set to OSMesa if configure_platform is True and PyOpenGL has not
+    been imported yet.  If OSMesa then cannot be loaded the setting and the
+    PyOpenGL modules imported with it are dropped again, so other backends
+    and later PyOpenGL imports get the default platform.
+    '''
+
+    def __init__(self, width, height, configure_platform=False):
+        configured = configure_platform and 'OpenGL' not in sys.modules and \
+            'PYOPENGL_PLATFORM' not in os.environ
+        if configured:
+            os.environ['PYOPENGL_PLATFORM'] = 'osmesa'
+        try:
+            from OpenGL import GL, arrays, osmesa
+            self._GL = GL
+            self._arrays = arrays
+            self._osmesa = osmesa
+            self._context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+            if not self._context:
+                raise RuntimeError('Failed to create an OSMesa context.')
+            self.resize(width, height)
+        except Exception:
+            if configured:
+                del os.environ['PYOPENGL_PLATFORM']
+                for name in [name for name in sys.modules if name == 'OpenGL' or name.startswith('OpenGL.')]:
+                    del sys.modules[name]
+            raise
+
+    def resize(self, width, height):
+        self._buffer = self._arrays.GLubyteArray.zeros((height, width, 4))
+        self._width = width
+        self._height = height
+        self.makeCurrent()
+
+    def makeCurrent(self):
+        if not self._osmesa.OSMesaMakeCurrent(self._context, self._buffer, self._GL.GL_UNSIGNED_BYTE,
+                                              self._width, self._height):
+            raise RuntimeError('Failed to make the OSMesa context current.')
+
+    def release(self):
+        if self._context is not None:
+            self._osmesa.OSMesaDestroyContext(self._context)
+            self._context = None
+
+
+class _QtPixelBufferSurface(object):
+    '''
+    A Qt OpenGL pixel buffer, it needs a display connection but no window.
+    '''
+
+    def __init__(self, width, height):
+        try:
+            from PySide import QtOpenGL
+        except ImportError:
+            from PyQt4 import QtOpenGL
+        self._QtOpenGL = QtOpenGL
+        self._pixel_buffer = None
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        self.release()
+        gl_format = self._QtOpenGL.QGLFormat()
+        gl_format.setDepth(True)
+        gl_format.setDoubleBuffer(False)
+        self._pixel_buffer = self._QtOpenGL.QGLPixelBuffer(width, height, gl_format)
+        if not self._pixel_buffer.isValid():
+            raise RuntimeError('Failed to create a Qt pixel buffer.')
+        self.makeCurrent()
+
+    def makeCurrent(self):
+        self._pixel_buffer.makeCurrent()
+
+    def release(self):
+        if self._pixel_buffer is not None:
+            self._pixel_buffer.doneCurrent()
+            self._pixel_buffer = None
+
+
+_surfaces = {
+    BACKEND_OSMESA: _OSMesaSurface,
+    BACKEND_QT: _QtPixelBufferSurface,
+}
+
+
+class RenderJob(object):
+    '''
+    One image for OffscreenRenderer.renderJobs().  Any of the view, time
+    and size that are None are left as the previous job set them.  If
+    view_all is True the view is fitted to the scene after the time is set.
+    tag is passed back with the image to identify it.
+    '''
+
+    def __init__(self, eye=None, lookat=None, up=None, time=None, width=None, height=None,
+                 view_all=False, tag=None):
+        self.eye = eye
+        self.lookat = lookat
+        self.up = up
+        self.time = time
+        self.width = width
+        self.height = height
+        self.view_all = view_all
+        self.tag = tag
+
+
+class OffscreenRenderer(object):
+    '''
+    Render the scene of a region into an offscreen OpenGL surface and return
+    the images as (height, width, 4) RGBA NumPy arrays with the first row at
+    the top.  The scene viewer is set up the same way as in ZincWidget and
+    the OpenGL context is kept for every render, so many views or timesteps
+    can be rendered back to back.
+
+    backend is BACKEND_OSMESA, BACKEND_QT or None to choose.  Only an
+    explicit BACKEND_OSMESA sets PyOpenGL's platform, and only if PyOpenGL
+    has not been imported yet.  None tries OSMesa first if the
+    PYOPENGL_PLATFORM environment variable already selects it, then Qt.
+    '''
+
+    def __init__(self, context, width=512, height=512, region=None, backend=None):
+        self._context = context
+        if region is None:
+            region = context.getDefaultRegion()
+        self._region = region
+        self._width = width
+        self._height = height
+        self._surface = self._createSurface(backend, width, height)
+
+        from OpenGL import GL
+        self._GL = GL
+        self._scene_viewer, self._scene_filter = createSceneviewer(context, region.getScene(),
+                                                                   Sceneviewer.BUFFERING_MODE_SINGLE)
+        self._scene_viewer.setViewportSize(width, height)
+        self._scene_viewer.viewAll()
+
+    def _createSurface(self, backend, width, height):
+        if backend is not None:
+            backends = [backend]
+        elif os.environ.get('PYOPENGL_PLATFORM') == 'osmesa':
+            backends = [BACKEND_OSMESA, BACKEND_QT]
+        else:
+            backends = [BACKEND_QT]
+        errors = []
+        for name in backends:
+            if name not in _surfaces:
+                raise ValueError('Unknown offscreen backend: %s' % name)
+            try:
+                if name == BACKEND_OSMESA:
+                    return _OSMesaSurface(width, height, configure_platform=backend == BACKEND_OSMESA)
+                return _surfaces[name](width, height)
+            except (ImportError, RuntimeError, AttributeError) as e:
+                errors.append('%s: %s' % (name, e))
+
+        raise RuntimeError('No offscreen rendering backend is available (%s)' % '; '.join(errors))
+
+    def getSceneviewer(self):
+        return self._scene_viewer
+
+    def getSize(self):
+        return (self._width, self._height)
+
+    def setSize(self, width, height):
+        if (width, height) != (self._width, self._height):
+            self._width = width
+            self._height = height
+            self._surface.resize(width, height)
+            self._scene_viewer.setViewportSize(width, height)
+
+    def viewAll(self):
+        self._scene_viewer.viewAll()
+
+    def setLookAtParameters(self, eye, lookat, up):
+        self._scene_viewer.setLookatParametersNonSkew(eye, lookat, up)
+
+    def setTime(self, time):
+        timekeeper = self._context.getTimekeepermodule().getDefaultTimekeeper()
+        timekeeper.setTime(time)
+
+    def render(self):
+        '''
+        Render the scene and return it as a (height, width, 4) uint8 array.
+        '''
+        GL = self._GL
+        self._surface.makeCurrent()
+        if self._scene_viewer.renderScene() != OK:
+            raise RuntimeError('Failed to render the scene.')
+        GL.glFinish()
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+        data = GL.glReadPixels(0, 0, self._width, self._height, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE)
+        if not isinstance(data, numpy.ndarray):
+            data = numpy.frombuffer(data, dtype=numpy.uint8)
+        image = numpy.asarray(data, dtype=numpy.uint8).reshape(self._height, self._width, 4)
+        # OpenGL rows start at the bottom of the image.
+        return numpy.ascontiguousarray(image[::-1])
+
+    def renderJob(self, job):
+        '''
+        Apply the size, time and view of a RenderJob and render it.
+        '''
+        if job.width is not None or job.height is not None:
+            self.setSize(job.width or self._width, job.height or self._height)
+        if job.time is not None:
+            self.setTime(job.time)
+        if job.eye is not None and job.lookat is not None and job.up is not None:
+            self.setLookAtParameters(job.eye, job.lookat, job.up)
+        if job.view_all:
+            self.viewAll()
+
+        return self.render()
+
+    def renderJobs(self, jobs):
+        '''
+        Render each RenderJob in turn reusing this renderer's context, and
+        yield (job, image) as each image is finished.
+        '''
+        for job in jobs:
+            yield job, self.renderJob(job)
+
+    def release(self):
+        '''
+        Destroy the scene viewer and the offscreen surface.
+        '''
+        self._scene_viewer = None
+        self._scene_filter = None
+        if self._surface is not None:
+            self._surface.release()
+            self._surface = None
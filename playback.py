@@ -0,0 +1,401 @@
+# This python module plays back time varying OpenCMISS-Zinc models.  Node values for
+# each timestep are evaluated once, kept in a memory bounded cache and written to a
+# display field, so looping or scrubbing over the same times does not evaluate again.
+
+import collections
+import threading
+
+try:
+    from time import perf_counter as _clock
+except ImportError:
+    from time import time as _clock
+
+try:
+    from PySide import QtCore
+except ImportError:
+    from PyQt4 import QtCore
+
+import numpy
+
+from opencmiss.zinc.status import OK
+
+from meshbuilder import NodeValueWriter
+
+# Nodes a field source is evaluated at between checks of the prefetch budget.
+_slice_node_count = 256
+# Milliseconds between checks whether a callable source has finished a timestep.
+_worker_poll_interval = 2
+
+
+class TimestepCache(object):
+    '''
+    A least recently used cache of per timestep arrays limited by the total
+    number of bytes they hold.
+    '''
+
+    def __init__(self, maximum_bytes):
+        self._maximum_bytes = maximum_bytes
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self.hit_count = 0
+        self.miss_count = 0
+        self.evicted_count = 0
+
+    def getMaximumBytes(self):
+        return self._maximum_bytes
+
+    def setMaximumBytes(self, maximum_bytes):
+        self._maximum_bytes = maximum_bytes
+        self._evict()
+
+    def getBytes(self):
+        return self._bytes
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        '''
+        Get the array for key and mark it most recently used, None if it is
+        not cached.
+        '''
+        values = self._entries.pop(key, None)
+        if values is None:
+            self.miss_count += 1
+            return None
+
+        self._entries[key] = values
+        self.hit_count += 1
+        return values
+
+    def add(self, key, values):
+        '''
+        Cache values for key, evicting the least recently used arrays to
+        stay within the byte budget.  Arrays larger than the budget are
+        not cached.
+        '''
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        if values.nbytes > self._maximum_bytes:
+            return
+
+        self._entries[key] = values
+        self._bytes += values.nbytes
+        self._evict()
+
+    def _evict(self):
+        while self._bytes > self._maximum_bytes and self._entries:
+            key, values = self._entries.popitem(last=False)
+            self._bytes -= values.nbytes
+            self.evicted_count += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+
+class PlaybackController(QtCore.QObject):
+    '''
+    Play a sequence of times at a target frame rate by writing the node
+    values for each time to display_field, a field defined on the nodes
+    that the graphics use for their coordinates.  source gives the values
+    for a time, either a time varying Zinc field evaluated at the same
+    nodes or a callable source(time) returning an (N, components) array in
+    the order of getIdentifiers().
+
+    While playing, the timesteps ahead of the playhead are evaluated into a
+    least recently used cache limited to cache_bytes.  A field source is
+    evaluated on idle event loop passes in slices of nodes, stopping once a
+    pass has spent prefetch_budget seconds and carrying on from the same
+    node on the next pass.  A callable source is called for the timesteps
+    ahead on a worker thread, one at a time, so it must not use Zinc or
+    Qt objects of the GUI thread.  A frame whose timestep is not cached
+    waits for a call in progress and then evaluates on the GUI thread.
+    Once every timestep of a loop fits in the cache, frames only write
+    values.
+
+    timeChanged(time) is emitted after the values for a new time have been
+    written.  The timekeeper is left alone so time dependent graphics
+    elsewhere do not regenerate every frame.
+    '''
+
+    try:
+        # PySide
+        timeChanged = QtCore.Signal(float)
+    except AttributeError:
+        # PyQt
+        timeChanged = QtCore.pyqtSignal(float)
+
+    def __init__(self, nodeset, display_field, times, source, frames_per_second=30.0,
+                 cache_bytes=256 * 1024 * 1024, prefetch_count=8, prefetch_budget=0.005, parent=None):
+        QtCore.QObject.__init__(self, parent)
+        self._writer = NodeValueWriter(nodeset, display_field)
+        self._times = [float(time) for time in times]
+        if not self._times:
+            raise ValueError('At least one time is needed for playback')
+        self._source = source
+        if not callable(source):
+            self._nodes = self._writer.getNodes()
+            self._fieldcache = source.getFieldmodule().createFieldcache()
+            self._source_component_count = source.getNumberOfComponents()
+        self._cache = TimestepCache(cache_bytes)
+        self._prefetch_count = prefetch_count
+        self._prefetch_budget = prefetch_budget
+        self._index = None
+        self._loop = True
+        # (index, values, next node position) of a field evaluation stopped by the budget.
+        self._partial = None
+        # (index, thread, result dict) of a callable source running on a worker thread.
+        self._worker = None
+        self.prefetched_count = 0
+
+        self._frameTimer = QtCore.QTimer(self)
+        self._frameTimer.timeout.connect(self._nextFrame)
+        self.setFramesPerSecond(frames_per_second)
+        self._prefetchTimer = QtCore.QTimer(self)
+        self._prefetchTimer.setSingleShot(True)
+        self._prefetchTimer.timeout.connect(self._prefetch)
+
+    def getIdentifiers(self):
+        '''
+        Get the node identifiers in the order of the rows of each timestep.
+        '''
+        return self._writer.getIdentifiers()
+
+    def getTimes(self):
+        return list(self._times)
+
+    def setFramesPerSecond(self, frames_per_second):
+        self._frames_per_second = frames_per_second
+        self._frameTimer.setInterval(int(1000.0 / frames_per_second + 0.5))
+
+    def getFramesPerSecond(self):
+        return self._frames_per_second
+
+    def setLoop(self, loop):
+        '''
+        Set whether playback starts again from the first time after the last,
+        otherwise it stops there.
+        '''
+        self._loop = loop
+
+    def isLoop(self):
+        return self._loop
+
+    def play(self):
+        self._frameTimer.start()
+        self._prefetchTimer.start(0)
+
+    def pause(self):
+        self._frameTimer.stop()
+        self._prefetchTimer.stop()
+
+    def isPlaying(self):
+        return self._frameTimer.isActive()
+
+    def getTimeIndex(self):
+        return self._index
+
+    def getTime(self):
+        if self._index is None:
+            return None
+
+        return self._times[self._index]
+
+    def seek(self, index):
+        '''
+        Show the timestep at index, for scrubbing.  Cached timesteps are
+        written without evaluating the source.
+        '''
+        index = max(0, min(index, len(self._times) - 1))
+        self._writer.write(self._getValues(index))
+        self._index = index
+        self.timeChanged.emit(self._times[index])
+        if not self._prefetchTimer.isActive():
+            self._prefetchTimer.start(0)
+
+    def seekTime(self, time):
+        '''
+        Show the timestep nearest to time.
+        '''
+        times = numpy.array(self._times)
+        self.seek(int(numpy.abs(times - time).argmin()))
+
+    def _nextIndex(self, index):
+        if index is None:
+            return 0
+        if index + 1 < len(self._times):
+            return index + 1
+        if self._loop:
+            return 0
+
+        return None
+
+    def _nextFrame(self):
+        index = self._nextIndex(self._index)
+        if index is None:
+            self.pause()
+            return
+
+        self.seek(index)
+
+    def _callSource(self, index):
+        values = numpy.array(self._source(self._times[index]), dtype=numpy.float64)
+        if values.shape != self._writer.getShape():
+            raise ValueError('Source values must have shape (%d, %d)' % self._writer.getShape())
+        return values
+
+    def _evaluateField(self, index, deadline=None):
+        '''
+        Evaluate the field source at the nodes for the timestep at index,
+        carrying on from where an earlier call for the same index stopped.
+        If the clock passes deadline the evaluation stops after the current
+        slice of nodes and None is returned.
+        '''
+        partial = self._partial
+        if partial is not None and partial[0] == index:
+            index, values, position = partial
+            self._partial = None
+        else:
+            values = numpy.empty(self._writer.getShape())
+            position = 0
+        fieldcache = self._fieldcache
+        fieldcache.setTime(self._times[index])
+        evaluate = self._source.evaluateReal
+        component_count = self._source_component_count
+        nodes = self._nodes
+        node_count = len(nodes)
+        while position < node_count:
+            end = min(position + _slice_node_count, node_count)
+            for i in range(position, end):
+                fieldcache.setNode(nodes[i])
+                result, node_values = evaluate(fieldcache, component_count)
+                values[i] = node_values if result == OK else numpy.nan
+            position = end
+            if deadline is not None and position < node_count and _clock() > deadline:
+                self._partial = (index, values, position)
+                return None
+
+        return values
+
+    def _evaluate(self, index):
+        if callable(self._source):
+            return self._callSource(index)
+
+        return self._evaluateField(index)
+
+    def _startWorker(self, index):
+        result = {}
+
+        def run():
+            try:
+                result['values'] = self._callSource(index)
+            except Exception as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        self._worker = (index, thread, result)
+        thread.start()
+
+    def _finishWorker(self, keep=True):
+        '''
+        Wait for the worker thread and cache the values it evaluated if keep
+        is True.  A failed call is not cached, so the error is raised when
+        the timestep is evaluated on the GUI thread.
+        '''
+        index, thread, result = self._worker
+        thread.join()
+        self._worker = None
+        if keep and 'values' in result:
+            self._cache.add(index, result['values'])
+            self.prefetched_count += 1
+
+    def _getValues(self, index):
+        if self._worker is not None and index not in self._cache:
+            # Take the timestep from the worker if it has it, and never call
+            # the source on two threads at once.
+            self._finishWorker()
+        values = self._cache.get(index)
+        if values is None:
+            values = self._evaluate(index)
+            self._cache.add(index, values)
+
+        return values
+
+    def _prefetchIndexes(self):
+        '''
+        Yield the uncached indexes of the timesteps ahead of the playhead
+        that fit in the cache without evicting one needed sooner.
+        '''
+        entry_bytes = self._writer.getShape()[0] * self._writer.getShape()[1] * 8
+        prefetch_count = min(self._prefetch_count, len(self._times) - 1)
+        if entry_bytes:
+            prefetch_count = min(prefetch_count, self._cache.getMaximumBytes() // entry_bytes - 1)
+        index = self._index
+        for step in range(prefetch_count):
+            index = self._nextIndex(index)
+            if index is None:
+                return
+            if index not in self._cache:
+                yield index
+
+    def _prefetch(self):
+        '''
+        Evaluate uncached timesteps ahead of the playhead until the time
+        budget for this pass is spent, then continue on the next pass.  A
+        callable source is instead handed one timestep at a time to a
+        worker thread, and this checks back until it has finished.
+        '''
+        if callable(self._source):
+            if self._worker is not None:
+                if self._worker[1].is_alive():
+                    self._prefetchTimer.start(_worker_poll_interval)
+                    return
+                self._finishWorker()
+            for index in self._prefetchIndexes():
+                self._startWorker(index)
+                self._prefetchTimer.start(_worker_poll_interval)
+                return
+            return
+
+        deadline = _clock() + self._prefetch_budget
+        for index in self._prefetchIndexes():
+            values = self._evaluateField(index, deadline)
+            if values is None:
+                self._prefetchTimer.start(0)
+                return
+            self._cache.add(index, values)
+            self.prefetched_count += 1
+            if _clock() > deadline:
+                self._prefetchTimer.start(0)
+                return
+
+    def getCacheStatistics(self):
+        '''
+        Get a dict with the cache hits, misses, evictions, prefetched
+        timesteps, cached timesteps and cached bytes.
+        '''
+        cache = self._cache
+        return {'hits': cache.hit_count, 'misses': cache.miss_count, 'evicted': cache.evicted_count,
+                'prefetched': self.prefetched_count, 'entries': len(cache), 'bytes': cache.getBytes()}
+
+    def setCacheBytes(self, cache_bytes):
+        self._cache.setMaximumBytes(cache_bytes)
+
+    def clearCache(self):
+        '''
+        Drop the cached timesteps, for example after the source changed.
+        '''
+        if self._worker is not None:
+            self._finishWorker(keep=False)
+        self._partial = None
+        self._cache.clear()
+
+    def release(self):
+        self.pause()
+        self.clearCache()
@@ -0,0 +1,182 @@
+# This python module keeps account of the OpenCMISS-Zinc handles a viewer creates and
+# estimates the memory held by the nodes, elements and graphics of a region tree, so
+# growth over a long session can be seen and traced to its source.
+
+import collections
+import weakref
+
+from opencmiss.zinc.field import Field
+from opencmiss.zinc.graphics import Graphics
+
+from levelofdetail import _regionTree
+
+# memory estimates start
+# Rough per object sizes in bytes.  They follow the sizes of the Zinc structures and
+# of the vertex buffers of the graphics and are meant for comparing regions and
+# watching growth, not for exact accounting.
+_node_bytes = 96
+_element_bytes = 128
+_value_bytes = 8
+_element_field_bytes = 48
+_vertex_bytes = 40
+_glyph_bytes = 64
+# memory estimates end
+
+_mesh_domain_dimensions = {
+    Field.DOMAIN_TYPE_MESH1D: 1,
+    Field.DOMAIN_TYPE_MESH2D: 2,
+    Field.DOMAIN_TYPE_MESH3D: 3,
+}
+
+
+class ResourceTracker(object):
+    '''
+    Count the Zinc handles given to track() by type.  Each handle is held
+    through a weak reference, so a handle counts as live until the last
+    Python reference to it is dropped and Zinc can free the object.
+    Handles that cannot be weakly referenced are counted as created only.
+    '''
+
+    def __init__(self):
+        self._created = collections.defaultdict(int)
+        self._live = collections.defaultdict(int)
+        self._references = {}
+
+    def track(self, handle, kind=None):
+        '''
+        Count handle as created and live, kind defaults to its class name.
+        Returns handle so creation calls can be wrapped.
+        '''
+        if kind is None:
+            kind = type(handle).__name__
+        self._created[kind] += 1
+        try:
+            reference = weakref.ref(handle, self._released)
+        except TypeError:
+            return handle
+
+        self._references[id(reference)] = (reference, kind)
+        self._live[kind] += 1
+        return handle
+
+    def _released(self, reference):
+        entry = self._references.pop(id(reference), None)
+        if entry is not None:
+            self._live[entry[1]] -= 1
+
+    def getHandleCounts(self):
+        '''
+        Get a dict mapping each handle type to a dict with the number of
+        handles 'created' and still 'live'.
+        '''
+        return dict((kind, {'created': created, 'live': self._live[kind]})
+                    for kind, created in self._created.items())
+
+    def getLiveCount(self):
+        return sum(self._live.values())
+
+    def reset(self):
+        '''
+        Forget the counts, handles tracked so far are no longer followed.
+        '''
+        self._created.clear()
+        self._live.clear()
+        self._references.clear()
+
+
+def _finiteElementFields(fieldmodule):
+    fields = []
+    iterator = fieldmodule.createFielditerator()
+    field = iterator.next()
+    while field.isValid():
+        if field.castFiniteElement().isValid():
+            fields.append(field)
+        field = iterator.next()
+
+    return fields
+
+
+def _graphicsBytes(graphics, sizes):
+    '''
+    Estimate the vertex buffer or glyph bytes of one graphics from the
+    size of its domain and the minimum divisions of its tessellation.
+    '''
+    domain_type = graphics.getFieldDomainType()
+    graphics_type = graphics.getType()
+    if domain_type == Field.DOMAIN_TYPE_POINT:
+        return _glyph_bytes
+    if domain_type == Field.DOMAIN_TYPE_NODES:
+        return sizes['nodes'] * _glyph_bytes
+    if domain_type == Field.DOMAIN_TYPE_DATAPOINTS:
+        return sizes['datapoints'] * _glyph_bytes
+
+    dimension = _mesh_domain_dimensions.get(domain_type)
+    if dimension is None:
+        # Highest dimension with elements.
+        dimension = 0
+        for mesh_dimension in (3, 2, 1):
+            if sizes['elements%dd' % mesh_dimension]:
+                dimension = mesh_dimension
+                break
+        if dimension == 0:
+            return 0
+    element_count = sizes['elements%dd' % dimension]
+    divisions = 1
+    tessellation = graphics.getTessellation()
+    if tessellation.isValid():
+        result, minimum_divisions = tessellation.getMinimumDivisions(3)
+        divisions = max(1, minimum_divisions[0])
+    if graphics_type == Graphics.TYPE_SURFACES:
+        return element_count * (divisions + 1) ** 2 * _vertex_bytes
+    if graphics_type == Graphics.TYPE_LINES:
+        return element_count * (divisions + 1) * _vertex_bytes
+    if graphics_type == Graphics.TYPE_POINTS:
+        return element_count * divisions ** dimension * _glyph_bytes
+
+    return element_count * divisions * _vertex_bytes
+
+
+def estimateRegionMemory(region):
+    '''
+    Estimate the memory of region and each of its descendants.  Returns an
+    OrderedDict mapping region paths to dicts with the numbers of nodes,
+    datapoints, elements of each dimension, finite element fields and
+    graphics, and the estimated 'nodeBytes', 'elementBytes',
+    'graphicsBytes' and total 'bytes'.
+    '''
+    estimates = collections.OrderedDict()
+    for descendant in _regionTree(region):
+        fieldmodule = descendant.getFieldmodule()
+        fields = _finiteElementFields(fieldmodule)
+        component_count = sum(field.getNumberOfComponents() for field in fields)
+        sizes = {
+            'nodes': fieldmodule.findNodesetByName('nodes').getSize(),
+            'datapoints': fieldmodule.findNodesetByName('datapoints').getSize(),
+        }
+        for dimension in (1, 2, 3):
+            sizes['elements%dd' % dimension] = fieldmodule.findMeshByDimension(dimension).getSize()
+        element_count = sizes['elements1d'] + sizes['elements2d'] + sizes['elements3d']
+
+        node_bytes = (sizes['nodes'] + sizes['datapoints']) * (_node_bytes + _value_bytes * component_count)
+        element_bytes = element_count * (_element_bytes + _element_field_bytes * len(fields))
+        graphics_bytes = 0
+        graphics_count = 0
+        scene = descendant.getScene()
+        graphics = scene.getFirstGraphics()
+        while graphics.isValid():
+            graphics_count += 1
+            graphics_bytes += _graphicsBytes(graphics, sizes)
+            graphics = scene.getNextGraphics(graphics)
+
+        estimate = dict(sizes)
+        estimate.update({
+            'fields': len(fields),
+            'graphics': graphics_count,
+            'nodeBytes': node_bytes,
+            'elementBytes': element_bytes,
+            'graphicsBytes': graphics_bytes,
+            'bytes': node_bytes + element_bytes + graphics_bytes,
+        })
+        estimates[descendant.getPath()] = estimate
+
+    return estimates
@@ -0,0 +1,31 @@
+# This python module holds the OpenCMISS-Zinc scene viewer setup shared by the on screen
+# ZincWidget and the offscreen renderer.  It does not depend on Qt.
+
+from opencmiss.zinc.sceneviewer import Sceneviewer
+
+
+def createSceneviewer(context, scene, buffering_mode=Sceneviewer.BUFFERING_MODE_DOUBLE, graphics_filter=None):
+    '''
+    Create a scene viewer for scene with a visibility flags filter, so
+    graphics with their visibility flag set are drawn.  An existing
+    graphics_filter can be passed in to share it between scene viewers.
+    Returns a tuple of the scene viewer and the scene filter.
+    '''
+    # Get the scene viewer module.
+    scene_viewer_module = context.getSceneviewermodule()
+
+    # From the scene viewer module we can create a scene viewer, the buffering
+    # mode should match the OpenGL properties of the target surface.
+    scene_viewer = scene_viewer_module.createSceneviewer(buffering_mode,
+                                                         Sceneviewer.STEREO_MODE_DEFAULT)
+    if graphics_filter is None:
+        # Create a filter for visibility flags which will allow us to see our graphic.
+        filter_module = context.getScenefiltermodule()
+        # By default graphics are created with their visibility flags set to on (or true).
+        graphics_filter = filter_module.createScenefilterVisibilityFlags()
+
+    # Set the graphics filter for the scene viewer otherwise nothing will be visible.
+    scene_viewer.setScenefilter(graphics_filter)
+    scene_viewer.setScene(scene)
+
+    return scene_viewer, graphics_filter
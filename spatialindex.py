@@ -0,0 +1,212 @@
+# This python module keeps node and datapoint coordinates of an OpenCMISS-Zinc nodeset
+# in NumPy arrays so window space selection queries can be answered on the CPU without
+# rendering a pick buffer.
+
+import numpy
+
+from opencmiss.zinc.field import Field
+from opencmiss.zinc.status import OK
+
+
+def transformPoints(matrix, points):
+    '''
+    Apply the 4x4 homogeneous transformation matrix to every row of the
+    (N, 3) points array, with perspective division, and return an (N, 3)
+    array.
+    '''
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 3)
+    transformed = points.dot(matrix[:, :3].T) + matrix[:, 3]
+    return transformed[:, :3] / transformed[:, 3:4]
+
+
+def pointsInPolygon(points, polygon):
+    '''
+    Return a boolean mask of the (N, 2) points that lie inside polygon, a
+    sequence of (x, y) vertices, using the even-odd rule.
+    '''
+    polygon = numpy.asarray(polygon, dtype=numpy.float64).reshape(-1, 2)
+    x = points[:, 0]
+    y = points[:, 1]
+    inside = numpy.zeros(len(points), dtype=bool)
+    x0, y0 = polygon[-1]
+    for x1, y1 in polygon:
+        crosses = (y0 > y) != (y1 > y)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+        inside ^= crosses & (x < x_cross)
+        x0, y0 = x1, y1
+
+    return inside
+
+
+class NodeSpatialIndex(object):
+    '''
+    Cache the coordinates of every node in a nodeset and answer rectangle,
+    polygon and radius queries in window coordinates.  This is a brute
+    force cache, not a spatial tree: every query tests all the cached nodes
+    with vectorised NumPy comparisons.  Queries take the 4x4 world to
+    window matrix of the scene viewer and the window coordinates are kept
+    until the matrix changes, so repeated queries from one camera position
+    transform the nodes once.
+
+    The cache is marked out of date when the nodeset or the coordinate
+    field changes and is refreshed by the next query, so a burst of changes
+    costs one refresh.  A refresh evaluates the field at every node again,
+    so a caller that writes known coordinates, such as a stream of solver
+    steps, hands them over with updateCoordinates() instead.
+    '''
+
+    def __init__(self, nodeset, coordinate_field):
+        self._nodeset = nodeset
+        self._field = coordinate_field
+        self._component_count = coordinate_field.getNumberOfComponents()
+        fieldmodule = coordinate_field.getFieldmodule()
+        self._fieldcache = fieldmodule.createFieldcache()
+        self._identifiers = numpy.zeros(0, dtype=numpy.int64)
+        self._coordinates = numpy.zeros((0, 3))
+        self._out_of_date = True
+        self._window_matrix = None
+        self._window_coordinates = None
+        self._notifier = fieldmodule.createFieldmodulenotifier()
+        self._notifier.setCallback(self._fieldmoduleEvent)
+
+    def getNodeset(self):
+        return self._nodeset
+
+    def getField(self):
+        return self._field
+
+    def isOutOfDate(self):
+        return self._out_of_date
+
+    def release(self):
+        '''
+        Stop listening to field module changes and drop the cached arrays.
+        '''
+        if self._notifier is not None:
+            self._notifier.clearCallback()
+            self._notifier = None
+        self._identifiers = numpy.zeros(0, dtype=numpy.int64)
+        self._coordinates = numpy.zeros((0, 3))
+        self._window_coordinates = None
+
+    def _fieldmoduleEvent(self, event):
+        if event.getFieldChangeFlags(self._field) != Field.CHANGE_FLAG_NONE or \
+                event.getNodesetChanges(self._nodeset).getSummaryNodeChangeFlags():
+            self._out_of_date = True
+            self._window_matrix = None
+
+    def getIdentifiers(self):
+        self._update()
+        return self._identifiers
+
+    def getCoordinates(self):
+        '''
+        Get the (N, 3) coordinates in the order of getIdentifiers().  Nodes
+        without the coordinate field defined are left out.
+        '''
+        self._update()
+        return self._coordinates
+
+    def _update(self):
+        if not self._out_of_date:
+            return
+
+        identifiers = []
+        coordinates = []
+        fieldcache = self._fieldcache
+        evaluate = self._field.evaluateReal
+        component_count = self._component_count
+        iterator = self._nodeset.createNodeiterator()
+        node = iterator.next()
+        while node.isValid():
+            fieldcache.setNode(node)
+            result, values = evaluate(fieldcache, component_count)
+            if result == OK:
+                identifiers.append(node.getIdentifier())
+                coordinates.append((list(values) + [0.0, 0.0])[:3])
+            node = iterator.next()
+
+        self._identifiers = numpy.array(identifiers, dtype=numpy.int64)
+        self._coordinates = numpy.array(coordinates, dtype=numpy.float64).reshape(-1, 3)
+        self._out_of_date = False
+
+    def updateCoordinates(self, identifiers, coordinates):
+        '''
+        Replace the cached coordinates of the nodes with identifiers by the
+        rows of coordinates and mark the index up to date.  Only call this
+        straight after writing exactly these values to the coordinate field,
+        with the index up to date before the write and nothing else changed.
+        Identifiers of nodes not in the index are ignored.
+        '''
+        identifiers = numpy.asarray(identifiers, dtype=numpy.int64)
+        coordinates = numpy.asarray(coordinates, dtype=numpy.float64).reshape(len(identifiers), -1)
+        # Nodes are iterated in identifier order, so the identifiers are sorted.
+        positions = numpy.searchsorted(self._identifiers, identifiers)
+        found = positions < len(self._identifiers)
+        found[found] = self._identifiers[positions[found]] == identifiers[found]
+        component_count = min(coordinates.shape[1], 3)
+        self._coordinates[positions[found], :component_count] = coordinates[found, :component_count]
+        self._out_of_date = False
+        self._window_matrix = None
+
+    def getWindowCoordinates(self, matrix):
+        '''
+        Get the (N, 3) window coordinates of the nodes for the world to
+        window matrix.  Depths between 0 and 1 lie between the near and far
+        clipping planes.
+        '''
+        self._update()
+        if self._window_matrix is None or not numpy.array_equal(self._window_matrix, matrix):
+            self._window_matrix = numpy.array(matrix, dtype=numpy.float64)
+            self._window_coordinates = transformPoints(self._window_matrix, self._coordinates)
+
+        return self._window_coordinates
+
+    def _visibleMask(self, window_coordinates):
+        depth = window_coordinates[:, 2]
+        return (depth >= 0.0) & (depth <= 1.0)
+
+    def findInRectangle(self, matrix, x_min, y_min, x_max, y_max):
+        '''
+        Return the identifiers of the nodes whose window coordinates lie in
+        the rectangle and between the near and far clipping planes.
+        '''
+        window_coordinates = self.getWindowCoordinates(matrix)
+        x = window_coordinates[:, 0]
+        y = window_coordinates[:, 1]
+        mask = self._visibleMask(window_coordinates) & \
+            (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+        return self._identifiers[mask]
+
+    def findInPolygon(self, matrix, polygon):
+        '''
+        Return the identifiers of the nodes whose window coordinates lie
+        inside polygon, a sequence of (x, y) window positions.
+        '''
+        polygon = numpy.asarray(polygon, dtype=numpy.float64).reshape(-1, 2)
+        if len(polygon) < 3:
+            return self._identifiers[:0]
+
+        window_coordinates = self.getWindowCoordinates(matrix)
+        x = window_coordinates[:, 0]
+        y = window_coordinates[:, 1]
+        # Only test the nodes inside the bounding box of the polygon.
+        low = polygon.min(axis=0)
+        high = polygon.max(axis=0)
+        candidates = numpy.nonzero(self._visibleMask(window_coordinates) &
+                                   (x >= low[0]) & (x <= high[0]) &
+                                   (y >= low[1]) & (y <= high[1]))[0]
+        inside = pointsInPolygon(window_coordinates[candidates, :2], polygon)
+        return self._identifiers[candidates[inside]]
+
+    def findInRadius(self, matrix, x, y, radius):
+        '''
+        Return the identifiers of the nodes within radius pixels of the
+        window position x, y.
+        '''
+        window_coordinates = self.getWindowCoordinates(matrix)
+        visible = numpy.nonzero(self._visibleMask(window_coordinates))[0]
+        offsets = window_coordinates[visible, :2] - [x, y]
+        inside = (offsets * offsets).sum(axis=1) <= radius * radius
+        return self._identifiers[visible[inside]]
@@ -0,0 +1,44 @@
+# The tests run against the Zinc and Qt stand-in of the benchmarks so they need neither
+# PyZinc nor a display.  The stand-in is installed before any module of the package
+# imports opencmiss.zinc or Qt.
+
+import os
+import sys
+
+_tests_dir = os.path.dirname(os.path.abspath(__file__))
+_package_dir = os.path.dirname(_tests_dir)
+sys.path.insert(0, _package_dir)
+sys.path.insert(0, os.path.join(_package_dir, 'benchmarks'))
+
+import zincstandin
+
+zincstandin.install(force=True)
+
+import pytest
+
+from models import createCoordinateField
+
+
+@pytest.fixture(scope='session')
+def application():
+    try:
+        from PySide import QtGui
+    except ImportError:
+        from PyQt4 import QtGui
+    return QtGui.QApplication.instance() or QtGui.QApplication(sys.argv)
+
+
+@pytest.fixture
+def context():
+    from opencmiss.zinc.context import Context
+    return Context('test')
+
+
+@pytest.fixture
+def fieldmodule(context):
+    return context.getDefaultRegion().getFieldmodule()
+
+
+@pytest.fixture
+def coordinates(fieldmodule):
+    return createCoordinateField(fieldmodule)
@@ -0,0 +1,26 @@
+import numpy
+
+from models import gridMesh
+from run_benchmarks import compareResults
+
+
+def test_grid_mesh_sizes():
+    coordinates, connectivity = gridMesh(3)
+    assert coordinates.shape == (64, 3)
+    assert connectivity.shape == (27, 8)
+    # The first element is the cube at the origin, in Zinc local node order.
+    assert numpy.allclose(coordinates[connectivity[0]],
+                          [[i, j, k] for k in (0, 1) for j in (0, 1) for i in (0, 1)] * numpy.array(1.0 / 3.0))
+
+
+def _result(benchmark, value, better):
+    return {'benchmark': benchmark, 'size': 8, 'metric': 'median', 'value': value, 'unit': 'ms',
+            'better': better}
+
+
+def test_compare_results_counts_regressions_beyond_tolerance():
+    baseline = {'results': [_result('paint', 10.0, 'lower'), _result('build', 100.0, 'higher'),
+                            _result('pick', 10.0, 'lower')]}
+    results = [_result('paint', 13.0, 'lower'), _result('build', 90.0, 'higher'), _result('pick', 5.0, 'lower'),
+               _result('new', 1.0, 'lower')]
+    assert compareResults(results, baseline, 0.2) == 1
@@ -0,0 +1,64 @@
+import numpy
+import pytest
+
+from coordinatestream import CoordinateStream
+from meshbuilder import MeshBuilder, NodeValueWriter
+
+
+@pytest.fixture
+def stream(fieldmodule, coordinates):
+    MeshBuilder(fieldmodule, coordinates).createNodes(numpy.zeros((5, 3)), first_identifier=1)
+    return CoordinateStream(fieldmodule.findNodesetByName('nodes'), coordinates)
+
+
+def _nodeValues(fieldmodule, coordinates):
+    fieldcache = fieldmodule.createFieldcache()
+    nodeset = fieldmodule.findNodesetByName('nodes')
+    values = []
+    for identifier in range(1, 6):
+        fieldcache.setNode(nodeset.findNodeByIdentifier(identifier))
+        values.append(coordinates.evaluateReal(fieldcache, 3)[1])
+    return numpy.array(values)
+
+
+def test_steps_pushed_before_apply_are_dropped(stream, fieldmodule, coordinates):
+    for step in range(3):
+        stream.push(numpy.full((5, 3), float(step)), time=step)
+    assert stream.apply()
+    assert stream.getStatistics() == {'pushed': 3, 'applied': 1, 'dropped': 2}
+    assert stream.getTime() == 2
+    assert numpy.allclose(_nodeValues(fieldmodule, coordinates), 2.0)
+
+
+def test_apply_without_new_step_does_nothing(stream):
+    assert not stream.apply()
+    stream.push(numpy.ones((5, 3)))
+    assert stream.apply()
+    assert not stream.apply()
+    assert stream.getStatistics() == {'pushed': 1, 'applied': 1, 'dropped': 0}
+
+
+def test_data_arrived_once_per_apply(stream):
+    arrivals = []
+    stream.dataArrived.connect(lambda: arrivals.append(True))
+    stream.push(numpy.ones((5, 3)))
+    stream.push(numpy.ones((5, 3)))
+    assert len(arrivals) == 1
+    stream.apply()
+    stream.push(numpy.ones((5, 3)))
+    assert len(arrivals) == 2
+
+
+def test_push_checks_shape(stream):
+    with pytest.raises(ValueError):
+        stream.push(numpy.ones((4, 3)))
+
+
+def test_node_value_writer_writes_rows_in_identifier_order(fieldmodule, coordinates):
+    MeshBuilder(fieldmodule, coordinates).createNodes(numpy.zeros((5, 3)), first_identifier=1)
+    writer = NodeValueWriter(fieldmodule.findNodesetByName('nodes'), coordinates, identifiers=[3, 1])
+    assert writer.getIdentifiers().tolist() == [3, 1]
+    writer.write([[3.0, 3.0, 3.0], [1.0, 1.0, 1.0]])
+    assert numpy.allclose(_nodeValues(fieldmodule, coordinates)[:3], [[1.0] * 3, [0.0] * 3, [3.0] * 3])
+    with pytest.raises(ValueError):
+        writer.write(numpy.zeros((3, 3)))
@@ -0,0 +1,39 @@
+from opencmiss.zinc.field import Field
+
+from levelofdetail import LEVEL_FULL, InteractionLevelOfDetail
+
+
+def _nodePoints(region):
+    graphics = region.getScene().createGraphicsPoints()
+    graphics.setFieldDomainType(Field.DOMAIN_TYPE_NODES)
+    return graphics
+
+
+def test_restore_keeps_divisions_changed_while_reduced(context):
+    tessellation = context.getTessellationmodule().getDefaultTessellation()
+    tessellation.setMinimumDivisions([8, 8, 8])
+    tessellation.setRefinementFactors([4, 4, 4])
+    tessellation.setCircleDivisions(24)
+    level_of_detail = InteractionLevelOfDetail(context.getDefaultRegion())
+    level_of_detail.setLevel(1)
+    assert tessellation.getMinimumDivisions(3)[1] == [4, 4, 4]
+
+    tessellation.setMinimumDivisions([2, 2, 2])
+    level_of_detail.setLevel(LEVEL_FULL)
+    assert tessellation.getMinimumDivisions(3)[1] == [2, 2, 2]
+    assert tessellation.getRefinementFactors(3)[1] == [4, 4, 4]
+    assert tessellation.getCircleDivisions() == 24
+
+
+def test_restore_shows_only_the_graphics_it_hid(context):
+    region = context.getDefaultRegion()
+    shown = _nodePoints(region)
+    hidden_by_application = _nodePoints(region)
+    hidden_by_application.setVisibilityFlag(False)
+    level_of_detail = InteractionLevelOfDetail(region)
+    level_of_detail.setLevel(level_of_detail.getLevelCount() - 1)
+    assert not shown.getVisibilityFlag()
+
+    level_of_detail.setLevel(LEVEL_FULL)
+    assert shown.getVisibilityFlag()
+    assert not hidden_by_application.getVisibilityFlag()
@@ -0,0 +1,52 @@
+import numpy
+import pytest
+
+from models import gridMesh
+from meshbuilder import ELEMENT_SHAPE_TETRAHEDRON, MeshBuilder, createFiniteElements
+
+
+def _sizes(fieldmodule):
+    return (fieldmodule.findNodesetByName('nodes').getSize(), fieldmodule.findMeshByDimension(3).getSize())
+
+
+def _nodeValues(fieldmodule, field, identifiers):
+    fieldcache = fieldmodule.createFieldcache()
+    nodeset = fieldmodule.findNodesetByName('nodes')
+    values = []
+    for identifier in identifiers:
+        fieldcache.setNode(nodeset.findNodeByIdentifier(int(identifier)))
+        values.append(field.evaluateReal(fieldcache, 3)[1])
+    return numpy.array(values)
+
+
+def test_build_counts(fieldmodule, coordinates):
+    node_coordinates, connectivity = gridMesh(3)
+    statistics = MeshBuilder(fieldmodule, coordinates).build(node_coordinates, connectivity)
+    assert (statistics.node_count, statistics.element_count) == (64, 27)
+    assert _sizes(fieldmodule) == (64, 27)
+
+
+def test_create_finite_elements_counts(fieldmodule, coordinates):
+    node_coordinates, connectivity = gridMesh(2)
+    statistics = createFiniteElements(fieldmodule, coordinates, node_coordinates, connectivity)
+    assert (statistics.node_count, statistics.element_count) == (27, 8)
+    assert _sizes(fieldmodule) == (27, 8)
+
+
+def test_build_numbers_from_first_identifiers(fieldmodule, coordinates):
+    node_coordinates, connectivity = gridMesh(2)
+    MeshBuilder(fieldmodule, coordinates).build(node_coordinates, connectivity, first_node_identifier=101,
+                                                first_element_identifier=11)
+    assert numpy.allclose(_nodeValues(fieldmodule, coordinates, [101, 127]), node_coordinates[[0, 26]])
+    mesh = fieldmodule.findMeshByDimension(3)
+    assert mesh.findElementByIdentifier(11).isValid() and mesh.findElementByIdentifier(18).isValid()
+
+
+def test_tetrahedron_builder_checks_connectivity(fieldmodule, coordinates):
+    builder = MeshBuilder(fieldmodule, coordinates, ELEMENT_SHAPE_TETRAHEDRON)
+    assert builder.getElementNodeCount() == 4
+    nodes = builder.createNodes(numpy.identity(3).tolist() + [[0.0, 0.0, 0.0]])
+    with pytest.raises(ValueError):
+        builder.createElements(nodes, [[0, 1, 2]])
+    builder.createElements(nodes, [[3, 0, 1, 2]])
+    assert _sizes(fieldmodule) == (4, 1)
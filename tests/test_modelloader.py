@@ -0,0 +1,70 @@
+try:
+    from PySide import QtCore
+except ImportError:
+    from PyQt4 import QtCore
+
+import pytest
+
+from models import createWidget
+
+
+def _modelFiles(tmpdir, count):
+    filenames = []
+    for i in range(count):
+        model_file = tmpdir.join('part%d.exf' % i)
+        model_file.write('x' * (i + 1))
+        filenames.append(str(model_file))
+    return filenames
+
+
+def test_events_are_processed_between_files(application, tmpdir):
+    widget, coordinates, element_count = createWidget(2)
+    events = []
+
+    def progress(bytes_read, total_bytes):
+        events.append(('progress', bytes_read, total_bytes))
+        QtCore.QTimer.singleShot(0, lambda: events.append(('timer', bytes_read)))
+
+    region = widget.loadModelStaged(_modelFiles(tmpdir, 3), progress=progress)
+    assert events == [('progress', 1, 6), ('timer', 1), ('progress', 3, 6), ('timer', 3),
+                      ('progress', 6, 6), ('timer', 6)]
+    assert widget.getCurrentRegion() is region
+    widget.release()
+
+
+def test_prepare_runs_before_the_region_is_shown(application, tmpdir):
+    widget, coordinates, element_count = createWidget(2)
+    previous_region = widget.getCurrentRegion()
+    prepared = []
+
+    def prepare(region):
+        prepared.append(widget.getCurrentRegion() is previous_region)
+
+    region = widget.loadModelStaged(_modelFiles(tmpdir, 1), prepare)
+    assert prepared == [True]
+    assert widget.getCurrentRegion() is region
+    widget.release()
+
+
+def test_failed_read_keeps_the_current_region(application, tmpdir):
+    widget, coordinates, element_count = createWidget(2)
+    region = widget.getCurrentRegion()
+    filenames = _modelFiles(tmpdir, 1) + [str(tmpdir.join('missing.exf'))]
+    with pytest.raises(RuntimeError):
+        widget.loadModelStaged(filenames)
+    assert widget.getCurrentRegion() is region
+    widget.release()
+
+
+def test_release_between_files_cancels_the_read(application, tmpdir):
+    widget, coordinates, element_count = createWidget(2)
+    progress = []
+
+    def releaseAfterFirstFile(bytes_read, total_bytes):
+        progress.append(bytes_read)
+        if len(progress) == 1:
+            QtCore.QTimer.singleShot(0, widget.release)
+
+    with pytest.raises(RuntimeError):
+        widget.loadModelStaged(_modelFiles(tmpdir, 3), progress=releaseAfterFirstFile)
+    assert progress == [1]
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+from offscreenrenderer import BACKEND_OSMESA, OffscreenRenderer
+
+
+@pytest.fixture
+def pyopenglWithoutOSMesa(tmpdir, monkeypatch):
+    '''
+    Put a PyOpenGL package on the path whose GL module imports but whose
+    osmesa module fails, like PyOpenGL on a machine without libOSMesa.
+    '''
+    package = tmpdir.mkdir('OpenGL')
+    package.join('__init__.py').write('')
+    package.join('GL.py').write('')
+    package.join('arrays.py').write('')
+    package.join('osmesa.py').write("raise ImportError('Unable to load OSMesa')\n")
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.delenv('PYOPENGL_PLATFORM', raising=False)
+    for name in [name for name in sys.modules if name == 'OpenGL' or name.startswith('OpenGL.')]:
+        monkeypatch.delitem(sys.modules, name)
+
+
+def test_failed_osmesa_backend_rolls_back_the_platform(context, pyopenglWithoutOSMesa):
+    with pytest.raises(RuntimeError):
+        OffscreenRenderer(context, 64, 64, backend=BACKEND_OSMESA)
+    assert 'PYOPENGL_PLATFORM' not in os.environ
+    assert not [name for name in sys.modules if name == 'OpenGL' or name.startswith('OpenGL.')]
@@ -0,0 +1,175 @@
+import threading
+import time
+
+import numpy
+import pytest
+
+import zincstandin
+from models import gridMesh
+from meshbuilder import createFiniteElements
+from playback import PlaybackController, TimestepCache
+
+
+def _array(value, count=4):
+    return numpy.full(count, value, dtype=numpy.float64)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TimestepCache(3 * 32)
+    for key in range(3):
+        cache.add(key, _array(key))
+    assert cache.get(0) is not None
+    cache.add(3, _array(3))
+    assert 1 not in cache
+    assert [key in cache for key in (0, 2, 3)] == [True, True, True]
+    assert cache.evicted_count == 1
+    assert cache.getBytes() == 3 * 32
+
+
+def test_cache_counts_hits_and_misses():
+    cache = TimestepCache(1024)
+    cache.add(0, _array(0))
+    assert cache.get(0) is not None
+    assert cache.get(1) is None
+    assert (cache.hit_count, cache.miss_count) == (1, 1)
+
+
+def test_cache_replaces_key_and_skips_oversized_arrays():
+    cache = TimestepCache(64)
+    cache.add(0, _array(0))
+    cache.add(0, _array(1))
+    assert len(cache) == 1
+    assert cache.getBytes() == 32
+    cache.add(1, _array(1, count=16))
+    assert 1 not in cache
+    assert cache.getBytes() == 32
+
+
+def test_cache_shrinking_budget_evicts():
+    cache = TimestepCache(1024)
+    for key in range(4):
+        cache.add(key, _array(key))
+    cache.setMaximumBytes(64)
+    assert len(cache) == 2
+    assert 2 in cache and 3 in cache
+
+
+class _RecordingField(object):
+    '''
+    A field source that records the times and nodes it is evaluated at.
+    '''
+
+    def __init__(self, field):
+        self._field = field
+        self.calls = []
+
+    def getFieldmodule(self):
+        return _RecordingFieldmodule(self)
+
+    def getNumberOfComponents(self):
+        return self._field.getNumberOfComponents()
+
+    def evaluateReal(self, fieldcache, component_count):
+        self.calls.append(('node', fieldcache.time))
+        return self._field.evaluateReal(fieldcache.fieldcache, component_count)
+
+
+class _RecordingFieldmodule(object):
+
+    def __init__(self, source):
+        self._source = source
+
+    def createFieldcache(self):
+        return _RecordingFieldcache(self._source)
+
+
+class _RecordingFieldcache(object):
+
+    def __init__(self, source):
+        self._source = source
+        self.fieldcache = source._field.getFieldmodule().createFieldcache()
+        self.time = None
+
+    def setTime(self, time):
+        self._source.calls.append(('time', time))
+        self.time = time
+        self.fieldcache.setTime(time)
+
+    def setNode(self, node):
+        self.fieldcache.setNode(node)
+
+
+def _model(fieldmodule, coordinates):
+    node_coordinates, connectivity = gridMesh(8)
+    createFiniteElements(fieldmodule, coordinates, node_coordinates, connectivity)
+    return fieldmodule.findNodesetByName('nodes'), node_coordinates
+
+
+def _waitForPrefetch(controller, count):
+    for wait in range(200):
+        if controller.getCacheStatistics()['prefetched'] >= count:
+            return
+        zincstandin.processEvents(wait=0.01)
+
+
+def test_field_prefetch_is_split_into_budgeted_passes(application, fieldmodule, coordinates):
+    nodes, node_coordinates = _model(fieldmodule, coordinates)
+    source = _RecordingField(coordinates)
+    controller = PlaybackController(nodes, coordinates, [0.0, 1.0, 2.0], source, prefetch_budget=0.0)
+    controller.seek(0)
+    _waitForPrefetch(controller, 2)
+    assert controller.getCacheStatistics()['prefetched'] == 2
+
+    # Split the calls into passes at each setTime() and count the nodes of each.
+    passes = []
+    for kind, time_value in source.calls:
+        if kind == 'time':
+            passes.append([time_value, 0])
+        else:
+            passes[-1][1] += 1
+    node_count = len(node_coordinates)
+    assert passes[0] == [0.0, node_count]
+    prefetch_passes = passes[1:]
+    assert len(prefetch_passes) > 2
+    assert max(count for time_value, count in prefetch_passes) < node_count
+    # Every node is evaluated once per prefetched time, carrying on where the last pass stopped.
+    for prefetched_time in (1.0, 2.0):
+        assert sum(count for time_value, count in prefetch_passes if time_value == prefetched_time) == node_count
+    controller.release()
+
+
+def test_callable_source_is_prefetched_on_a_worker_thread(application, fieldmodule, coordinates):
+    nodes, node_coordinates = _model(fieldmodule, coordinates)
+    threads = []
+
+    def source(time_value):
+        threads.append(threading.current_thread())
+        time.sleep(0.005)
+        return node_coordinates * time_value
+
+    controller = PlaybackController(nodes, coordinates, [0.0, 1.0, 2.0], source)
+    controller.seek(0)
+    _waitForPrefetch(controller, 2)
+    statistics = controller.getCacheStatistics()
+    assert (statistics['prefetched'], statistics['entries']) == (2, 3)
+    assert threads[0] is threading.current_thread()
+    assert all(thread is not threading.current_thread() for thread in threads[1:])
+    controller.seek(2)
+    assert len(threads) == 3
+    controller.release()
+
+
+def test_failed_prefetch_is_raised_when_the_time_is_shown(application, fieldmodule, coordinates):
+    nodes, node_coordinates = _model(fieldmodule, coordinates)
+
+    def source(time_value):
+        if time_value == 1.0:
+            raise RuntimeError('no solution')
+        return node_coordinates
+
+    controller = PlaybackController(nodes, coordinates, [0.0, 1.0], source)
+    controller.seek(0)
+    zincstandin.processEvents(wait=0.05)
+    with pytest.raises(RuntimeError):
+        controller.seek(1)
+    controller.release()
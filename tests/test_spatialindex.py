@@ -0,0 +1,64 @@
+import numpy
+
+from meshbuilder import MeshBuilder
+from spatialindex import NodeSpatialIndex, pointsInPolygon, transformPoints
+
+
+def test_transform_points_translates():
+    matrix = numpy.identity(4)
+    matrix[:3, 3] = [1.0, 2.0, 3.0]
+    points = numpy.array([[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]])
+    assert numpy.allclose(transformPoints(matrix, points), points + [1.0, 2.0, 3.0])
+
+
+def test_transform_points_divides_by_w():
+    matrix = numpy.identity(4)
+    matrix[3] = [0.0, 0.0, 1.0, 0.0]
+    transformed = transformPoints(matrix, [[2.0, 4.0, 2.0]])
+    assert numpy.allclose(transformed, [[1.0, 2.0, 1.0]])
+
+
+def test_points_in_square():
+    square = [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)]
+    points = numpy.array([[1.0, 1.0], [3.0, 1.0], [1.0, -0.5], [0.5, 1.9]])
+    assert pointsInPolygon(points, square).tolist() == [True, False, False, True]
+
+
+def test_points_in_concave_polygon():
+    # A U shape open at the top between x = 1 and x = 2.
+    u_shape = [(0.0, 0.0), (3.0, 0.0), (3.0, 3.0), (2.0, 3.0), (2.0, 1.0), (1.0, 1.0), (1.0, 3.0), (0.0, 3.0)]
+    points = numpy.array([[0.5, 2.0], [1.5, 2.0], [2.5, 2.0], [1.5, 0.5]])
+    assert pointsInPolygon(points, u_shape).tolist() == [True, False, True, True]
+
+
+def _index(fieldmodule, coordinates, node_coordinates):
+    builder = MeshBuilder(fieldmodule, coordinates)
+    builder.createNodes(node_coordinates, first_identifier=1)
+    return NodeSpatialIndex(fieldmodule.findNodesetByName('nodes'), coordinates)
+
+
+def test_find_in_rectangle(fieldmodule, coordinates):
+    node_coordinates = numpy.array([[0.0, 0.0, 0.5], [5.0, 5.0, 0.5], [9.0, 1.0, 0.5], [5.0, 5.0, 2.0]])
+    index = _index(fieldmodule, coordinates, node_coordinates)
+    found = index.findInRectangle(numpy.identity(4), 4.0, 0.0, 10.0, 6.0)
+    # The last node is beyond the far clipping plane.
+    assert found.tolist() == [2, 3]
+
+
+def test_update_coordinates_keeps_index_current(fieldmodule, coordinates):
+    node_coordinates = numpy.zeros((4, 3))
+    index = _index(fieldmodule, coordinates, node_coordinates)
+    assert index.getCoordinates().shape == (4, 3)
+    index.updateCoordinates([2, 4, 7], [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]])
+    assert not index.isOutOfDate()
+    assert numpy.allclose(index.getCoordinates(), [[0.0, 0.0, 0.0], [1.0, 2.0, 3.0],
+                                                   [0.0, 0.0, 0.0], [4.0, 5.0, 6.0]])
+
+
+def test_find_in_polygon_and_radius(fieldmodule, coordinates):
+    node_coordinates = numpy.array([[1.0, 1.0, 0.5], [5.0, 5.0, 0.5], [2.5, 2.5, 0.5], [1.0, 1.0, -1.0]])
+    index = _index(fieldmodule, coordinates, node_coordinates)
+    matrix = numpy.identity(4)
+    triangle = [(0.0, 0.0), (4.0, 0.0), (0.0, 4.0)]
+    assert index.findInPolygon(matrix, triangle).tolist() == [1]
+    assert sorted(index.findInRadius(matrix, 2.0, 2.0, 1.5).tolist()) == [1, 3]
@@ -0,0 +1,236 @@
+try:
+    from PySide import QtCore, QtGui
+except ImportError:
+    from PyQt4 import QtCore, QtGui
+
+import numpy
+import pytest
+
+from opencmiss.zinc.context import Context
+
+import zincstandin
+from meshbuilder import createFiniteElements
+from models import createCoordinateField, createWidget, gridMesh, processEvents
+from zincwidget import SelectionDelta, ZincWidget
+
+
+def _shownView(share_widget, region=None):
+    view = ZincWidget(shareWidget=share_widget)
+    if region is not None:
+        view.setCurrentRegion(region)
+    view.resize(320, 240)
+    view.show()
+    processEvents()
+    return view
+
+
+def test_level_of_detail_survives_a_sibling_view_of_another_region(application):
+    first, coordinates, element_count = createWidget(3)
+    context = first.getContext()
+    second = _shownView(first, context.getDefaultRegion().createChild('other'))
+    third = _shownView(first)
+    first.setInteractionLevelOfDetailEnabled(True)
+    third.setInteractionLevelOfDetailEnabled(True)
+    assert first.getInteractionLevelOfDetail() is third.getInteractionLevelOfDetail()
+
+    second.pickAt(10, 10)
+    second.setInteractionLevelOfDetailEnabled(True)
+    assert second.getInteractionLevelOfDetail() is not first.getInteractionLevelOfDetail()
+    third.setInteractionLevelOfDetailEnabled(False)
+    level_of_detail = first.getInteractionLevelOfDetail()
+    level_of_detail.setLevel(1)
+    level_of_detail.setLevel(0)
+    for view in (first, second, third):
+        view.release()
+
+
+def test_view_picks_after_a_sibling_view_is_released(application):
+    first, coordinates, element_count = createWidget(3)
+    second = _shownView(first)
+    assert first.pickAt(10, 10) is not None
+    second.pickAt(10, 10)
+    first.release()
+    assert second.pickAt(320, 240) is not None
+    second.release()
+
+
+def _progressiveView(application, frame_budget):
+    context = Context('progressive')
+    region = context.getDefaultRegion()
+    fieldmodule = region.getFieldmodule()
+    field = createCoordinateField(fieldmodule)
+    createFiniteElements(fieldmodule, field, *gridMesh(3))
+    region.getScene().createGraphicsSurfaces().setCoordinateField(field)
+    tessellation = context.getTessellationmodule().getDefaultTessellation()
+    tessellation.setMinimumDivisions([8, 8, 8])
+    view = ZincWidget()
+    view.setContext(context)
+    view.setProgressiveRefinementEnabled(True, frame_budget=frame_budget)
+    return view, tessellation
+
+
+def _divisions(tessellation):
+    return list(tessellation.getMinimumDivisions(3)[1])
+
+
+def _waitForRefinement(view):
+    for wait in range(50):
+        if not view.isRefining():
+            return
+        zincstandin.processEvents(wait=0.02)
+
+
+def test_first_show_is_coarse_then_refined(application):
+    view, tessellation = _progressiveView(application, 1.0)
+    view.resize(100, 100)
+    view.show()
+    assert view.isRefining()
+    assert _divisions(tessellation) == [1, 1, 1]
+    _waitForRefinement(view)
+    assert not view.isRefining()
+    assert _divisions(tessellation) == [8, 8, 8]
+    view.release()
+
+
+def test_view_all_does_not_rebuild(application):
+    view, tessellation = _progressiveView(application, 0.0)
+    view.resize(100, 100)
+    view.show()
+    _waitForRefinement(view)
+    view.viewAll()
+    assert not view.isRefining()
+    assert _divisions(tessellation) == [8, 8, 8]
+    view.release()
+
+
+def test_scene_predicted_within_budget_is_drawn_at_full_quality(application):
+    view, tessellation = _progressiveView(application, 10.0)
+    view.resize(100, 100)
+    view.show()
+    _waitForRefinement(view)
+    # The first full quality build was timed, so a similar scene fits the budget.
+    view.setCurrentRegion(view.getContext().getDefaultRegion())
+    assert not view.isRefining()
+    assert _divisions(tessellation) == [8, 8, 8]
+    view.release()
+
+
+def _idleViews(application, maximum_frame_rate=None):
+    first, coordinates, element_count = createWidget(2)
+    second = _shownView(first)
+    # Let the repaints of the first show run at the default frame rate.
+    zincstandin.processEvents(wait=0.1)
+    first.setMaximumFrameRate(maximum_frame_rate)
+    first.resetRepaintStatistics()
+    return first, second
+
+
+def test_repaint_requests_merge_into_one_frame_per_view(application):
+    first, second = _idleViews(application)
+    for request in range(3):
+        first.requestRepaint()
+    second.requestRepaint()
+    zincstandin.processEvents()
+    assert first.getRepaintStatistics() == {'requested': 4, 'rendered': 2, 'merged': 2}
+    for view in (first, second):
+        view.release()
+
+
+def test_repaint_frame_rate_limit_delays_the_next_frame(application):
+    first, second = _idleViews(application, 10.0)
+    first.requestRepaint()
+    zincstandin.processEvents(wait=0.15)
+    assert first.getRepaintStatistics()['rendered'] == 1
+    first.requestRepaint()
+    zincstandin.processEvents()
+    assert first.getRepaintStatistics()['rendered'] == 1
+    zincstandin.processEvents(wait=0.15)
+    assert first.getRepaintStatistics()['rendered'] == 2
+    for view in (first, second):
+        view.release()
+
+
+def test_repaint_of_a_deleted_view_is_dropped(application):
+    first, second = _idleViews(application)
+    second.requestRepaint()
+    first.requestRepaint()
+    second.deleteLater()
+    zincstandin.processEvents()
+    assert first.getRepaintStatistics()['rendered'] == 1
+    first.release()
+
+
+
+def test_selection_delta_accessors():
+    delta = SelectionDelta({'nodes': numpy.array([1, 2])}, {})
+    assert not delta.isEmpty()
+    assert delta.getAdded('nodes').tolist() == [1, 2]
+    assert delta.getRemoved('nodes').tolist() == []
+    assert SelectionDelta({}, {}).isEmpty()
+
+
+@pytest.fixture
+def selectionView(application):
+    widget, coordinates, element_count = createWidget(4)
+    widget.setSelectModeNode()
+    widget.setSelectionChangedMaximumRate(None)
+    yield widget
+    widget.release()
+
+
+def _deltas(widget):
+    deltas = []
+    widget.selectionChanged.connect(deltas.append)
+    return deltas
+
+
+def _selectedNodes(widget):
+    arrays = widget.selectionToArrays()
+    if 'nodes' not in arrays:
+        return numpy.zeros(0, dtype=numpy.int64)
+    return arrays['nodes'][0]
+
+
+def test_selection_deltas_follow_selection(selectionView):
+    widget = selectionView
+    deltas = _deltas(widget)
+    widget.selectNodesInRectangle(0, 0, widget.width(), widget.height())
+    zincstandin.processEvents()
+    everything = _selectedNodes(widget)
+    assert deltas[-1].getAdded('nodes').tolist() == everything.tolist()
+    assert len(deltas[-1].getRemoved('nodes')) == 0
+
+    widget.selectNodesInRectangle(0, 0, widget.width() // 2, widget.height())
+    zincstandin.processEvents()
+    left = _selectedNodes(widget)
+    assert 0 < len(left) < len(everything)
+    assert len(deltas[-1].getAdded('nodes')) == 0
+    assert deltas[-1].getRemoved('nodes').tolist() == numpy.setdiff1d(everything, left).tolist()
+
+
+def test_selection_delta_for_outside_change(selectionView):
+    widget = selectionView
+    deltas = _deltas(widget)
+    widget.selectNodesInRectangle(0, 0, widget.width(), widget.height())
+    zincstandin.processEvents()
+    selected = _selectedNodes(widget)
+    widget.getSelectionGroup().clear()
+    zincstandin.processEvents()
+    assert deltas[-1].getRemoved('nodes').tolist() == selected.tolist()
+    assert len(deltas) == 2
+
+
+def _mouseEvent(event_type, x, y, modifiers=QtCore.Qt.NoModifier):
+    button = QtCore.Qt.LeftButton
+    buttons = QtCore.Qt.NoButton if event_type == QtCore.QEvent.MouseButtonRelease else button
+    return QtGui.QMouseEvent(event_type, QtCore.QPoint(x, y), button, buttons, modifiers)
+
+
+@pytest.mark.parametrize('modifiers', [QtCore.Qt.NoModifier, QtCore.Qt.CTRL])
+def test_mouse_input_after_release_is_ignored(application, modifiers):
+    widget, coordinates, element_count = createWidget(2)
+    widget.release()
+    widget.mousePressEvent(_mouseEvent(QtCore.QEvent.MouseButtonPress, 10, 10, modifiers))
+    widget.mouseMoveEvent(_mouseEvent(QtCore.QEvent.MouseMove, 50, 40, modifiers))
+    widget.mouseReleaseEvent(_mouseEvent(QtCore.QEvent.MouseButtonRelease, 50, 40, modifiers))
+    zincstandin.processEvents()
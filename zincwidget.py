@@ -3,27 +3,65 @@
 # information.
 
 try:
-    from PySide import QtCore, QtOpenGL
+    from PySide import QtCore, QtGui, QtOpenGL
 except ImportError:
-    from PyQt4 import QtCore, QtOpenGL
+    from PyQt4 import QtCore, QtGui, QtOpenGL
+
+import collections
+import functools
+import weakref
+
+try:
+    from time import perf_counter as _clock
+except ImportError:
+    from time import time as _clock
+
+# Zinc, NumPy and the helper modules are imported on first use so importing this
+# module only loads Qt, which is needed for the base class.
+from lazyimport import lazyImport, getImportTimings
+
+numpy = lazyImport('numpy')
 
 # from opencmiss.zinc.glyph import Glyph
-from opencmiss.zinc.sceneviewer import Sceneviewer, Sceneviewerevent
-from opencmiss.zinc.sceneviewerinput import Sceneviewerinput
-from opencmiss.zinc.element import Element, Elementbasis
-from opencmiss.zinc.scenecoordinatesystem import \
-        SCENECOORDINATESYSTEM_LOCAL, \
-        SCENECOORDINATESYSTEM_WINDOW_PIXEL_TOP_LEFT,\
-        SCENECOORDINATESYSTEM_WORLD
-from opencmiss.zinc.field import Field
-from opencmiss.zinc.glyph import Glyph
-from opencmiss.zinc.status import OK
+Sceneviewer = lazyImport('opencmiss.zinc.sceneviewer', 'Sceneviewer')
+Sceneviewerevent = lazyImport('opencmiss.zinc.sceneviewer', 'Sceneviewerevent')
+Sceneviewerinput = lazyImport('opencmiss.zinc.sceneviewerinput', 'Sceneviewerinput')
+scenecoordinatesystem = lazyImport('opencmiss.zinc.scenecoordinatesystem')
+Element = lazyImport('opencmiss.zinc.element', 'Element')
+Field = lazyImport('opencmiss.zinc.field', 'Field')
+status = lazyImport('opencmiss.zinc.status')
+
+Instrumentation = lazyImport('instrumentation', 'Instrumentation')
+levelofdetail = lazyImport('levelofdetail')
+InteractionLevelOfDetail = lazyImport('levelofdetail', 'InteractionLevelOfDetail')
+StagedModelReader = lazyImport('modelloader', 'StagedModelReader')
+CoordinateStream = lazyImport('coordinatestream', 'CoordinateStream')
+PlaybackController = lazyImport('playback', 'PlaybackController')
+meshbuilder = lazyImport('meshbuilder')
+createSceneviewer = lazyImport('sceneviewersetup', 'createSceneviewer')
+NodeSpatialIndex = lazyImport('spatialindex', 'NodeSpatialIndex')
+ResourceTracker = lazyImport('resourcetracker', 'ResourceTracker')
+estimateRegionMemory = lazyImport('resourcetracker', 'estimateRegionMemory')
+transformPoints = lazyImport('spatialindex', 'transformPoints')
 
 # mapping from qt to zinc start
 # Create a button map of Qt mouse buttons to Zinc input buttons
-button_map = {QtCore.Qt.LeftButton: Sceneviewerinput.BUTTON_TYPE_LEFT,
-              QtCore.Qt.MidButton: Sceneviewerinput.BUTTON_TYPE_MIDDLE,
-              QtCore.Qt.RightButton: Sceneviewerinput.BUTTON_TYPE_RIGHT}
+class _ButtonMap(dict):
+    '''
+    A dict that fills itself from Zinc on the first lookup, so Zinc is not
+    imported until a mouse button is used.
+    '''
+
+    def __missing__(self, key):
+        if self:
+            raise KeyError(key)
+
+        self.update({QtCore.Qt.LeftButton: Sceneviewerinput.BUTTON_TYPE_LEFT,
+                     QtCore.Qt.MidButton: Sceneviewerinput.BUTTON_TYPE_MIDDLE,
+                     QtCore.Qt.RightButton: Sceneviewerinput.BUTTON_TYPE_RIGHT})
+        return self[key]
+
+button_map = _ButtonMap()
 
 # Create a modifier map of Qt modifier keys to Zinc modifier keys
 def modifier_map(qt_modifiers):
@@ -44,28 +82,303 @@ class _SelectionMode(object):
     NONE = -1
     EXCLUSIVE = 0
     ADDITIVE = 1
+
+
+class _SelectionOperation(object):
+
+    ADD = 0
+    REMOVE = 1
+    CLEAR = 2
+    RELIST = 3
 # selectionMode end
 
+# pickResult start
+_mesh_domain_types = []
+
+def _meshDomainTypes():
+    if not _mesh_domain_types:
+        _mesh_domain_types.extend([Field.DOMAIN_TYPE_MESH1D,
+                                   Field.DOMAIN_TYPE_MESH2D,
+                                   Field.DOMAIN_TYPE_MESH3D,
+                                   Field.DOMAIN_TYPE_MESH_HIGHEST_DIMENSION])
+    return _mesh_domain_types
+
+class PickResult(object):
+    '''
+    The result of one pick pass.  Holds the nearest graphics, its field
+    domain type and the nearest node or element for that domain.  The node
+    and element are None when they do not apply, the domain type is None
+    when nothing was picked.
+    '''
+
+    def __init__(self, graphics, domain_type=None, node=None, element=None):
+        self.graphics = graphics
+        self.domain_type = domain_type
+        self.node = node
+        self.element = element
+
+    def isValid(self):
+        return self.graphics.isValid()
+
+    def getKey(self):
+        '''
+        Return a hashable key identifying what was picked.
+        '''
+        node_identifier = None if self.node is None else self.node.getIdentifier()
+        element_identifier = None if self.element is None else self.element.getIdentifier()
+        return (self.domain_type, node_identifier, element_identifier)
+# pickResult end
+
+# selectionDelta start
+_selection_nodeset_names = ['nodes', 'datapoints']
+_selection_mesh_names = ['mesh3d', 'mesh2d', 'mesh1d']
+
+def _iteratorIdentifiers(iterator):
+    '''
+    Return the identifiers of the nodes or elements of a Zinc iterator as a
+    NumPy array.
+    '''
+    identifiers = []
+    item = iterator.next()
+    while item.isValid():
+        identifiers.append(item.getIdentifier())
+        item = iterator.next()
+
+    return numpy.array(identifiers, dtype=numpy.int64)
+
+class SelectionDelta(object):
+    '''
+    The change in selection since the previous delta.  added and removed
+    map Zinc nodeset and mesh names ('nodes', 'datapoints', 'mesh3d',
+    'mesh2d', 'mesh1d') to NumPy arrays of identifiers.  Names without
+    changes are left out.
+    '''
+
+    def __init__(self, added, removed):
+        self.added = added
+        self.removed = removed
+
+    def isEmpty(self):
+        return not self.added and not self.removed
+
+    def getAdded(self, name):
+        return self.added.get(name, numpy.zeros(0, dtype=numpy.int64))
+
+    def getRemoved(self, name):
+        return self.removed.get(name, numpy.zeros(0, dtype=numpy.int64))
+# selectionDelta end
+
+# instrumentation start
+def _timed(name, input_event=False):
+    '''
+    Decorate a ZincWidget method so its duration is recorded under name
+    when instrumentation is enabled.  For input events the time the event
+    was handled is also kept until the next frame to measure latency.
+    '''
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            instrumentation = self._instrumentation
+            if instrumentation is None:
+                return method(self, *args)
+
+            start = _clock()
+            if input_event and self._inputEventTime is None:
+                self._inputEventTime = start
+            try:
+                return method(self, *args)
+            finally:
+                instrumentation.record(name, _clock() - start)
+        return wrapper
+    return decorator
+# instrumentation end
+
+# repaintScheduler start
+class _RepaintScheduler(object):
+    '''
+    Collapse repaint requests into at most one frame per event loop pass
+    and no more frames per second than the maximum frame rate.  Requests
+    made while a repaint is already pending are merged into that repaint.
+    Widgets are held through weak references and a widget deleted before
+    its repaint is skipped, so the scheduler never keeps a widget alive or
+    paints one that is gone.
+    '''
+
+    def __init__(self, maximum_frame_rate=60.0):
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._repaint)
+        self._pending = []
+        self._minimum_interval = 0.0
+        self._last_frame_time = None
+        self.setMaximumFrameRate(maximum_frame_rate)
+        self.resetStatistics()
+
+    def setMaximumFrameRate(self, maximum_frame_rate):
+        '''
+        Set the maximum number of frames per second, None or 0 means
+        frames are only limited to one per event loop pass.
+        '''
+        if maximum_frame_rate:
+            self._minimum_interval = 1.0 / maximum_frame_rate
+        else:
+            self._minimum_interval = 0.0
+
+    def getMaximumFrameRate(self):
+        if self._minimum_interval > 0.0:
+            return 1.0 / self._minimum_interval
+
+        return None
+
+    def resetStatistics(self):
+        self.requested_count = 0
+        self.merged_count = 0
+        self.frame_count = 0
+
+    def watch(self, widget):
+        '''
+        Drop a pending repaint of widget when its Qt object is destroyed,
+        which can happen before the Python wrapper goes away.
+        '''
+        widget.destroyed.connect(functools.partial(self._forget, weakref.ref(widget)))
+
+    def schedule(self, widget):
+        self.requested_count += 1
+        reference = weakref.ref(widget)
+        if reference in self._pending:
+            self.merged_count += 1
+            return
+
+        self._pending.append(reference)
+        if not self._timer.isActive():
+            delay = 0.0
+            if self._last_frame_time is not None:
+                delay = self._last_frame_time + self._minimum_interval - _clock()
+            self._timer.start(max(0, int(delay * 1000.0 + 0.5)))
+
+    def cancel(self, widget):
+        '''
+        Drop a pending repaint of widget.
+        '''
+        self._forget(weakref.ref(widget))
+
+    def _forget(self, reference, *args):
+        # A dead reference only compares equal to itself.
+        self._pending = [pending for pending in self._pending if pending != reference]
+        if not self._pending:
+            self._timer.stop()
+
+    def _repaint(self):
+        pending = self._pending
+        self._pending = []
+        self._last_frame_time = _clock()
+        for reference in pending:
+            widget = reference()
+            if widget is not None:
+                self.frame_count += 1
+                widget.updateGL()
+# repaintScheduler end
+
+# sharedResources start
+class _RegionResources(object):
+    '''
+    The scene picker and level of detail controller of one region, shared
+    by the views of a share group showing it.  users counts the views
+    holding these resources and level_of_detail_users the views with level
+    of detail enabled.
+    '''
+
+    def __init__(self, key):
+        self.key = key
+        self.scene_picker = None
+        self.level_of_detail = None
+        self.level_of_detail_users = 0
+        self.users = 0
+
+
+class _SharedResources(object):
+    '''
+    The scene resources of a group of ZincWidgets created with the same
+    shareWidget: one repaint scheduler and scene filter, and the
+    _RegionResources of each region the views show.  The views share a
+    Zinc context, so regions are told apart by their paths.
+    '''
+
+    def __init__(self):
+        self.repaint_scheduler = _RepaintScheduler()
+        self.scene_filter = None
+        self.widget_count = 0
+        self._regions = {}
+
+    def acquireRegion(self, region):
+        '''
+        Get the _RegionResources of region, counting the caller as a user
+        until it gives them back with releaseRegion().
+        '''
+        key = region.getPath()
+        resources = self._regions.get(key)
+        if resources is None:
+            resources = self._regions[key] = _RegionResources(key)
+        resources.users += 1
+        return resources
+
+    def releaseRegion(self, resources):
+        '''
+        Stop using resources, they are dropped when their last user stops.
+        '''
+        resources.users -= 1
+        if resources.users == 0:
+            resources.scene_picker = None
+            if self._regions.get(resources.key) is resources:
+                del self._regions[resources.key]
+# sharedResources end
+
 class ZincWidget(QtOpenGL.QGLWidget):
     
     try:
         # PySide
         graphicsInitialized = QtCore.Signal()
-    except AttributError:
+        hoverPickChanged = QtCore.Signal(object)
+        selectionChanged = QtCore.Signal(object)
+    except AttributeError:
         # PyQt
         graphicsInitialized = QtCore.pyqtSignal()
+        hoverPickChanged = QtCore.pyqtSignal(object)
+        selectionChanged = QtCore.pyqtSignal(object)
     
 
     # init start
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, shareWidget=None):
         '''
         Call the super class init functions, set the  Zinc context and the scene viewer handle to None.
         Initialise other attributes that deal with selection and the rotation of the plane.
+        If shareWidget is given this widget shares its OpenGL context, Zinc context,
+        current region and scene resources, see isSharingResources().
         '''
-        QtOpenGL.QGLWidget.__init__(self, parent)
+        start = _clock()
+        QtOpenGL.QGLWidget.__init__(self, parent, shareWidget)
         # Create a Zinc context from which all other objects can be derived either directly or indirectly.
         self._context = None
+        self._current_region = None
         self._scene_viewer = None
+        if shareWidget is not None:
+            self._shared = shareWidget._shared
+            self._context = shareWidget._context
+            self._current_region = shareWidget._current_region
+        else:
+            self._shared = _SharedResources()
+        self._shared.widget_count += 1
+        self._scene_filter = None
+        # The picker and projection fields are created on first use.
+        self._scene_picker = None
+        self._regionResources = None
+        self._projection_fieldcache = None
+        self._startupTimings = collections.OrderedDict()
+        self._firstFrame = True
+        self._selection_notifier = None
+        self._modelReaders = []
+        self._coordinateStreams = []
+        self._playbackControllers = []
 
         # Selection attributes
         self._nodeSelectMode = True
@@ -73,9 +386,80 @@ class ZincWidget(QtOpenGL.QGLWidget):
         self._elemSelectMode = True
         self._selectionMode = _SelectionMode.NONE
         self._selectionGroup = None
-        self._selectionBox = None
+        self._selectionRectangle = None
         self._selectionAlwaysAdditive = False
-        
+
+        # Repaint requests from the scene viewer are coalesced by the scheduler,
+        # which is shared by all the widgets of a share group.
+        self._repaint_scheduler = self._shared.repaint_scheduler
+        self._repaint_scheduler.watch(self)
+        self._painting = False
+
+        # Compressed input attributes
+        self._compressedInput = False
+        self._pendingMotion = None
+        self._motionInput = None
+
+        # Hover pick attributes
+        self._hoverPick = False
+        self._hoverPosition = None
+        self._hoverPickResult = None
+        self._hoverPickCache = {}
+        self._hoverPickCacheKey = None
+        self._hoverPickTimer = QtCore.QTimer(self)
+        self._hoverPickTimer.setSingleShot(True)
+        self._hoverPickTimer.timeout.connect(self._updateHoverPick)
+        self._sceneRevision = 0
+
+        # Spatial index selection attributes
+        self._selectionIndexes = None
+        self._selectionIndexFieldName = 'coordinates'
+        self._lassoSelection = False
+        self._lassoPoints = None
+
+        # Selection delta attributes
+        self._selectionSnapshot = {}
+        # Changes the widget made since the last delta, anything else is listed.
+        self._selectionOperations = []
+        self._selectionRecording = False
+        self._selectionDeltaInterval = 1.0 / 30.0
+        self._lastSelectionDeltaTime = None
+        self._selectionDeltaTimer = QtCore.QTimer(self)
+        self._selectionDeltaTimer.setSingleShot(True)
+        self._selectionDeltaTimer.timeout.connect(self._emitSelectionDelta)
+
+        # Instrumentation attributes
+        self._instrumentation = None
+        self._instrumentationOverlay = False
+        self._inputEventTime = None
+
+        # Interaction level of detail attributes
+        self._levelOfDetail = None
+        self._levelOfDetailInteracting = False
+        self._levelOfDetailRestoreDelay = 0.25
+        self._levelOfDetailTimer = QtCore.QTimer(self)
+        self._levelOfDetailTimer.setSingleShot(True)
+        self._levelOfDetailTimer.timeout.connect(self._restoreLevelOfDetail)
+
+        # Progressive refinement attributes
+        self._progressiveRefinement = False
+        self._refinementFrameBudget = 0.1
+        self._refinementInputDelay = 0.25
+        self._refinementLevelOfDetail = None
+        self._refining = False
+        # Seconds per estimated region byte of the last full quality build,
+        # and the estimated bytes of a build whose frame is still to be timed.
+        self._refinementSecondsPerByte = None
+        self._refinementBuildBytes = None
+        self._refinementTimer = QtCore.QTimer(self)
+        self._refinementTimer.setSingleShot(True)
+        self._refinementTimer.timeout.connect(self._refineStep)
+
+        # Resource tracking attributes
+        self._resourceTracker = None
+        self._released = False
+
+        self._recordStartupTime('__init__', start)
         # init end
 
     def setContext(self, context):
@@ -92,8 +476,199 @@ class ZincWidget(QtOpenGL.QGLWidget):
         else:
             raise RuntimeError("Zinc context has not been set.")
         
+    def isSharingResources(self, other):
+        '''
+        True if this widget and other were created in the same share group.
+        They then share the OpenGL context, the repaint scheduler, the scene
+        filter and, while they show the same region, the selection group,
+        scene picker and level of detail controller.
+        '''
+        return self._shared is other._shared
+
+    def release(self):
+        '''
+        Tear down everything this widget created: model reads are cancelled,
+        streams, playback controllers, spatial indexes and level of detail
+        controllers are released, timers are stopped, notifier
+        callbacks are cleared and the handles to the scene viewer, picker,
+        selection group and projection fields are dropped.  Resources shared
+        with other widgets are dropped when the last of them is released.
+        The widget draws nothing and ignores input afterwards.  It is also released when used
+        as a context manager.
+        '''
+        if self._released:
+            return
+
+        for reader in self._modelReaders:
+            reader.cancel()
+        for stream in list(self._coordinateStreams):
+            self.removeCoordinateStream(stream)
+        for controller in self._playbackControllers:
+            controller.release()
+        self._playbackControllers = []
+        self.setProgressiveRefinementEnabled(False)
+        self.setInteractionLevelOfDetailEnabled(False)
+        self._releaseSelectionIndexes()
+        for timer in (self._hoverPickTimer, self._selectionDeltaTimer, self._levelOfDetailTimer,
+                      self._refinementTimer):
+            timer.stop()
+        self._repaint_scheduler.cancel(self)
+        if self._selection_notifier is not None:
+            self._selection_notifier.clearCallback()
+            self._selection_notifier = None
+        if self._scene_viewer is not None:
+            self._scene_viewer_notifier.clearCallback()
+            self._scene_viewer_notifier = None
+
+        self._releaseRegionResources()
+        shared = self._shared
+        shared.widget_count -= 1
+        if shared.widget_count == 0:
+            shared.scene_filter = None
+        self._released = True
+        self._scene_picker = None
+        self._projection_fieldcache = None
+        self._window_coords_from = self._global_coords_from = None
+        self._window_coords_to = self._global_coords_to = None
+        self._project_matrix = self._unproject_matrix = None
+        self._selectionGroup = None
+        self._selectionSnapshot = {}
+        self._selectionOperations = []
+        self._hoverPickCache = {}
+        self._hoverPickResult = None
+        self._motionInput = None
+        self._pendingMotion = None
+        self._scene_filter = None
+        self._scene_viewer = None
+        self._current_region = None
+        self._context = None
+
+    def isReleased(self):
+        return self._released
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
     def setCurrentRegion(self, region):
+        '''
+        Set the region whose scene is shown.  After the graphics have been
+        initialised the scene viewer, selection group, picker and
+        projection fields are rebound to the new region.
+        '''
         self._current_region = region
+        if self._scene_viewer is not None:
+            self._bindRegion(region)
+            self.requestRepaint()
+
+    def loadModelStaged(self, filenames, prepare=None, progress=None):
+        '''
+        Read model files into a new staging region and make it the current
+        region once they are all read, returning the region.  The files are
+        read on this thread one at a time and pending events are processed
+        between them, see StagedModelReader.  progress(bytes_read,
+        total_bytes) is called after each file.  prepare(region) is called
+        after reading and before the region is shown, for example to create
+        the graphics.  Raises RuntimeError if a file could not be read or
+        the widget was released while reading.
+        '''
+        reader = StagedModelReader(self.getContext(), filenames, self)
+        if progress is not None:
+            reader.progress.connect(progress)
+        self._modelReaders.append(reader)
+        try:
+            region = reader.read()
+        finally:
+            self._modelReaders.remove(reader)
+        if prepare is not None:
+            region.beginHierarchicalChange()
+            try:
+                prepare(region)
+            finally:
+                region.endHierarchicalChange()
+        self.setCurrentRegion(region)
+        return region
+
+    def createCoordinateStream(self, field_name='coordinates', nodeset_name='nodes', identifiers=None):
+        '''
+        Create a CoordinateStream for the named field at the nodes of the
+        current region, all nodes in iteration order if identifiers is None.
+        A solver pushes a NumPy array of values per step from its own thread.
+        The newest step is written just before each frame is rendered, and
+        a frame is requested whenever a step arrives.
+        '''
+        fieldmodule = self.getCurrentRegion().getFieldmodule()
+        field = fieldmodule.findFieldByName(field_name)
+        if not field.isValid():
+            raise ValueError('No field named %s' % field_name)
+
+        stream = CoordinateStream(fieldmodule.findNodesetByName(nodeset_name), field, identifiers, self)
+        stream.dataArrived.connect(self.requestRepaint)
+        self._coordinateStreams.append(stream)
+        return stream
+
+    def removeCoordinateStream(self, stream):
+        if stream in self._coordinateStreams:
+            stream.dataArrived.disconnect(self.requestRepaint)
+            self._coordinateStreams.remove(stream)
+
+    def _applyCoordinateStreams(self):
+        '''
+        Write the newest step of every stream in one hierarchical change.
+        Spatial indexes that were up to date are given the streamed values
+        rather than evaluating every node at the next query.
+        '''
+        if not any(stream.hasPendingData() for stream in self._coordinateStreams):
+            return
+
+        indexes = []
+        if self._selectionIndexes is not None:
+            indexes = [index for index in self._selectionIndexes.values()
+                       if index is not None and not index.isOutOfDate()]
+        applied = []
+        region = self.getCurrentRegion()
+        region.beginHierarchicalChange()
+        try:
+            for stream in self._coordinateStreams:
+                if stream.apply():
+                    applied.append(stream)
+        finally:
+            region.endHierarchicalChange()
+        for index in indexes:
+            for stream in applied:
+                if stream.getField().getName() == index.getField().getName() and \
+                        stream.getNodeset().getName() == index.getNodeset().getName():
+                    index.updateCoordinates(stream.getIdentifiers(), stream.getValues())
+
+    def createPlaybackController(self, display_field_name, times, source, frames_per_second=30.0,
+                                 cache_bytes=256 * 1024 * 1024, nodeset_name='nodes'):
+        '''
+        Create a PlaybackController that plays times at frames_per_second by
+        writing node values to the named display field of the current
+        region.  source is the name of a time varying field, a field, or a
+        callable source(time) returning an array of node values.  Values
+        for each time are cached within cache_bytes and prefetched ahead of
+        the playhead, so a looping animation only evaluates on its first
+        pass.  A callable source is called on a worker thread while
+        prefetching.  Call play() on the controller to start.
+        '''
+        fieldmodule = self.getCurrentRegion().getFieldmodule()
+        display_field = fieldmodule.findFieldByName(display_field_name)
+        if not display_field.isValid():
+            raise ValueError('No field named %s' % display_field_name)
+        if not callable(source) and not hasattr(source, 'evaluateReal'):
+            source_name = source
+            source = fieldmodule.findFieldByName(source_name)
+            if not source.isValid():
+                raise ValueError('No field named %s' % source_name)
+
+        controller = PlaybackController(fieldmodule.findNodesetByName(nodeset_name), display_field, times,
+                                        source, frames_per_second, cache_bytes, parent=self)
+        self._playbackControllers.append(controller)
+        return controller
 
     def getCurrentRegion(self):
         return self._current_region
@@ -147,8 +722,421 @@ class ZincWidget(QtOpenGL.QGLWidget):
         self._dataSelectMode = False
         self._elemSelectMode = False
         
+    def setCompressedInputEnabled(self, enabled):
+        '''
+        Enable or disable compressed mouse motion.  When enabled only the
+        latest motion position received while a mouse button is held is kept,
+        and it is sent to the scene viewer just before the next paint.
+        '''
+        self._compressedInput = enabled
+        if not enabled and self._scene_viewer is not None:
+            self._flushPendingMotion()
+
+    def isCompressedInputEnabled(self):
+        return self._compressedInput
+
+    def setHoverPickEnabled(self, enabled):
+        '''
+        Enable or disable picking under the cursor while no mouse button is
+        held.  The latest result is available from getHoverPickResult() and
+        hoverPickChanged is emitted when it changes.  Results are cached by
+        cursor position for the current viewport and scene revision.
+        '''
+        self._hoverPick = enabled
+        self.setMouseTracking(enabled)
+        if not enabled:
+            self._hoverPickTimer.stop()
+            self._hoverPosition = None
+            self._hoverPickResult = None
+            self._hoverPickCache = {}
+
+    def isHoverPickEnabled(self):
+        return self._hoverPick
+
+    def getHoverPickResult(self):
+        '''
+        Get the PickResult under the cursor, None if hover picking is off or
+        no pick has been made yet.
+        '''
+        return self._hoverPickResult
+
+    def setSelectionIndexEnabled(self, enabled, coordinate_field_name='coordinates'):
+        '''
+        Enable or disable selecting nodes and datapoints with a CPU spatial
+        index instead of the scene picker.  The index keeps the values of the
+        named coordinate field for the current region and answers queries
+        by projecting them with the current view.  Unlike the scene picker
+        it ignores graphics visibility and child regions.
+        '''
+        self._releaseSelectionIndexes()
+        self._selectionIndexFieldName = coordinate_field_name
+        if enabled:
+            # Indexes are created for each nodeset on first use.
+            self._selectionIndexes = {}
+
+    def isSelectionIndexEnabled(self):
+        return self._selectionIndexes is not None
+
+    def setSelectionLassoEnabled(self, enabled):
+        '''
+        Enable or disable lasso selection.  When enabled a ctrl-drag draws a
+        freehand polygon instead of a rectangle and the nodes or datapoints
+        inside it are selected.  Lasso selection uses the spatial index,
+        which is enabled if needed.  Elements are not lasso selected.
+        '''
+        self._lassoSelection = enabled
+        if enabled and self._selectionIndexes is None:
+            self.setSelectionIndexEnabled(True, self._selectionIndexFieldName)
+
+    def isSelectionLassoEnabled(self):
+        return self._lassoSelection
+
     def getSelectionGroup(self):
         return self._selectionGroup
+
+    def setInstrumentationEnabled(self, enabled, sample_count=1000):
+        '''
+        Enable or disable timing of painting, resizing, mouse handling and
+        picking, and of the latency from an input event to the next frame.
+        Rolling histograms keep the last sample_count durations of each.
+        When disabled the only cost is one attribute check per call.
+        '''
+        if enabled:
+            if self._instrumentation is None:
+                self._instrumentation = Instrumentation(sample_count)
+        else:
+            self._instrumentation = None
+            self._inputEventTime = None
+
+    def isInstrumentationEnabled(self):
+        return self._instrumentation is not None
+
+    def getInstrumentation(self):
+        '''
+        Get the Instrumentation holding the histograms, None if disabled.
+        '''
+        return self._instrumentation
+
+    def getTimingStatistics(self):
+        '''
+        Get a dict mapping measurement names ('paintGL', 'resizeGL',
+        'mousePressEvent', 'mouseMoveEvent', 'mouseReleaseEvent', 'pick',
+        'boxPick', 'inputLatency') to dicts of count, mean, max, p50, p95
+        and p99 in milliseconds.  Empty if instrumentation is disabled.
+        '''
+        if self._instrumentation is None:
+            return {}
+
+        return self._instrumentation.getStatistics()
+
+    def resetTimingStatistics(self):
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+
+    def setInstrumentationOverlayVisible(self, visible):
+        '''
+        Show or hide the timing statistics as text over the scene.
+        '''
+        self._instrumentationOverlay = visible
+        self.requestRepaint()
+
+    def setResourceTrackingEnabled(self, enabled):
+        '''
+        Enable or disable counting the Zinc handles this widget creates,
+        see getHandleCounts().  Only handles created while enabled are
+        counted.  When disabled the only cost is one attribute check per
+        created handle.
+        '''
+        if enabled:
+            if self._resourceTracker is None:
+                self._resourceTracker = ResourceTracker()
+        else:
+            self._resourceTracker = None
+
+    def isResourceTrackingEnabled(self):
+        return self._resourceTracker is not None
+
+    def getResourceTracker(self):
+        return self._resourceTracker
+
+    def getHandleCounts(self):
+        '''
+        Get a dict mapping the type of each Zinc handle created by this
+        widget to a dict with the numbers 'created' and still 'live'.
+        Empty if resource tracking is disabled.
+        '''
+        if self._resourceTracker is None:
+            return {}
+
+        return self._resourceTracker.getHandleCounts()
+
+    def estimateMemory(self):
+        '''
+        Estimate the memory of the nodes, elements and graphics of the
+        current region and its descendants, see
+        resourcetracker.estimateRegionMemory().
+        '''
+        return estimateRegionMemory(self.getCurrentRegion())
+
+    def _track(self, handle):
+        if self._resourceTracker is not None:
+            self._resourceTracker.track(handle)
+
+        return handle
+
+    def setInteractionLevelOfDetailEnabled(self, enabled, target_frame_time=1.0 / 30.0, restore_delay=0.25):
+        '''
+        Enable or disable lowering the level of detail while the view is
+        dragged with a mouse button.  Tessellation and circle divisions are
+        reduced and, at the lower levels, glyph point sets and streamlines
+        are hidden, as far as needed to render within target_frame_time
+        seconds.  Full quality comes back restore_delay seconds after the
+        button is released.  The context must have been set.
+        '''
+        # Only one controller may save and restore the tessellations.
+        self._releaseRefinementLevelOfDetail()
+        if self._levelOfDetail is not None:
+            self._levelOfDetailTimer.stop()
+            self._restoreLevelOfDetail()
+            # The controller came from this view's region resources and is
+            # only released once no view of the region uses it.
+            resources = self._regionResources
+            resources.level_of_detail_users -= 1
+            if resources.level_of_detail_users == 0:
+                resources.level_of_detail = None
+                self._levelOfDetail.release()
+            self._levelOfDetail = None
+        self._levelOfDetailRestoreDelay = restore_delay
+        if enabled:
+            # Views of the same region share one controller so they do not
+            # save and restore each other's reduced tessellations.
+            resources = self._getRegionResources()
+            if resources.level_of_detail is None:
+                resources.level_of_detail = InteractionLevelOfDetail(self.getCurrentRegion(), target_frame_time)
+            else:
+                resources.level_of_detail.setTargetFrameTime(target_frame_time)
+            resources.level_of_detail_users += 1
+            self._levelOfDetail = resources.level_of_detail
+
+    def isInteractionLevelOfDetailEnabled(self):
+        return self._levelOfDetail is not None
+
+    def getInteractionLevelOfDetail(self):
+        '''
+        Get the InteractionLevelOfDetail controlling the levels and holding
+        the measured frame times, None if disabled.
+        '''
+        return self._levelOfDetail
+
+    def _restoreLevelOfDetail(self):
+        if self._levelOfDetail is not None and self._levelOfDetailInteracting:
+            self._levelOfDetailInteracting = False
+            self._levelOfDetail.endInteraction()
+
+    def setProgressiveRefinementEnabled(self, enabled, frame_budget=0.1, input_delay=0.25):
+        '''
+        Enable or disable progressive rendering of newly shown scenes.  When
+        the widget is first shown or the current region changes, the
+        graphics of the scene have to be built.  If that is expected to take
+        longer than frame_budget seconds, the first frame is drawn at the
+        coarsest level of detail and full quality is built on a later event
+        loop pass.  The build time is predicted from the estimated memory of
+        the region tree, see estimateMemory(), and the time per byte of the
+        last full quality build, so the first scene shown is always drawn
+        coarse first.  Refinement waits input_delay
+        seconds after every mouse event so it never delays the response to
+        input.  Redrawing a scene whose graphics exist, for example after
+        viewAll(), is never made coarse.  The interaction level of detail
+        controller is used when that is enabled.
+        '''
+        self._stopRefinement()
+        self._releaseRefinementLevelOfDetail()
+        self._progressiveRefinement = enabled
+        self._refinementFrameBudget = frame_budget
+        self._refinementInputDelay = input_delay
+        self._refinementBuildBytes = None
+
+    def isProgressiveRefinementEnabled(self):
+        return self._progressiveRefinement
+
+    def isRefining(self):
+        '''
+        True while a progressive refinement has not reached full quality.
+        '''
+        return self._refining
+
+    def _getRefinementLevelOfDetail(self):
+        if self._levelOfDetail is not None:
+            return self._levelOfDetail
+        if self._refinementLevelOfDetail is None:
+            self._refinementLevelOfDetail = InteractionLevelOfDetail(self.getCurrentRegion())
+
+        return self._refinementLevelOfDetail
+
+    def _releaseRefinementLevelOfDetail(self):
+        if self._refinementLevelOfDetail is not None:
+            self._refinementLevelOfDetail.release()
+            self._refinementLevelOfDetail = None
+
+    def _startRefinement(self):
+        '''
+        Draw the scene just bound at the coarsest level and refine it on a
+        later pass, unless its graphics are predicted to build within the
+        frame budget.  Nothing is changed for an empty scene, during an
+        interaction, or if another view of the share group already shows
+        the region and so has built its graphics.
+        '''
+        self._refinementBuildBytes = None
+        if not self._progressiveRefinement or self._getRegionResources().users > 1:
+            return
+
+        level_of_detail = self._getRefinementLevelOfDetail()
+        if level_of_detail.isInteracting() or not level_of_detail.hasGraphics():
+            return
+
+        # The estimated memory of the nodes, elements and graphics stands in
+        # for the amount of graphics to build.
+        build_bytes = sum(estimate['bytes'] for estimate in estimateRegionMemory(self.getCurrentRegion()).values())
+        # The first full quality frame is timed to predict later builds.
+        self._refinementBuildBytes = build_bytes
+        if self._refinementSecondsPerByte is not None and \
+                build_bytes * self._refinementSecondsPerByte <= self._refinementFrameBudget:
+            return
+
+        level_of_detail.setLevel(level_of_detail.getLevelCount() - 1)
+        self._refining = True
+        self.requestRepaint()
+
+    def _refineStep(self):
+        '''
+        Build full quality.  An interaction in progress takes over and
+        restores full quality when it ends.
+        '''
+        if not self._refining:
+            return
+
+        self._refining = False
+        level_of_detail = self._getRefinementLevelOfDetail()
+        if level_of_detail.isInteracting():
+            return
+
+        level_of_detail.setLevel(levelofdetail.LEVEL_FULL)
+        self.requestRepaint()
+
+    def _recordBuildTime(self, seconds):
+        '''
+        Learn the time per estimated region byte from the first full
+        quality frame of a newly shown scene.
+        '''
+        if self._refinementBuildBytes is None or self._refining:
+            return
+        if self._getRefinementLevelOfDetail().getLevel() != levelofdetail.LEVEL_FULL:
+            return
+
+        if self._refinementBuildBytes > 0:
+            self._refinementSecondsPerByte = seconds / self._refinementBuildBytes
+        self._refinementBuildBytes = None
+
+    def _deferRefinement(self):
+        if self._refining:
+            self._refinementTimer.start(int(self._refinementInputDelay * 1000.0))
+
+    def _stopRefinement(self):
+        '''
+        Stop refining and put back full quality unless an interaction
+        holds a reduced level.
+        '''
+        self._refinementTimer.stop()
+        if not self._refining:
+            return
+
+        self._refining = False
+        level_of_detail = self._getRefinementLevelOfDetail()
+        if not level_of_detail.isInteracting():
+            level_of_detail.setLevel(levelofdetail.LEVEL_FULL)
+
+    def setSelectionChangedMaximumRate(self, maximum_rate):
+        '''
+        Set the maximum number of selectionChanged signals per second, None
+        or 0 emits once per event loop pass after a selection change.
+        '''
+        if maximum_rate:
+            self._selectionDeltaInterval = 1.0 / maximum_rate
+        else:
+            self._selectionDeltaInterval = 0.0
+
+    def selectionToArrays(self, coordinate_field_name='coordinates'):
+        '''
+        Get the identifiers and coordinates of everything selected in the
+        current region in one call.  Returns a dict mapping the nodeset and
+        mesh names with a selection to (identifiers, coordinates) NumPy
+        arrays.  Element coordinates are evaluated at the element centre.
+        Coordinates are NaN where the field cannot be evaluated.
+        '''
+        fieldmodule = self._selectionGroup.getFieldmodule()
+        field = fieldmodule.findFieldByName(coordinate_field_name)
+        component_count = field.getNumberOfComponents() if field.isValid() else 3
+        fieldcache = self._track(fieldmodule.createFieldcache())
+        arrays = {}
+        for name, iterator in self._selectionIterators():
+            identifiers = []
+            coordinates = []
+            item = iterator.next()
+            while item.isValid():
+                identifiers.append(item.getIdentifier())
+                if name in _selection_nodeset_names:
+                    fieldcache.setNode(item)
+                else:
+                    dimension = item.getDimension()
+                    if item.getShapeType() in [Element.SHAPE_TYPE_TRIANGLE, Element.SHAPE_TYPE_TETRAHEDRON]:
+                        xi = [1.0 / (dimension + 1)] * dimension
+                    else:
+                        xi = [0.5] * dimension
+                    fieldcache.setMeshLocation(item, xi)
+                values = None
+                if field.isValid():
+                    result, values = field.evaluateReal(fieldcache, component_count)
+                    if result != status.OK:
+                        values = None
+                if values is None:
+                    values = [float('nan')] * component_count
+                coordinates.append(values)
+                item = iterator.next()
+            if identifiers:
+                arrays[name] = (numpy.array(identifiers, dtype=numpy.int64),
+                                numpy.array(coordinates, dtype=numpy.float64).reshape(-1, component_count))
+
+        return arrays
+
+    def _selectionIterators(self, names=None):
+        '''
+        Yield (name, iterator) for the node and element groups of the
+        selection group, only for the given nodeset and mesh names if any.
+        '''
+        fieldmodule = self._selectionGroup.getFieldmodule()
+        for name in _selection_nodeset_names:
+            if names is not None and name not in names:
+                continue
+            nodeset = fieldmodule.findNodesetByName(name)
+            nodegroup = self._selectionGroup.getFieldNodeGroup(nodeset)
+            if nodegroup.isValid():
+                yield name, nodegroup.getNodesetGroup().createNodeiterator()
+        for dimension, name in zip([3, 2, 1], _selection_mesh_names):
+            if names is not None and name not in names:
+                continue
+            mesh = fieldmodule.findMeshByDimension(dimension)
+            elementgroup = self._selectionGroup.getFieldElementGroup(mesh)
+            if elementgroup.isValid():
+                yield name, elementgroup.getMeshGroup().createElementiterator()
+
+    def _selectedIdentifiers(self, names=None):
+        selected = {}
+        for name, iterator in self._selectionIterators(names):
+            identifiers = _iteratorIdentifiers(iterator)
+            if len(identifiers):
+                selected[name] = identifiers
+
+        return selected
         
     def setProjectionMode(self, mode):
         '''
@@ -164,68 +1152,35 @@ class ZincWidget(QtOpenGL.QGLWidget):
     def initializeGL(self):
         '''
         Initialise the Zinc scene for drawing the axis glyph at a point.  
+        The scene picker and the projection fields are created on first use.
         '''
-        # Get the scene viewer module.
-        scene_viewer_module = self._context.getSceneviewermodule()
-
-        # From the scene viewer module we can create a scene viewer, we set up the
-        # scene viewer to have the same OpenGL properties as the QGLWidget.
-        self._scene_viewer = scene_viewer_module.createSceneviewer(Sceneviewer.BUFFERING_MODE_DOUBLE,
-                                                                   Sceneviewer.STEREO_MODE_DEFAULT)
-        # Create a filter for visibility flags which will allow us to see our graphic.
-        filter_module = self._context.getScenefiltermodule()
-        # By default graphics are created with their visibility flags set to on (or true).
-        graphics_filter = filter_module.createScenefilterVisibilityFlags()
-
-        # Set the graphics filter for the scene viewer otherwise nothing will be visible.
-        self._scene_viewer.setScenefilter(graphics_filter)
+        start = _clock()
         region = self.getCurrentRegion()
         scene = region.getScene()
-        fieldmodule = region.getFieldmodule()
-        self._selectionGroup = fieldmodule.createFieldGroup()
-        scene.setSelectionField(self._selectionGroup)
-        self._scene_picker = scene.createScenepicker()
-        # set the filter to allow only picking of visible graphics
-        self._scene_picker.setScenefilter(graphics_filter) 
-        self._scene_viewer.setScene(scene)
-
-        # Using a really cheap workaround for creating a rubber band for selection.
-        # This will create strange visual artifacts when using two scene viewers looking at
-        # the same scene.  Waiting on a proper solution in the API.
+        # Create a scene viewer with the same OpenGL properties as the QGLWidget.
+        # Widgets in a share group use one scene filter.
+        self._scene_viewer, self._scene_filter = createSceneviewer(self._context, scene,
+                                                                   Sceneviewer.BUFFERING_MODE_DOUBLE,
+                                                                   self._shared.scene_filter)
+        self._track(self._scene_viewer)
+        if self._shared.scene_filter is None:
+            self._track(self._scene_filter)
+        self._shared.scene_filter = self._scene_filter
+        start = self._recordStartupTime('createSceneviewer', start)
+        self._bindRegion(region)
+        start = self._recordStartupTime('bindRegion', start)
+
+        # The selection rubber band is drawn as an overlay in paintGL so the
+        # glyphs are only defined for the convenience of applications.
         self.defineStandardGlyphs()
-        self._selectionBox = scene.createGraphicsPoints()
-        self._selectionBox.setScenecoordinatesystem(SCENECOORDINATESYSTEM_WINDOW_PIXEL_TOP_LEFT)
-        attributes = self._selectionBox.getGraphicspointattributes()
-        attributes.setGlyphShapeType(Glyph.SHAPE_TYPE_CUBE_WIREFRAME)
-        attributes.setBaseSize([10, 10, 0.9999])
-        attributes.setGlyphOffset([1, -1, 0])
-        self._selectionBox_setBaseSize = attributes.setBaseSize
-        self._selectionBox_setGlyphOffset = attributes.setGlyphOffset
-
-        self._selectionBox.setVisibilityFlag(False)
-
-        # Set up unproject pipeline
-        self._window_coords_from = fieldmodule.createFieldConstant([0, 0, 0])
-        self._global_coords_from = fieldmodule.createFieldConstant([0, 0, 0])
-        unproject = fieldmodule.createFieldSceneviewerProjection(self._scene_viewer,
-                                                                 SCENECOORDINATESYSTEM_WINDOW_PIXEL_TOP_LEFT,
-                                                                 SCENECOORDINATESYSTEM_WORLD)
-        project = fieldmodule.createFieldSceneviewerProjection(self._scene_viewer,
-                                                               SCENECOORDINATESYSTEM_WORLD, 
-                                                               SCENECOORDINATESYSTEM_WINDOW_PIXEL_TOP_LEFT)
-
-#         unproject_t = fieldmodule.createFieldTranspose(4, unproject)
-        self._global_coords_to = fieldmodule.createFieldProjection(self._window_coords_from, unproject)
-        self._window_coords_to = fieldmodule.createFieldProjection(self._global_coords_from, project)
+        start = self._recordStartupTime('defineStandardGlyphs', start)
 
         self._scene_viewer.viewAll()
+        start = self._recordStartupTime('viewAll', start)
 
-#  Not really applicable to us yet.
-#         self._selection_notifier = scene.createSelectionnotifier()
-#         self._selection_notifier.setCallback(self._zincSelectionEvent)
-
-        self._scene_viewer_notifier = self._scene_viewer.createSceneviewernotifier()
+        self._scene_viewer_notifier = self._track(self._scene_viewer.createSceneviewernotifier())
         self._scene_viewer_notifier.setCallback(self._zincSceneviewerEvent)
+        self._recordStartupTime('notifiers', start)
         
         # Notify the user that the graphics are ready to use.
         # This must be called after initializeGL has exited so use a
@@ -235,6 +1190,60 @@ class ZincWidget(QtOpenGL.QGLWidget):
 
         # initializeGL end
 
+    def _bindRegion(self, region):
+        '''
+        Show the scene of region and move the selection group, selection
+        notifier and spatial indexes to it.  The selection group already
+        set on the scene, for example by another view, is reused.  The picker and projection
+        fields are recreated for it on first use.  The previous selection is
+        reported as removed by the next selectionChanged.  Coordinate
+        streams and playback controllers are removed.  With progressive
+        refinement the new scene may first be drawn coarsely.
+        '''
+        self._stopRefinement()
+        self._releaseRefinementLevelOfDetail()
+        scene = region.getScene()
+        self._scene_viewer.setScene(scene)
+        if self._selection_notifier is not None:
+            self._selection_notifier.clearCallback()
+        # Views of the same scene share its selection group.
+        self._selectionGroup = scene.getSelectionField().castGroup()
+        if not self._selectionGroup.isValid():
+            self._selectionGroup = self._track(region.getFieldmodule().createFieldGroup())
+            scene.setSelectionField(self._selectionGroup)
+        # Selection notifications arrive once per hierarchical change block
+        # and are turned into throttled selectionChanged signals.
+        self._selection_notifier = self._track(scene.createSelectionnotifier())
+        self._selection_notifier.setCallback(self._zincSelectionEvent)
+
+        self._scene_picker = None
+        self._projection_fieldcache = None
+        self._project_matrix = None
+        self._unproject_matrix = None
+        self._hoverPickCache = {}
+        self._hoverPickResult = None
+        self._sceneRevision += 1
+        if self._selectionIndexes is not None:
+            self.setSelectionIndexEnabled(True, self._selectionIndexFieldName)
+        target_frame_time = None
+        if self._levelOfDetail is not None:
+            target_frame_time = self._levelOfDetail.getTargetFrameTime()
+            self.setInteractionLevelOfDetailEnabled(False)
+        self._releaseRegionResources()
+        self._getRegionResources()
+        if target_frame_time is not None:
+            self.setInteractionLevelOfDetailEnabled(True, target_frame_time, self._levelOfDetailRestoreDelay)
+        # Streams and playback write to fields of the previous region.
+        for stream in list(self._coordinateStreams):
+            self.removeCoordinateStream(stream)
+        for controller in self._playbackControllers:
+            controller.release()
+        self._playbackControllers = []
+        self._selectionOperations = []
+        if self._selectionSnapshot:
+            self._zincSelectionEvent(None)
+        self._startRefinement()
+
     def getLookAtParameters(self):
         '''
         Get the lookat parameters of the scene viewer.  Returns a tuple
@@ -242,7 +1251,7 @@ class ZincWidget(QtOpenGL.QGLWidget):
         is returned.
         '''
         result, lookat, eye, up = self._scene_viewer.getLookatParameters()
-        if result == OK:
+        if result == status.OK:
             return (lookat, eye, up)
 
         return None
@@ -252,12 +1261,12 @@ class ZincWidget(QtOpenGL.QGLWidget):
         project the given point in global coordinates into window coordinates
         with the origin at the window's top left pixel.
         '''
+        self._ensureProjectionFields()
         in_coords = [x, y, z]
-        fieldmodule = self._global_coords_from.getFieldmodule()
-        fieldcache = fieldmodule.createFieldcache()
+        fieldcache = self._projection_fieldcache
         self._global_coords_from.assignReal(fieldcache, in_coords)
         result, out_coords = self._window_coords_to.evaluateReal(fieldcache, 3)
-        if result == OK:
+        if result == status.OK:
             return out_coords  # [out_coords[0] / out_coords[3], out_coords[1] / out_coords[3], out_coords[2] / out_coords[3]]
 
         return None
@@ -269,22 +1278,290 @@ class ZincWidget(QtOpenGL.QGLWidget):
         is a depth which is mapped so that 0 is on the near plane and 1 is 
         on the far plane.
         '''
+        self._ensureProjectionFields()
         in_coords = [x, y, z]
-        fieldmodule = self._window_coords_from.getFieldmodule()
-        fieldcache = fieldmodule.createFieldcache()
+        fieldcache = self._projection_fieldcache
         self._window_coords_from.assignReal(fieldcache, in_coords)
         result, out_coords = self._global_coords_to.evaluateReal(fieldcache, 3)
-        if result == OK:
+        if result == status.OK:
             return out_coords  # [out_coords[0] / out_coords[3], out_coords[1] / out_coords[3], out_coords[2] / out_coords[3]]
 
         return None
 
+    def projectPoints(self, points):
+        '''
+        project an (N, 3) array of points in global coordinates into window
+        coordinates with the origin at the window's top left pixel.  The
+        projection matrix is read from the scene viewer once for the whole
+        batch.  Returns an (N, 3) array or None if the matrix could not be
+        evaluated.
+        '''
+        self._ensureProjectionFields()
+        return self._transformPoints(self._project_matrix, points)
+
+    def unprojectPoints(self, points):
+        '''
+        unproject an (N, 3) array of points in window coordinates, where the
+        origin is at the window's top left pixel, into global coordinates.
+        The z values are depths as for unproject().  Returns an (N, 3) array
+        or None if the matrix could not be evaluated.
+        '''
+        self._ensureProjectionFields()
+        return self._transformPoints(self._unproject_matrix, points)
+
+    def _transformPoints(self, matrix_field, points):
+        '''
+        Evaluate the 4x4 scene viewer projection matrix_field and apply it
+        with perspective division to every row of points.
+        '''
+        matrix = self._evaluateMatrix(matrix_field)
+        if matrix is None:
+            return None
+
+        return transformPoints(matrix, points)
+
+    def _evaluateMatrix(self, matrix_field):
+        '''
+        Evaluate a 4x4 scene viewer projection field into a NumPy array,
+        None if it cannot be evaluated.
+        '''
+        result, values = matrix_field.evaluateReal(self._projection_fieldcache, 16)
+        if result != status.OK:
+            return None
+
+        # Zinc matrices are stored row major.
+        return numpy.array(values, dtype=numpy.float64).reshape(4, 4)
+
+    def _getScenePicker(self):
+        '''
+        Get the scene picker, creating it on first use.  It only picks
+        graphics that pass the scene viewer's filter.
+        '''
+        if self._scene_picker is None:
+            start = _clock()
+            resources = self._getRegionResources()
+            if resources.scene_picker is None:
+                # The scene viewer is given with each pick so one picker
+                # serves all the views of the region in a share group.
+                resources.scene_picker = self._track(self.getCurrentRegion().getScene().createScenepicker())
+                resources.scene_picker.setScenefilter(self._scene_filter)
+            self._scene_picker = resources.scene_picker
+            self._recordStartupTime('scenePicker', start)
+
+        return self._scene_picker
+
+    def _getRegionResources(self):
+        '''
+        Get the resources shared with the views of the current region,
+        holding them until the region changes or the widget is released.
+        '''
+        if self._regionResources is None:
+            self._regionResources = self._shared.acquireRegion(self.getCurrentRegion())
+
+        return self._regionResources
+
+    def _releaseRegionResources(self):
+        if self._regionResources is not None:
+            self._shared.releaseRegion(self._regionResources)
+            self._regionResources = None
+        self._scene_picker = None
+
+    def _ensureProjectionFields(self):
+        '''
+        Create the project and unproject field pipelines on first use.
+        '''
+        if self._projection_fieldcache is not None:
+            return
+
+        start = _clock()
+        fieldmodule = self.getCurrentRegion().getFieldmodule()
+        fieldmodule.beginChange()
+        track = self._track
+        self._window_coords_from = track(fieldmodule.createFieldConstant([0, 0, 0]))
+        self._global_coords_from = track(fieldmodule.createFieldConstant([0, 0, 0]))
+        window = scenecoordinatesystem.SCENECOORDINATESYSTEM_WINDOW_PIXEL_TOP_LEFT
+        world = scenecoordinatesystem.SCENECOORDINATESYSTEM_WORLD
+        unproject = track(fieldmodule.createFieldSceneviewerProjection(self._scene_viewer, window, world))
+        project = track(fieldmodule.createFieldSceneviewerProjection(self._scene_viewer, world, window))
+        self._global_coords_to = track(fieldmodule.createFieldProjection(self._window_coords_from, unproject))
+        self._window_coords_to = track(fieldmodule.createFieldProjection(self._global_coords_from, project))
+        fieldmodule.endChange()
+        # Keep the matrices for the batch projections and a field cache that
+        # is reused by every projection instead of creating one per call.
+        self._project_matrix = project
+        self._unproject_matrix = unproject
+        self._projection_fieldcache = self._track(fieldmodule.createFieldcache())
+        self._recordStartupTime('projectionFields', start)
+
+    def _recordStartupTime(self, name, start):
+        '''
+        Record the time since start as a step of the startup breakdown and
+        return the current time for timing the next step.
+        '''
+        now = _clock()
+        self._startupTimings[name] = now - start
+        return now
+
+    def getStartupTimings(self):
+        '''
+        Get an ordered dict breaking down the startup time of this widget in
+        milliseconds.  It holds the constructor, each step of initializeGL,
+        the first frame and the scene picker and projection fields when they
+        have been created on first use.  Entries named 'import <module>' are
+        the deferred imports of the process so far, only the first widget
+        pays for them.
+        '''
+        timings = collections.OrderedDict()
+        for module_name, seconds in getImportTimings().items():
+            timings['import ' + module_name] = seconds * 1000.0
+        for name, seconds in self._startupTimings.items():
+            timings[name] = seconds * 1000.0
+
+        return timings
+
+    def selectNodesInRectangle(self, x_min, y_min, x_max, y_max, additive=False):
+        '''
+        Select the nodes and datapoints, according to the selection mode,
+        whose window coordinates lie in the rectangle.  The current selection
+        is cleared first unless additive is True.  Uses the spatial index.
+        '''
+        self._selectIndexedNodes(lambda index, matrix: index.findInRectangle(matrix, x_min, y_min, x_max, y_max),
+                                 additive)
+
+    def selectNodesInPolygon(self, polygon, additive=False):
+        '''
+        Select the nodes and datapoints inside polygon, a sequence of (x, y)
+        window positions.  The current selection is cleared first unless
+        additive is True.  Uses the spatial index.
+        '''
+        self._selectIndexedNodes(lambda index, matrix: index.findInPolygon(matrix, polygon), additive)
+
+    def selectNodesInRadius(self, x, y, radius, additive=False):
+        '''
+        Select the nodes and datapoints within radius pixels of the window
+        position x, y.  The current selection is cleared first unless
+        additive is True.  Uses the spatial index.
+        '''
+        self._selectIndexedNodes(lambda index, matrix: index.findInRadius(matrix, x, y, radius), additive)
+
+    def _selectIndexedNodes(self, query, additive):
+        if self._selectionIndexes is None:
+            self.setSelectionIndexEnabled(True, self._selectionIndexFieldName)
+
+        region = self.getCurrentRegion()
+        self._selectionRecording = True
+        region.beginHierarchicalChange()
+        try:
+            if not additive:
+                self._clearSelection()
+            self._addIndexedNodesToSelection(query)
+        finally:
+            region.endHierarchicalChange()
+            self._selectionRecording = False
+
+    @_timed('boxPick')
+    def _addRectangleToSelection(self, x_min, y_min, x_max, y_max):
+        '''
+        Add the nodes, datapoints and elements in the window rectangle to the
+        selection group according to the selection mode.  Nodes come from
+        the spatial index when it is enabled, otherwise from the scene picker.
+        '''
+        picker = self._getScenePicker()
+        picker.setSceneviewerRectangle(self._scene_viewer,
+                                       scenecoordinatesystem.SCENECOORDINATESYSTEM_LOCAL,
+                                       x_min, y_min, x_max, y_max)
+        if self._nodeSelectMode or self._dataSelectMode:
+            if self._selectionIndexes is not None:
+                self._addIndexedNodesToSelection(
+                    lambda index, matrix: index.findInRectangle(matrix, x_min, y_min, x_max, y_max))
+            else:
+                picker.addPickedNodesToFieldGroup(self._selectionGroup)
+                self._recordSelection(_SelectionOperation.RELIST, _selection_nodeset_names)
+        if self._elemSelectMode:
+            picker.addPickedElementsToFieldGroup(self._selectionGroup)
+            self._recordSelection(_SelectionOperation.RELIST, _selection_mesh_names)
+
+    def _addIndexedNodesToSelection(self, query):
+        '''
+        Add the identifiers returned by query(index, matrix) for every
+        selectable nodeset to the selection group.
+        '''
+        self._ensureProjectionFields()
+        matrix = self._evaluateMatrix(self._project_matrix)
+        if matrix is None:
+            return
+
+        nodeset_names = []
+        if self._nodeSelectMode:
+            nodeset_names.append('nodes')
+        if self._dataSelectMode:
+            nodeset_names.append('datapoints')
+        for nodeset_name in nodeset_names:
+            index = self._getSelectionIndex(nodeset_name)
+            if index is not None:
+                self._addNodesToSelection(index.getNodeset(), query(index, matrix))
+
+    def _addNodesToSelection(self, nodeset, identifiers):
+        if len(identifiers) == 0:
+            return
+
+        nodegroup = self._selectionGroup.getFieldNodeGroup(nodeset)
+        if not nodegroup.isValid():
+            nodegroup = self._track(self._selectionGroup.createFieldNodeGroup(nodeset))
+
+        group = nodegroup.getNodesetGroup()
+        find_node = nodeset.findNodeByIdentifier
+        add_node = group.addNode
+        for identifier in identifiers.tolist():
+            add_node(find_node(identifier))
+        self._recordSelection(_SelectionOperation.ADD, nodeset.getName(), identifiers)
+
+    def _clearSelection(self):
+        self._selectionGroup.clear()
+        self._recordSelection(_SelectionOperation.CLEAR)
+
+    def _recordSelection(self, operation, name=None, identifiers=None):
+        '''
+        Note a change the widget made to the selection group so the next
+        selection delta is built from it instead of listing the selection.
+        name is a nodeset or mesh name, or for _SelectionOperation.RELIST a list of
+        them whose selection must be listed.
+        '''
+        self._selectionOperations.append((operation, name, identifiers))
+
+    def _getSelectionIndex(self, nodeset_name):
+        '''
+        Get the spatial index for the named nodeset of the current region,
+        creating it on first use.  None if the nodeset or the coordinate
+        field does not exist.
+        '''
+        if nodeset_name not in self._selectionIndexes:
+            fieldmodule = self.getCurrentRegion().getFieldmodule()
+            nodeset = fieldmodule.findNodesetByName(nodeset_name)
+            field = fieldmodule.findFieldByName(self._selectionIndexFieldName)
+            index = None
+            if nodeset.isValid() and field.isValid():
+                index = self._track(NodeSpatialIndex(nodeset, field))
+            self._selectionIndexes[nodeset_name] = index
+
+        return self._selectionIndexes[nodeset_name]
+
+    def _releaseSelectionIndexes(self):
+        if self._selectionIndexes is not None:
+            for index in self._selectionIndexes.values():
+                if index is not None:
+                    index.release()
+        self._selectionIndexes = None
+
     def defineStandardGlyphs(self):
         '''
-        Helper method to define the standard glyphs.
+        Helper method to define the standard glyphs.  Nothing is done if
+        they have already been defined in this context, for example by
+        another widget.
         '''
         glyph_module = self._context.getGlyphmodule()
-        glyph_module.defineStandardGlyphs()
+        if not glyph_module.findGlyphByName('sphere').isValid():
+            glyph_module.defineStandardGlyphs()
 
     def defineStandardMaterials(self):
         '''
@@ -297,45 +1574,26 @@ class ZincWidget(QtOpenGL.QGLWidget):
         '''
         Create finite element from a template
         '''
-        # Find a special node set named 'nodes'
-        nodeset = field_module.findNodesetByName('nodes')
-        node_template = nodeset.createNodetemplate()
-
-        # Set the finite element coordinate field for the nodes to use
-        node_template.defineField(finite_element_field)
-        field_cache = field_module.createFieldcache()
-
-        node_identifiers = []
-        # Create eight nodes to define a cube finite element
-        for node_coordinate in node_coordinate_set:
-            node = nodeset.createNode(-1, node_template)
-            node_identifiers.append(node.getIdentifier())
-            # Set the node coordinates, first set the field cache to use the current node
-            field_cache.setNode(node)
-            # Pass in floats as an array
-            finite_element_field.assignReal(field_cache, node_coordinate)
-
-        # Use a 3D mesh to to create the 3D finite element.
-        mesh = field_module.findMeshByDimension(3)
-        element_template = mesh.createElementtemplate()
-        element_template.setElementShapeType(Element.SHAPE_TYPE_CUBE)
-        element_node_count = 8
-        element_template.setNumberOfNodes(element_node_count)
-        # Specify the dimension and the interpolation function for the element basis function
-        linear_basis = field_module.createElementbasis(3, Elementbasis.FUNCTION_TYPE_LINEAR_LAGRANGE)
-        # the indicies of the nodes in the node template we want to use.
-        node_indexes = [1, 2, 3, 4, 5, 6, 7, 8]
-
-
-        # Define a nodally interpolated element field or field component in the
-        # element_template
-        element_template.defineFieldSimpleNodal(finite_element_field, -1, linear_basis, node_indexes)
-
-        for i, node_identifier in enumerate(node_identifiers):
-            node = nodeset.findNodeByIdentifier(node_identifier)
-            element_template.setNode(i + 1, node)
-
-        mesh.defineElement(-1, element_template)
+        # Create eight nodes to define a cube finite element and one element
+        # that uses them in order.
+        builder = meshbuilder.MeshBuilder(field_module, finite_element_field,
+                                          meshbuilder.ELEMENT_SHAPE_HEXAHEDRON, self._resourceTracker)
+        builder.build(node_coordinate_set, [list(range(8))])
+
+    def createFiniteElements(self, field_module, finite_element_field, node_coordinates, connectivity,
+                             element_shape=None):
+        '''
+        Create many finite elements at once from an (N, 3) array of node
+        coordinates and an (M, nodes per element) array of zero based
+        connectivity.  The element shape is one of the meshbuilder
+        ELEMENT_SHAPE_* names, hexahedron if None.  Returns the
+        MeshBuildStatistics which report the throughput in elements per
+        second.
+        '''
+        if element_shape is None:
+            element_shape = meshbuilder.ELEMENT_SHAPE_HEXAHEDRON
+        return meshbuilder.createFiniteElements(field_module, finite_element_field, node_coordinates,
+                                                connectivity, element_shape, self._resourceTracker)
 
     def viewAll(self):
         '''
@@ -345,6 +1603,7 @@ class ZincWidget(QtOpenGL.QGLWidget):
         self._scene_viewer.viewAll()
 
     # paintGL start
+    @_timed('paintGL')
     def paintGL(self):
         '''
         Render the scene for this scene viewer.  The QGLWidget has already set up the
@@ -352,30 +1611,274 @@ class ZincWidget(QtOpenGL.QGLWidget):
         will clear the background so any OpenGL drawing of your own needs to go after this
         API call.
         '''
-        self._scene_viewer.renderScene()
+        if self._released:
+            return
+
+        start = _clock()
+        self._painting = True
+        level_changed = False
+        try:
+            self._flushPendingMotion()
+            # New simulation steps are part of this frame, the repaint their
+            # change notification asks for is not needed.
+            self._applyCoordinateStreams()
+            self._scene_viewer.renderScene()
+            level_of_detail = self._levelOfDetail or self._refinementLevelOfDetail
+            if level_of_detail is not None:
+                level_changed = level_of_detail.recordFrameTime(_clock() - start)
+            if self._refinementBuildBytes is not None:
+                self._recordBuildTime(_clock() - start)
+            self._paintOverlay()
+        finally:
+            self._painting = False
+        if level_changed:
+            # Changes made while painting do not request a repaint themselves.
+            self.requestRepaint()
+        if self._refining and not self._refinementTimer.isActive():
+            # Refine on a later pass so queued input is handled first.
+            self._refinementTimer.start(0)
+        if self._firstFrame:
+            self._firstFrame = False
+            self._recordStartupTime('firstFrame', start)
+        if self._inputEventTime is not None:
+            if self._instrumentation is not None:
+                self._instrumentation.record('inputLatency', _clock() - self._inputEventTime)
+            self._inputEventTime = None
         # paintGL end
 
+    def _paintOverlay(self):
+        '''
+        Draw the selection rubber band over the rendered scene.  Nothing in
+        the Zinc scene is changed so dragging costs the same for any model.
+        '''
+        show_timing = self._instrumentationOverlay and self._instrumentation is not None
+        if self._selectionRectangle is None and self._lassoPoints is None and not show_timing:
+            return
+
+        painter = QtGui.QPainter(self)
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255), 1, QtCore.Qt.DashLine))
+        if self._lassoPoints is not None:
+            points = [QtCore.QPoint(x, y) for x, y in self._lassoPoints]
+            painter.drawPolygon(QtGui.QPolygon(points))
+        elif self._selectionRectangle is not None:
+            x0, y0, x1, y1 = self._selectionRectangle
+            painter.drawRect(QtCore.QRect(min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0)))
+        if show_timing:
+            painter.setPen(QtGui.QColor(255, 255, 0))
+            for i, line in enumerate(self._instrumentation.formatLines()):
+                painter.drawText(8, 16 + 14 * i, line)
+        painter.end()
+
+    @_timed('pick')
+    def pickAt(self, x, y):
+        '''
+        Pick at the given window position, with the origin at the window's top
+        left pixel, and return a PickResult.  The nearest graphics is fetched
+        once and only the node or the element matching its domain is queried.
+        '''
+        picker = self._getScenePicker()
+        picker.setSceneviewerRectangle(self._scene_viewer,
+                                       scenecoordinatesystem.SCENECOORDINATESYSTEM_LOCAL,
+                                       x - 0.5, y - 0.5, x + 0.5, y + 0.5)
+        graphics = picker.getNearestGraphics()
+        if not graphics.isValid():
+            return PickResult(graphics)
+
+        domain_type = graphics.getFieldDomainType()
+        node = None
+        element = None
+        if domain_type in [Field.DOMAIN_TYPE_NODES, Field.DOMAIN_TYPE_DATAPOINTS]:
+            node = picker.getNearestNode()
+        elif domain_type in _meshDomainTypes():
+            element = picker.getNearestElement()
+
+        return PickResult(graphics, domain_type, node, element)
+
+    def _updateHoverPick(self):
+        '''
+        Pick at the latest hover position, reusing a cached result when the
+        cursor, viewport and scene are unchanged since it was made.
+        '''
+        if self._hoverPosition is None:
+            return
+
+        cache_key = (self._sceneRevision, self.width(), self.height())
+        if cache_key != self._hoverPickCacheKey or len(self._hoverPickCache) > 1024:
+            self._hoverPickCache = {}
+            self._hoverPickCacheKey = cache_key
+
+        result = self._hoverPickCache.get(self._hoverPosition)
+        if result is None:
+            result = self.pickAt(*self._hoverPosition)
+            self._hoverPickCache[self._hoverPosition] = result
+
+        previous = self._hoverPickResult
+        self._hoverPickResult = result
+        if previous is None or previous.getKey() != result.getKey():
+            self.hoverPickChanged.emit(result)
+
+    def _flushPendingMotion(self):
+        '''
+        Send the latest compressed motion position to the scene viewer,
+        reusing a single scene viewer input object.
+        '''
+        if self._pendingMotion is None:
+            return
+
+        x, y = self._pendingMotion
+        self._pendingMotion = None
+        if self._motionInput is None:
+            self._motionInput = self._track(self._scene_viewer.createSceneviewerinput())
+            self._motionInput.setEventType(Sceneviewerinput.EVENT_TYPE_MOTION_NOTIFY)
+        self._motionInput.setPosition(x, y)
+        self._scene_viewer.processSceneviewerinput(self._motionInput)
+
+    def requestRepaint(self):
+        '''
+        Ask for the scene to be repainted.  Requests are merged so that at
+        most one frame is rendered per event loop pass and the maximum
+        frame rate is not exceeded.
+        '''
+        self._repaint_scheduler.schedule(self)
+
+    def setMaximumFrameRate(self, maximum_frame_rate):
+        '''
+        Set the maximum frames per second for repaints requested through
+        requestRepaint(), None or 0 removes the limit.
+        '''
+        self._repaint_scheduler.setMaximumFrameRate(maximum_frame_rate)
+
+    def getMaximumFrameRate(self):
+        return self._repaint_scheduler.getMaximumFrameRate()
+
+    def getMergedRepaintCount(self):
+        '''
+        Get the number of repaint requests that were merged into an already
+        pending repaint instead of rendering a frame of their own.
+        '''
+        return self._repaint_scheduler.merged_count
+
+    def getRepaintStatistics(self):
+        '''
+        Get a dict with the number of repaints requested, frames rendered
+        and requests merged since the statistics were last reset.
+        '''
+        scheduler = self._repaint_scheduler
+        return {'requested': scheduler.requested_count,
+                'rendered': scheduler.frame_count,
+                'merged': scheduler.merged_count}
+
+    def resetRepaintStatistics(self):
+        self._repaint_scheduler.resetStatistics()
+
     def _zincSceneviewerEvent(self, event):
         '''
-        Process a scene viewer event.  The updateGL() method is called for a
-        repaint required event all other events are ignored.
+        Process a scene viewer event.  A repaint is requested for a repaint
+        required event all other events are ignored.  Changes made while
+        painting, such as flushing compressed motion, are already part of the
+        frame being rendered.
         '''
         if event.getChangeFlags() & Sceneviewerevent.CHANGE_FLAG_REPAINT_REQUIRED:
-            self.updateGL()
+            # Anything that needs a repaint may change what is under the cursor.
+            self._sceneRevision += 1
+            if not self._painting:
+                self.requestRepaint()
 
-#  Not applicable at the current point in time.
-#     def _zincSelectionEvent(self, event):
-#         print(event.getChangeFlags())
-#         print('go the selection change')
+    def _zincSelectionEvent(self, event):
+        '''
+        Process a selection event by scheduling a selection delta no sooner
+        than the maximum selectionChanged rate allows.  Changes the widget
+        did not record itself are found by listing the selection.
+        '''
+        if not self._selectionRecording:
+            self._recordSelection(_SelectionOperation.RELIST, _selection_nodeset_names + _selection_mesh_names)
+        if self._selectionDeltaTimer.isActive():
+            return
+
+        delay = 0.0
+        if self._lastSelectionDeltaTime is not None:
+            delay = self._lastSelectionDeltaTime + self._selectionDeltaInterval - _clock()
+        self._selectionDeltaTimer.start(max(0, int(delay * 1000.0 + 0.5)))
+
+    def _hasSelectionChangedReceivers(self):
+        # PySide and PyQt name the object argument of the signal differently.
+        for signature in ('selectionChanged(PyObject)', 'selectionChanged(PyQt_PyObject)'):
+            if self.receivers(QtCore.SIGNAL(signature)) > 0:
+                return True
+
+        return False
+
+    def _emitSelectionDelta(self):
+        '''
+        Apply the recorded selection changes to the snapshot taken at the
+        previous delta and emit selectionChanged with the identifiers added
+        and removed.  Only the names changed by something other than the
+        widget are listed from the selection group, and nothing is done
+        while selectionChanged has no receivers.
+        '''
+        self._lastSelectionDeltaTime = _clock()
+        operations = self._selectionOperations
+        self._selectionOperations = []
+        if not self._hasSelectionChangedReceivers():
+            # The snapshot is brought up to date when someone listens.
+            self._selectionOperations = [(_SelectionOperation.RELIST,
+                                          _selection_nodeset_names + _selection_mesh_names, None)]
+            return
+
+        previous = self._selectionSnapshot
+        current = dict(previous)
+        empty = numpy.zeros(0, dtype=numpy.int64)
+        changed_names = set()
+        relist_names = set()
+        for operation, name, identifiers in operations:
+            if operation == _SelectionOperation.CLEAR:
+                changed_names.update(current)
+                current = {}
+            elif operation == _SelectionOperation.RELIST:
+                relist_names.update(name)
+            else:
+                changed_names.add(name)
+                identifiers = numpy.asarray(identifiers, dtype=numpy.int64)
+                if operation == _SelectionOperation.ADD:
+                    current[name] = numpy.union1d(current.get(name, empty), identifiers)
+                else:
+                    current[name] = numpy.setdiff1d(current.get(name, empty), identifiers)
+        if relist_names:
+            listed = self._selectedIdentifiers(relist_names)
+            for name in relist_names:
+                current[name] = listed.get(name, empty)
+            changed_names.update(relist_names)
+        self._selectionSnapshot = dict((name, identifiers) for name, identifiers in current.items()
+                                       if len(identifiers))
+        added = {}
+        removed = {}
+        for name in changed_names:
+            before = previous.get(name, empty)
+            after = current.get(name, empty)
+            name_added = numpy.setdiff1d(after, before, assume_unique=True)
+            name_removed = numpy.setdiff1d(before, after, assume_unique=True)
+            if len(name_added):
+                added[name] = name_added
+            if len(name_removed):
+                removed[name] = name_removed
+
+        delta = SelectionDelta(added, removed)
+        if not delta.isEmpty():
+            self.selectionChanged.emit(delta)
 
     # resizeGL start
+    @_timed('resizeGL')
     def resizeGL(self, width, height):
         '''
         Respond to widget resize events.
         '''
+        if self._released:
+            return
+
         self._scene_viewer.setViewportSize(width, height)
         # resizeGL end
 
+    @_timed('mousePressEvent', input_event=True)
     def mousePressEvent(self, mouseevent):
         '''
         Inform the scene viewer of a mouse press event.  Performs selection
@@ -383,6 +1886,10 @@ class ZincWidget(QtOpenGL.QGLWidget):
         If the shift key is also pressed then the new selection will be added to
         the current selection, otherwise the current selection is cleared.
         '''
+        if self._released:
+            return
+
+        self._deferRefinement()
         if (mouseevent.modifiers() & QtCore.Qt.CTRL) and \
                 (self._nodeSelectMode or self._elemSelectMode or self._dataSelectMode) and \
                 button_map[mouseevent.button()] == Sceneviewerinput.BUTTON_TYPE_LEFT:
@@ -392,9 +1899,16 @@ class ZincWidget(QtOpenGL.QGLWidget):
             # This also makes it harder to lose the current selection. 
             if self._selectionAlwaysAdditive or mouseevent.modifiers() & QtCore.Qt.SHIFT:
                 self._selectionMode = _SelectionMode.ADDITIVE
+            if self._lassoSelection:
+                self._lassoPoints = [self._selectionPositionStart]
         else:
-
-            scene_input = self._scene_viewer.createSceneviewerinput()
+            if self._levelOfDetail is not None:
+                self._levelOfDetailTimer.stop()
+                if not self._levelOfDetailInteracting:
+                    self._levelOfDetailInteracting = True
+                    self._levelOfDetail.beginInteraction()
+            self._flushPendingMotion()
+            scene_input = self._track(self._scene_viewer.createSceneviewerinput())
             scene_input.setPosition(mouseevent.x(), mouseevent.y())
             scene_input.setEventType(Sceneviewerinput.EVENT_TYPE_BUTTON_PRESS)
             scene_input.setButtonType(button_map[mouseevent.button()])
@@ -402,133 +1916,148 @@ class ZincWidget(QtOpenGL.QGLWidget):
 
             self._scene_viewer.processSceneviewerinput(scene_input)
 
+    @_timed('mouseReleaseEvent', input_event=True)
     def mouseReleaseEvent(self, mouseevent):
         '''
         Inform the scene viewer of a mouse release event.
         '''
+        if self._released:
+            return
+
+        self._deferRefinement()
         if self._selectionMode != _SelectionMode.NONE:
             x = mouseevent.x()
             y = mouseevent.y()
             # Construct a small frustum to look for nodes in.
             root_region = self.getCurrentRegion()
+            self._selectionRecording = True
             root_region.beginHierarchicalChange()
-            self._selectionBox.setVisibilityFlag(False)
-
-            if (x != self._selectionPositionStart[0] and y != self._selectionPositionStart[1]):
-                left = min(x, self._selectionPositionStart[0])
-                right = max(x, self._selectionPositionStart[0])
-                bottom = min(y, self._selectionPositionStart[1])
-                top = max(y, self._selectionPositionStart[1])
-                self._scene_picker.setSceneviewerRectangle(self._scene_viewer,
-                                                           SCENECOORDINATESYSTEM_LOCAL,
-                                                           left, bottom, right, top);
+            lasso_points = self._lassoPoints
+            if self._selectionRectangle is not None or lasso_points is not None:
+                self._selectionRectangle = None
+                self._lassoPoints = None
+                self.requestRepaint()
+
+            if lasso_points is not None and len(lasso_points) > 2:
                 if self._selectionMode == _SelectionMode.EXCLUSIVE:
-                    self._selectionGroup.clear()
+                    self._clearSelection()
                 if self._nodeSelectMode or self._dataSelectMode:
-                    self._scene_picker.addPickedNodesToFieldGroup(self._selectionGroup)
-                if self._elemSelectMode:
-                    self._scene_picker.addPickedElementsToFieldGroup(self._selectionGroup)
+                    self._addIndexedNodesToSelection(lambda index, matrix: index.findInPolygon(matrix, lasso_points))
+            elif (x != self._selectionPositionStart[0] and y != self._selectionPositionStart[1]):
+                x_min = min(x, self._selectionPositionStart[0])
+                x_max = max(x, self._selectionPositionStart[0])
+                y_min = min(y, self._selectionPositionStart[1])
+                y_max = max(y, self._selectionPositionStart[1])
+                if self._selectionMode == _SelectionMode.EXCLUSIVE:
+                    self._clearSelection()
+                self._addRectangleToSelection(x_min, y_min, x_max, y_max)
             else:
-
-                self._scene_picker.setSceneviewerRectangle(self._scene_viewer,
-                                                           SCENECOORDINATESYSTEM_LOCAL,
-                                                           x - 0.5, y - 0.5, x + 0.5, y + 0.5);
+                pick = self.pickAt(x, y)
                 if self._nodeSelectMode and \
                         self._elemSelectMode and \
                         self._selectionMode == _SelectionMode.EXCLUSIVE and not \
-                        self._scene_picker.getNearestGraphics().isValid():
-                    self._selectionGroup.clear()
+                        pick.isValid():
+                    self._clearSelection()
 
                 if ((self._nodeSelectMode and \
-                        (self._scene_picker.getNearestGraphics().getFieldDomainType()
-                            in [Field.DOMAIN_TYPE_NODES])) or \
+                        (pick.domain_type in [Field.DOMAIN_TYPE_NODES])) or \
                     (self._dataSelectMode and \
-                        (self._scene_picker.getNearestGraphics().getFieldDomainType()
-                            in [Field.DOMAIN_TYPE_DATAPOINTS]))):
-                    node = self._scene_picker.getNearestNode()
+                        (pick.domain_type in [Field.DOMAIN_TYPE_DATAPOINTS]))):
+                    node = pick.node
                     nodeset = node.getNodeset()
 
                     nodegroup = self._selectionGroup.getFieldNodeGroup(nodeset)
                     if not nodegroup.isValid():
-                        nodegroup = self._selectionGroup.createFieldNodeGroup(nodeset)
+                        nodegroup = self._track(self._selectionGroup.createFieldNodeGroup(nodeset))
 
                     group = nodegroup.getNodesetGroup()
                     if self._selectionMode == _SelectionMode.EXCLUSIVE:
                         remove_current = group.getSize() == 1 and group.containsNode(node)
-                        self._selectionGroup.clear()
+                        self._clearSelection()
                         if not remove_current:
                             group.addNode(node)
+                            self._recordSelection(_SelectionOperation.ADD, nodeset.getName(), [node.getIdentifier()])
                     elif self._selectionMode == _SelectionMode.ADDITIVE:
                         if group.containsNode(node):
                             group.removeNode(node)
+                            self._recordSelection(_SelectionOperation.REMOVE, nodeset.getName(), [node.getIdentifier()])
                         else:
                             group.addNode(node)
+                            self._recordSelection(_SelectionOperation.ADD, nodeset.getName(), [node.getIdentifier()])
 
                 if self._elemSelectMode and \
-                    (self._scene_picker.getNearestGraphics().getFieldDomainType()
-                        in [Field.DOMAIN_TYPE_MESH1D,
-                            Field.DOMAIN_TYPE_MESH2D,
-                            Field.DOMAIN_TYPE_MESH3D,
-                            Field.DOMAIN_TYPE_MESH_HIGHEST_DIMENSION]):
-                    elem = self._scene_picker.getNearestElement()
+                    (pick.domain_type in _meshDomainTypes()):
+                    elem = pick.element
                     mesh = elem.getMesh()
 
                     elementgroup = self._selectionGroup.getFieldElementGroup(mesh)
                     if not elementgroup.isValid():
-                        elementgroup = self._selectionGroup.createFieldElementGroup(mesh)
+                        elementgroup = self._track(self._selectionGroup.createFieldElementGroup(mesh))
 
                     group = elementgroup.getMeshGroup()
                     if self._selectionMode == _SelectionMode.EXCLUSIVE:
                         remove_current = group.getSize() == 1 and group.containsElement(elem)
-                        self._selectionGroup.clear()
+                        self._clearSelection()
                         if not remove_current:
                             group.addElement(elem)
+                            self._recordSelection(_SelectionOperation.ADD, mesh.getName(), [elem.getIdentifier()])
                     elif self._selectionMode == _SelectionMode.ADDITIVE:
                         if group.containsElement(elem):
                             group.removeElement(elem)
+                            self._recordSelection(_SelectionOperation.REMOVE, mesh.getName(), [elem.getIdentifier()])
                         else:
                             group.addElement(elem)
-
+                            self._recordSelection(_SelectionOperation.ADD, mesh.getName(), [elem.getIdentifier()])
 
             root_region.endHierarchicalChange()
+            self._selectionRecording = False
             self._selectionMode = _SelectionMode.NONE
         else:
-            scene_input = self._scene_viewer.createSceneviewerinput()
+            self._flushPendingMotion()
+            scene_input = self._track(self._scene_viewer.createSceneviewerinput())
             scene_input.setPosition(mouseevent.x(), mouseevent.y())
             scene_input.setEventType(Sceneviewerinput.EVENT_TYPE_BUTTON_RELEASE)
             scene_input.setButtonType(button_map[mouseevent.button()])
 
             self._scene_viewer.processSceneviewerinput(scene_input)
+            if self._levelOfDetail is not None and mouseevent.buttons() == QtCore.Qt.NoButton:
+                self._levelOfDetailTimer.start(int(self._levelOfDetailRestoreDelay * 1000.0))
 
+    @_timed('mouseMoveEvent', input_event=True)
     def mouseMoveEvent(self, mouseevent):
         '''
         Inform the scene viewer of a mouse move event and update the OpenGL scene to reflect this
         change to the viewport.
         '''
+        if self._released:
+            return
 
+        self._deferRefinement()
         if self._selectionMode != _SelectionMode.NONE:
-            x = mouseevent.x()
-            y = mouseevent.y()
-            xdiff = float(x - self._selectionPositionStart[0])
-            ydiff = float(y - self._selectionPositionStart[1])
-            if abs(xdiff) < 0.0001:
-                xdiff = 1
-            if abs(ydiff) < 0.0001:
-                ydiff = 1
-            xoff = float(self._selectionPositionStart[0]) / xdiff + 0.5
-            yoff = float(self._selectionPositionStart[1]) / ydiff + 0.5
-            scene = self._selectionBox.getScene()
-            scene.beginChange()
-            self._selectionBox_setBaseSize([xdiff, ydiff, 0.999])
-            self._selectionBox_setGlyphOffset([xoff, -yoff, 0])
-            self._selectionBox.setVisibilityFlag(True)
-            scene.endChange()
+            # The rubber band is drawn as an overlay so only a repaint is needed.
+            if self._lassoPoints is not None:
+                self._lassoPoints.append((mouseevent.x(), mouseevent.y()))
+            else:
+                self._selectionRectangle = (self._selectionPositionStart[0], self._selectionPositionStart[1],
+                                            mouseevent.x(), mouseevent.y())
+            self.requestRepaint()
+        elif self._compressedInput and mouseevent.type() != QtCore.QEvent.Leave and \
+                mouseevent.buttons() != QtCore.Qt.NoButton:
+            # Keep only the latest position, it is sent just before the next paint.
+            self._pendingMotion = (mouseevent.x(), mouseevent.y())
+            self.requestRepaint()
         else:
-            scene_input = self._scene_viewer.createSceneviewerinput()
+            self._flushPendingMotion()
+            scene_input = self._track(self._scene_viewer.createSceneviewerinput())
             scene_input.setPosition(mouseevent.x(), mouseevent.y())
             scene_input.setEventType(Sceneviewerinput.EVENT_TYPE_MOTION_NOTIFY)
             if mouseevent.type() == QtCore.QEvent.Leave:
                 scene_input.setPosition(-1, -1)
+            elif self._hoverPick and mouseevent.buttons() == QtCore.Qt.NoButton:
+                # Pick once per event loop pass at the latest cursor position.
+                self._hoverPosition = (mouseevent.x(), mouseevent.y())
+                if not self._hoverPickTimer.isActive():
+                    self._hoverPickTimer.start(0)
 
             self._scene_viewer.processSceneviewerinput(scene_input)
 